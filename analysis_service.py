@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Local Analysis Service
+A long-running asyncio HTTP/JSON server (standard library only) that keeps
+the lyrics corpus, its tokens and counts in memory and answers analysis
+queries from an LRU cache, so the teacher portal does not have to spawn a
+fresh Python process per question.
+
+Usage:
+    python analysis_service.py [--host 127.0.0.1] [--port 8765] [--lyrics messy_lyrics.txt]
+
+Endpoints:
+    GET  /health                      corpus size and cache statistics
+    GET  /top-words?n=25              most frequent words
+    GET  /themes                      spiritual theme totals
+    GET  /songs                       song numbers with word counts
+    GET  /songs/<number>?n=25         one song's vocabulary
+    GET  /songs/<number>/similar?n=5  songs with the most similar vocabulary
+    GET  /similar-songs?words=a,b&n=5 songs that best match a word list
+    GET  /teaching-words?n=15         priority teaching words with Japanese
+    GET  /word-cloud.html             rendered word cloud page
+    GET  /flashcards.html             rendered flashcard app
+    POST /reload                      re-read the lyrics file and clear the cache
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from collections import Counter, OrderedDict
+from functools import partial
+from urllib.parse import parse_qsl, urlsplit
+
+from html_word_cloud import STOP_WORDS, read_lyrics_file, render_html_word_cloud
+from japanese_flashcard_app import generate_flashcard_webapp, iter_enhanced_flashcards
+from japanese_teaching_tool import (
+    SONG_HEADER, analyze_word_counts_for_teaching, create_flashcard_data, generate_lesson_plan,
+    rank_teaching_words, select_top_words, split_songs
+)
+from japanese_teaching_tool import clean_and_tokenize as tokenize_all_words
+from simple_word_analysis import analyze_spiritual_themes
+from song_similarity import SongSimilarityIndex
+from token_index import TokenCorpus
+
+MAX_BODY_BYTES = 64 * 1024
+
+# How a route is answered: uncached, from the LRU cache, or cached and
+# rendered in a worker thread so large pages never block the event loop
+DIRECT, CACHED, RENDERED = 'direct', 'cached', 'rendered'
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class HTTPError(Exception):
+    """An error answered with a JSON body and the given status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class LRUCache:
+    """A small least-recently-used cache for query results"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self):
+        return {'size': len(self._items), 'max_size': self.max_size,
+                'hits': self.hits, 'misses': self.misses}
+
+class Corpus:
+    """The lyrics as interned token IDs plus counts, computed once per load
+
+    Every song is tokenized once. The teaching counts use all of its words,
+    and the token corpus and similarity index use the meaningful ones.
+    A reload builds a new Corpus and swaps it in, so a corpus is never
+    changed while a request is reading it.
+    """
+
+    def __init__(self, lyrics_file):
+        self.lyrics_file = lyrics_file
+        lyrics = read_lyrics_file(lyrics_file)
+        songs = split_songs(lyrics)
+
+        # Teaching vocabulary matches every word, stop words included;
+        # text before the first numbered song only counts there
+        first_song = SONG_HEADER.search(lyrics)
+        self.teaching_freq = Counter(tokenize_all_words(lyrics[:first_song.start()] if first_song
+                                                        else lyrics))
+        meaningful = {}
+        for text in songs.values():
+            words = tokenize_all_words(text)
+            self.teaching_freq.update(words)
+            meaningful[text] = [word for word in words if word not in STOP_WORDS and len(word) > 2]
+
+        self.tokens = TokenCorpus()
+        for number, text in songs.items():
+            self.tokens.add_song(number, meaningful[text])
+        self.word_freq = self.tokens.to_counter()
+        self.similarity = SongSimilarityIndex()
+        self.similarity.update(lyrics, tokenizer=meaningful.__getitem__)
+
+class AnalysisService:
+    """Routes requests to cached analysis functions"""
+
+    def __init__(self, lyrics_file, cache_size=256):
+        self.corpus = Corpus(lyrics_file)
+        self.cache = LRUCache(cache_size)
+        self.routes = [
+            ('GET', re.compile(r'/health'), self.health, DIRECT),
+            ('GET', re.compile(r'/top-words'), self.top_words, CACHED),
+            ('GET', re.compile(r'/themes'), self.themes, CACHED),
+            ('GET', re.compile(r'/songs'), self.songs, CACHED),
+            ('GET', re.compile(r'/songs/(\d+)'), self.song_vocabulary, CACHED),
+            ('GET', re.compile(r'/songs/(\d+)/similar'), self.similar_songs, CACHED),
+            ('GET', re.compile(r'/similar-songs'), self.songs_like_words, CACHED),
+            ('GET', re.compile(r'/teaching-words'), self.teaching_words, CACHED),
+            ('GET', re.compile(r'/word-cloud\.html'), self.word_cloud_html, RENDERED),
+            ('GET', re.compile(r'/flashcards\.html'), self.flashcards_html, RENDERED),
+            ('POST', re.compile(r'/reload'), self.reload, DIRECT),
+        ]
+
+    # Query handlers return (content type, body) or JSON-serializable data,
+    # or are coroutines returning them
+
+    # Each handler reads self.corpus once, so a reload swapping it in the
+    # middle of a request never mixes two corpora
+
+    def health(self, query):
+        corpus = self.corpus
+        return {'status': 'ok', 'lyrics_file': corpus.lyrics_file,
+                'words': len(corpus.tokens), 'unique_words': len(corpus.word_freq),
+                'songs': len(corpus.tokens.song_numbers), 'cache': self.cache.stats()}
+
+    def top_words(self, query):
+        n = int_param(query, 'n', 25)
+        return [{'word': word, 'count': count} for word, count in self.corpus.word_freq.most_common(n)]
+
+    def themes(self, query):
+        return analyze_spiritual_themes(self.corpus.word_freq)
+
+    def songs(self, query):
+        tokens = self.corpus.tokens
+        songs = []
+        for number in tokens.song_numbers:
+            song_tokens = tokens.song_tokens(number)
+            songs.append({'song': number, 'words': len(song_tokens),
+                          'unique_words': len(set(song_tokens))})
+        return songs
+
+    def song_vocabulary(self, query, number):
+        tokens = self.corpus.tokens
+        if int(number) not in tokens.song_numbers:
+            raise HTTPError(404, f'Song {number} not found')
+        n = int_param(query, 'n', 25)
+        counts = tokens.song_counts(int(number))
+        return {'song': int(number),
+                'words': [{'word': word, 'count': count}
+                          for word, count in tokens.most_common(n, counts)]}
+
+    def similar_songs(self, query, number):
+        similarity = self.corpus.similarity
+        if int(number) not in similarity.songs:
+            raise HTTPError(404, f'Song {number} not found')
+        n = int_param(query, 'n', 5)
+        return [{'song': song, 'similarity': score}
+                for song, score in similarity.nearest_songs(int(number), n)]
+
+    def songs_like_words(self, query):
+        words = [word.strip().lower() for word in query.get('words', '').split(',') if word.strip()]
+        if not words:
+            raise HTTPError(400, '"words" must list at least one word')
+        n = int_param(query, 'n', 5)
+        return [{'song': song, 'similarity': score}
+                for song, score in self.corpus.similarity.nearest_to_words(words, n)]
+
+    def teaching_words(self, query):
+        n = int_param(query, 'n', 15)
+        found_words = analyze_word_counts_for_teaching(self.corpus.teaching_freq)
+        return select_top_words(rank_teaching_words(found_words), n)
+
+    def word_cloud_html(self, query):
+        return 'text/html; charset=utf-8', render_html_word_cloud(self.corpus.word_freq)
+
+    def flashcards_html(self, query):
+        found_words = analyze_word_counts_for_teaching(self.corpus.teaching_freq)
+        flashcards = create_flashcard_data(generate_lesson_plan(found_words))
+        return 'text/html; charset=utf-8', generate_flashcard_webapp(iter_enhanced_flashcards(flashcards))
+
+    async def reload(self, query):
+        # Built in a worker thread while requests keep using the old corpus,
+        # then swapped in on the event loop
+        loop = asyncio.get_running_loop()
+        corpus = await loop.run_in_executor(None, Corpus, self.corpus.lyrics_file)
+        self.corpus = corpus
+        self.cache.clear()
+        return {'status': 'reloaded', 'words': len(corpus.tokens)}
+
+    async def dispatch(self, method, target):
+        """Find the route, serve from cache or compute (off the event loop)"""
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+
+        for route_method, pattern, handler, mode in self.routes:
+            match = pattern.fullmatch(url.path)
+            if not match:
+                continue
+            if method != route_method:
+                raise HTTPError(405, f'{method} not allowed on {url.path}')
+
+            if mode == DIRECT:
+                result = handler(query, *match.groups())
+                return await result if asyncio.iscoroutine(result) else result
+
+            key = (url.path, tuple(sorted(query.items())))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            corpus = self.corpus
+            if mode == RENDERED:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, partial(handler, query, *match.groups()))
+            else:
+                result = handler(query, *match.groups())
+            # A page rendered from a corpus that was reloaded meanwhile is not kept
+            if self.corpus is corpus:
+                self.cache.put(key, result)
+            return result
+
+        raise HTTPError(404, f'No endpoint {url.path}')
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive supported)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY_BYTES:
+                        raise HTTPError(413, 'Request body too large')
+                    if length:
+                        await reader.readexactly(length)
+                    result = await self.dispatch(method, target)
+                    status = 200
+                except HTTPError as e:
+                    status, result = e.status, {'error': str(e)}
+                except ValueError as e:
+                    status, result = 400, {'error': str(e)}
+                except Exception as e:
+                    status, result = 500, {'error': f'{type(e).__name__}: {e}'}
+
+                if isinstance(result, tuple):
+                    content_type, body = result
+                else:
+                    content_type = 'application/json; charset=utf-8'
+                    body = json.dumps(result, ensure_ascii=False)
+                body = body.encode('utf-8')
+
+                writer.write(
+                    f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}\r\n'
+                    f'Content-Type: {content_type}\r\n'
+                    f'Content-Length: {len(body)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1')
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def int_param(query, name, default):
+    """Read a positive integer query parameter"""
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f'"{name}" must be an integer')
+    if value < 1:
+        raise HTTPError(400, f'"{name}" must be positive')
+    return value
+
+async def serve(host, port, lyrics_file, cache_size):
+    """Load the corpus and serve until interrupted"""
+    service = AnalysisService(lyrics_file, cache_size)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"🌐 Analysis service listening on http://{host}:{port}/ "
+          f"({len(service.corpus.tokens)} words loaded from '{lyrics_file}')")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Serve lyrics analysis over local HTTP/JSON')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--lyrics', default='messy_lyrics.txt', help='Lyrics file to load')
+    parser.add_argument('--cache-size', type=int, default=256, help='Cached query results')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.lyrics, args.cache_size))
+    except KeyboardInterrupt:
+        print("\n👋 Analysis service stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Batch Lesson Plan and Flashcard Generator
+Builds lesson plans and flashcard files for many classes in one run.
+Each song is tokenized and counted once, and every class sums the counts
+of its own song subset before its lesson plan is generated.
+
+Usage:
+    python batch_lessons.py classes.json [--workers N] [--output-dir DIR]
+
+Example classes.json:
+    {
+        "lyrics_file": "messy_lyrics.txt",
+        "classes": [
+            {"name": "Sunday Kids", "songs": [1, 3], "age_bands": ["6-8"], "top_n": 8},
+            {"name": "Youth Group", "age_bands": ["9-11", "12+"], "top_n": 12}
+        ]
+    }
+
+Omitting "songs" uses every song, omitting "age_bands" keeps every lesson
+level and omitting "top_n" keeps the usual 10 words per level.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from flashcard_stream import write_flashcards
+from japanese_teaching_tool import (
+    analyze_word_counts_for_teaching, clean_and_tokenize, create_flashcard_data,
+    generate_lesson_plan, read_lyrics_file, split_songs
+)
+from vocabulary_store import TEACHING_DB
+
+# Age bands used in class definitions, mapped to lesson plan levels
+AGE_BANDS = {
+    '6-8': 'beginner_lesson',
+    '9-11': 'intermediate_lesson',
+    '12+': 'advanced_lesson'
+}
+
+def load_class_config(filename):
+    """Read the class list (a JSON list or an object with a "classes" key)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        config = {'classes': config}
+    return config
+
+def count_songs(lyrics_text):
+    """Tokenize and count every song exactly once"""
+    return {
+        number: Counter(clean_and_tokenize(song_text))
+        for number, song_text in split_songs(lyrics_text).items()
+    }
+
+def class_word_counts(song_counts, songs=None):
+    """Sum the per-song counts for a class's song subset"""
+    word_freq = Counter()
+    for number in (songs if songs is not None else song_counts):
+        if number not in song_counts:
+            raise ValueError(f"Song {number} is not in the lyrics file")
+        word_freq.update(song_counts[number])
+    return word_freq
+
+def class_slug(name):
+    """File-name friendly version of a class name"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'class'
+
+def build_class_materials(class_config, word_freq, output_dir, db_path=TEACHING_DB):
+    """Generate and save one class's lesson plan and flashcards"""
+
+    top_n = class_config.get('top_n', 10)
+    found_words = analyze_word_counts_for_teaching(word_freq, db_path)
+    lesson_plan = generate_lesson_plan(found_words, top_n=top_n,
+                                       tie_breaker=class_config.get('tie_breaker', 'order'))
+
+    age_bands = class_config.get('age_bands')
+    if age_bands:
+        levels = [AGE_BANDS[band] for band in age_bands]
+        lesson_plan = {level: lesson_plan[level] for level in levels}
+
+    flashcards = create_flashcard_data(lesson_plan, top_n=top_n)
+
+    slug = class_slug(class_config['name'])
+    plan_file = os.path.join(output_dir, f'{slug}_lesson_plan.json')
+    flashcard_file = os.path.join(output_dir, f'{slug}_flashcards.json')
+
+    with open(plan_file, 'w', encoding='utf-8') as f:
+        json.dump(lesson_plan, f, ensure_ascii=False, indent=2)
+    write_flashcards(flashcards, flashcard_file)
+
+    return class_config['name'], plan_file, flashcard_file, len(flashcards)
+
+def run_batch(config, output_dir='lesson_plans', workers=None, db_path=TEACHING_DB):
+    """Generate materials for every class, in parallel across processes"""
+
+    classes = config['classes']
+    slugs = {}
+    for class_config in classes:
+        # Names that only differ in case or punctuation would share output files
+        slug = class_slug(class_config['name'])
+        if slug in slugs:
+            raise ValueError(f"Classes '{slugs[slug]}' and '{class_config['name']}' would both "
+                             f"be saved as '{slug}_*.json'; rename one of them")
+        slugs[slug] = class_config['name']
+        for band in class_config.get('age_bands') or []:
+            if band not in AGE_BANDS:
+                raise ValueError(f"Unknown age band '{band}' for class "
+                                 f"'{class_config['name']}' (use one of {', '.join(AGE_BANDS)})")
+
+    lyrics = read_lyrics_file(config.get('lyrics_file', 'messy_lyrics.txt'))
+    song_counts = count_songs(lyrics)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Seed the vocabulary store up front so workers never race to create it
+    analyze_word_counts_for_teaching(Counter(), db_path)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(build_class_materials, class_config,
+                            class_word_counts(song_counts, class_config.get('songs')),
+                            output_dir, db_path)
+            for class_config in classes
+        ]
+        return [future.result() for future in futures]
+
+def main():
+    """Main batch function"""
+    parser = argparse.ArgumentParser(description='Generate lesson plans and flashcards for many classes')
+    parser.add_argument('config', help='JSON file listing the classes')
+    parser.add_argument('--output-dir', default='lesson_plans', help='Where to write the class files')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    args = parser.parse_args()
+
+    print("🎌 Batch Lesson Plan Generator 🎌")
+    print("=" * 60)
+
+    config = load_class_config(args.config)
+    results = run_batch(config, args.output_dir, args.workers)
+
+    for name, plan_file, flashcard_file, count in results:
+        print(f"✅ {name}: {count} flashcards")
+        print(f"   • {plan_file}")
+        print(f"   • {flashcard_file}")
+
+    print(f"\n📝 Generated materials for {len(results)} classes in '{args.output_dir}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Benchmark suite for the missionary word cloud tools
+
+    python -m benchmarks.corpus synthetic_lyrics.txt --size 50MB
+    python -m benchmarks.run --size 10MB --output results.json
+    python -m benchmarks.run --size 10MB --compare results.json
+
+Run from the repository root so the analysis scripts can be imported.
+"""
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Synthetic Lyrics Corpus Generator
+Writes corpora in the messy_lyrics.txt format (numbered songs, verses and
+repeated choruses) with word frequencies following a Zipf distribution.
+Output is streamed, so corpora of several GB only need a small buffer.
+
+Usage:
+    python -m benchmarks.corpus synthetic_lyrics.txt --size 100MB [--vocabulary 5000] [--zipf 1.1]
+"""
+
+import argparse
+import itertools
+import random
+import re
+
+SEED_LYRICS = 'messy_lyrics.txt'
+
+SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'te', 'su', 'no', 'vi', 'an', 'el', 'or', 'us',
+             'bri', 'sha', 'ton', 'del', 'gra', 'pen', 'ly', 'mor']
+
+def parse_size(text):
+    """Parse sizes like 10KB, 250MB or 2GB into bytes"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', text.upper())
+    if not match:
+        raise ValueError(f"Invalid size '{text}' (use e.g. 10KB, 50MB, 2GB)")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit])
+
+def build_vocabulary(vocabulary_size, seed_file=SEED_LYRICS, rng=None):
+    """Real lyric words first (most frequent first), padded with made-up words"""
+    rng = rng or random.Random(0)
+    words = []
+    try:
+        with open(seed_file, 'r', encoding='utf-8') as f:
+            seen = {}
+            for word in re.findall(r"[A-Za-z']+", f.read()):
+                seen[word] = seen.get(word, 0) + 1
+            words = sorted(seen, key=seen.get, reverse=True)
+    except FileNotFoundError:
+        pass
+
+    words = words[:vocabulary_size]
+    known = set(words)
+    while len(words) < vocabulary_size:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        if word not in known:
+            known.add(word)
+            words.append(word)
+    return words
+
+def zipf_weights(vocabulary_size, exponent):
+    """Cumulative Zipf weights for random.choices"""
+    return list(itertools.accumulate(1.0 / rank ** exponent
+                                     for rank in range(1, vocabulary_size + 1)))
+
+def make_line(rng, vocabulary, cum_weights, min_words=3, max_words=9):
+    """One lyric line, capitalised, sometimes with punctuation"""
+    words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(min_words, max_words))
+    line = ' '.join(words)
+    line = line[0].upper() + line[1:]
+    return line + rng.choice(['', '', '', ',', '!', '.'])
+
+def make_song(number, rng, vocabulary, cum_weights, chorus_repeats):
+    """One numbered song with verses and a repeated chorus"""
+    chorus = [make_line(rng, vocabulary, cum_weights) for _ in range(rng.randint(2, 5))]
+    parts = [f'{number}. ']
+    for _ in range(rng.randint(2, 4)):
+        parts.extend(make_line(rng, vocabulary, cum_weights) for _ in range(rng.randint(3, 6)))
+        parts.append('')
+        for _ in range(rng.randint(1, chorus_repeats)):
+            parts.extend(chorus)
+        parts.append('')
+    return '\n'.join(parts) + '\n'
+
+def generate_corpus(filename, target_bytes, vocabulary_size=5000, exponent=1.1,
+                    chorus_repeats=3, seed=42, seed_file=SEED_LYRICS):
+    """Write songs until the file reaches target_bytes; returns (bytes, songs)"""
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(vocabulary_size, seed_file, rng)
+    cum_weights = zipf_weights(len(vocabulary), exponent)
+
+    written = 0
+    songs = 0
+    with open(filename, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        while written < target_bytes:
+            songs += 1
+            song = make_song(songs, rng, vocabulary, cum_weights, chorus_repeats)
+            f.write(song + '\n')
+            written += len(song) + 1
+    return written, songs
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic lyrics corpus')
+    parser.add_argument('output', help='File to write')
+    parser.add_argument('--size', default='10KB', help='Target size, e.g. 10KB, 100MB, 2GB')
+    parser.add_argument('--vocabulary', type=int, default=5000, help='Distinct words')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent')
+    parser.add_argument('--chorus-repeats', type=int, default=3, help='Max chorus repeats per verse')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    written, songs = generate_corpus(args.output, parse_size(args.size), args.vocabulary,
+                                     args.zipf, args.chorus_repeats, args.seed)
+    print(f"✅ Wrote {songs} songs ({written / 1024 ** 2:.1f} MB) to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
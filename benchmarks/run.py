@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Times every stage of the pipeline (read, tokenize, Unicode tokenize, spelling
+normalization, language routing, count, token interning, theme analysis,
+lesson planning, HTML word cloud, flashcard generation) on a lyrics corpus
+and records wall time and peak traced memory per stage as JSON, so results
+can be compared across commits.
+
+Usage:
+    python -m benchmarks.run --size 10MB --output results.json
+    python -m benchmarks.run --corpus big_lyrics.txt --compare results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.corpus import generate_corpus, parse_size
+
+# Slowdown (new / baseline) reported as a regression
+REGRESSION_THRESHOLD = 1.2
+
+def stage_read(state):
+    from html_word_cloud import read_lyrics_file
+    state['lyrics'] = read_lyrics_file(state['corpus'])
+    return len(state['lyrics'])
+
+def stage_tokenize(state):
+    from html_word_cloud import clean_and_tokenize
+    state['words'] = clean_and_tokenize(state['lyrics'])
+    return len(state['words'])
+
+def stage_tokenize_unicode(state):
+    from unicode_tokenizer import unicode_tokenize
+    return len(unicode_tokenize(state['lyrics']))
+
+def stage_spelling(state):
+    from spelling_normalizer import build_normalizer
+    return len(build_normalizer(state['words']).normalize_words(state['words']))
+
+def stage_route(state):
+    from language_router import route_text
+    routed, classes = route_text(state['lyrics'])
+    return sum(classes.values())
+
+def stage_count(state):
+    state['word_freq'] = Counter(state['words'])
+    return len(state['word_freq'])
+
+def stage_intern(state):
+    from token_index import build_token_corpus
+    state['token_corpus'] = build_token_corpus(state['lyrics'])
+    return len(state['token_corpus'].counts())
+
+def stage_themes(state):
+    from simple_word_analysis import analyze_spiritual_themes
+    state['themes'] = analyze_spiritual_themes(state['words'])
+    return sum(theme['total_count'] for theme in state['themes'].values())
+
+def stage_lesson_plan(state):
+    from japanese_teaching_tool import analyze_word_counts_for_teaching, generate_lesson_plan
+    found_words = analyze_word_counts_for_teaching(state['word_freq'], state['teaching_db'])
+    state['lesson_plan'] = generate_lesson_plan(found_words)
+    return sum(len(lesson['words']) for lesson in state['lesson_plan'].values())
+
+def stage_html(state):
+    from html_word_cloud import generate_html_word_cloud
+    generate_html_word_cloud(state['words'], os.path.join(state['work_dir'], 'word_cloud.html'))
+    return len(state['words'])
+
+def stage_flashcards(state):
+    from japanese_flashcard_app import iter_enhanced_flashcards, write_flashcard_webapp
+    from japanese_teaching_tool import create_flashcard_data
+    flashcards = create_flashcard_data(state['lesson_plan'])
+    with open(os.path.join(state['work_dir'], 'flashcards.html'), 'w', encoding='utf-8') as f:
+        return write_flashcard_webapp(iter_enhanced_flashcards(flashcards), f)
+
+STAGES = [
+    ('read', stage_read),
+    ('tokenize', stage_tokenize),
+    ('tokenize_unicode', stage_tokenize_unicode),
+    ('spelling', stage_spelling),
+    ('route', stage_route),
+    ('count', stage_count),
+    ('intern', stage_intern),
+    ('themes', stage_themes),
+    ('lesson_plan', stage_lesson_plan),
+    ('html', stage_html),
+    ('flashcards', stage_flashcards),
+]
+
+def git_commit():
+    """Current commit hash, if the benchmark runs inside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(corpus, repeat=3, trace_memory=True):
+    """Run every stage and return the results dict
+
+    Wall time is the best of `repeat` runs without tracing; peak memory
+    comes from one extra traced run so tracing never skews the timings.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir, contextlib.redirect_stdout(io.StringIO()):
+        state = {'corpus': corpus, 'work_dir': work_dir,
+                 'teaching_db': os.path.join(work_dir, 'teaching_vocabulary.db')}
+
+        for name, stage in STAGES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                items = stage(state)
+                timings.append(time.perf_counter() - start)
+
+            peak = None
+            if trace_memory:
+                tracemalloc.start()
+                stage(state)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            results[name] = {'seconds': min(timings), 'peak_bytes': peak, 'items': items}
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {'path': corpus, 'bytes': os.path.getsize(corpus)},
+        'stages': results
+    }
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print a stage-by-stage comparison; returns the names of regressed stages"""
+    regressions = []
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'}:")
+    for name, result in current['stages'].items():
+        old = baseline['stages'].get(name)
+        if not old or not old['seconds']:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        flag = '❌' if ratio > threshold else '✅'
+        if ratio > threshold:
+            regressions.append(name)
+        print(f"  {flag} {name:<16} {old['seconds']:.4f}s → {result['seconds']:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the word cloud pipeline')
+    parser.add_argument('--corpus', help='Existing lyrics file (default: generate one)')
+    parser.add_argument('--size', default='1MB', help='Size of the generated corpus')
+    parser.add_argument('--vocabulary', type=int, default=5000, help='Distinct words in generated corpus')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent of generated corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced memory run')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+    args = parser.parse_args()
+
+    print("⏱️  Missionary Word Cloud Benchmarks ⏱️")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = os.path.join(tmp_dir, 'synthetic_lyrics.txt')
+            written, songs = generate_corpus(corpus, parse_size(args.size),
+                                             args.vocabulary, args.zipf)
+            print(f"📝 Generated {songs} songs ({written / 1024 ** 2:.1f} MB)")
+
+        results = run_benchmarks(corpus, args.repeat, not args.no_memory)
+
+    for name, result in results['stages'].items():
+        peak = f"{result['peak_bytes'] / 1024 ** 2:8.1f} MB" if result['peak_bytes'] is not None else ''
+        print(f"  {name:<16} {result['seconds']:9.4f}s {peak}  ({result['items']} items)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to '{args.output}'")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
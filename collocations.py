@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Word Co-occurrence and Collocation Finder
+Counts which words appear within a few words of each other in the same
+song ("trust" + "power", "fear" + "not") and ranks the pairs by
+log-likelihood ratio or PMI, to help build teaching sentences.
+
+Songs are first tokenized into interned IDs (token_index). Pair counting
+is a second pass over those ID arrays, under packed integer keys. If the
+pair table grows past --max-pairs, the rarest pairs are dropped (lossy
+counting, with phrase_counts.prune_rare), so the counts of pairs near the
+pruning floor become lower bounds.
+
+Usage:
+    python collocations.py [--window 4] [--min-count 2] [--measure llr|pmi] [--top 25]
+                           [--all-words] [--json collocations.json] [--graph]
+"""
+
+import argparse
+import heapq
+import json
+import math
+from collections import Counter
+
+from html_word_cloud import clean_and_tokenize, read_lyrics_file
+from japanese_teaching_tool import clean_and_tokenize as tokenize_all_words
+from phrase_counts import prune_rare
+from token_index import HAS_NUMPY, build_token_corpus
+
+if HAS_NUMPY:
+    import numpy as np
+
+# Default bound on distinct pairs kept in memory
+MAX_PAIRS = 1_000_000
+
+# Positions scanned per vectorized chunk
+CHUNK_TOKENS = 1 << 20
+
+GRAPH_FILE = 'collocation_graph.html'
+
+class CooccurrenceCounts:
+    """Windowed pair counts over an interned corpus"""
+
+    __slots__ = ('vocabulary', 'unigrams', 'pairs', 'marginals', 'total_pairs', 'window', 'prune_floor')
+
+    def __init__(self, vocabulary, unigrams, window):
+        self.vocabulary = vocabulary
+        self.unigrams = unigrams
+        self.window = window
+        # {a * vocabulary size + b: count} with a < b
+        self.pairs = Counter()
+        # {token ID: pairs the token takes part in}
+        self.marginals = Counter()
+        self.total_pairs = 0
+        self.prune_floor = 0
+
+    def add(self, chunk):
+        """Merge one chunk's {pair key: count}"""
+        size = len(self.vocabulary)
+        for key, count in chunk.items():
+            self.marginals[key // size] += count
+            self.marginals[key % size] += count
+        self.total_pairs += sum(chunk.values())
+        self.pairs.update(chunk)
+
+    def prune(self, max_pairs):
+        """Drop the rarest pairs until the table is back under three quarters of max_pairs"""
+        self.prune_floor = max(self.prune_floor, prune_rare(self.pairs, max_pairs))
+
+    def words(self, key):
+        """The two words of a packed pair key"""
+        size = len(self.vocabulary)
+        words = self.vocabulary.words
+        return words[key // size], words[key % size]
+
+def song_windows(corpus, window):
+    """Yield (left IDs, right IDs) of every in-song pair, chunk by chunk"""
+    offsets = corpus.song_offsets
+    for i in range(len(corpus.song_numbers)):
+        ids = corpus.tokens[offsets[i]:offsets[i + 1]]
+        for distance in range(1, window + 1):
+            if distance < len(ids):
+                yield ids[:-distance], ids[distance:]
+
+def count_chunk_pure(left, right, size):
+    """{pair key: count} for aligned ID sequences, self pairs skipped"""
+    return Counter(a * size + b if a < b else b * size + a
+                   for a, b in zip(left, right) if a != b)
+
+def count_cooccurrences(corpus, window=4, max_pairs=MAX_PAIRS):
+    """Count word pairs at most `window` tokens apart within each song"""
+    size = max(len(corpus.vocabulary), 1)
+    counts = CooccurrenceCounts(corpus.vocabulary, corpus.counts(), window)
+
+    if HAS_NUMPY:
+        tokens = np.frombuffer(corpus.tokens, dtype=np.uint32).astype(np.int64)
+        lengths = np.diff(np.frombuffer(corpus.song_offsets, dtype=np.uint64)).astype(np.int64)
+        songs = np.repeat(np.arange(len(lengths)), lengths)
+        for start in range(0, len(tokens), CHUNK_TOKENS):
+            end = min(start + CHUNK_TOKENS, len(tokens))
+            keys = []
+            for distance in range(1, window + 1):
+                # Pairs starting in this chunk; the right word may lie just past it
+                stop = min(end, len(tokens) - distance)
+                if stop <= start:
+                    continue
+                left, right = tokens[start:stop], tokens[start + distance:stop + distance]
+                keep = (songs[start:stop] == songs[start + distance:stop + distance]) & (left != right)
+                low, high = np.minimum(left, right)[keep], np.maximum(left, right)[keep]
+                keys.append(low * size + high)
+            if keys:
+                unique, chunk_counts = np.unique(np.concatenate(keys), return_counts=True)
+                counts.add(dict(zip(unique.tolist(), chunk_counts.tolist())))
+            if len(counts.pairs) > max_pairs:
+                counts.prune(max_pairs)
+        return counts
+
+    for left, right in song_windows(corpus, window):
+        counts.add(count_chunk_pure(left, right, size))
+        if len(counts.pairs) > max_pairs:
+            counts.prune(max_pairs)
+    return counts
+
+def log_likelihood(k11, k12, k21, k22):
+    """Dunning's G² for a 2×2 contingency table"""
+    def entropy_sum(*ks):
+        total = sum(ks)
+        return sum(k * math.log(k / total) for k in ks if k > 0)
+    return 2 * (entropy_sum(k11, k12, k21, k22)
+                - entropy_sum(k11 + k12, k21 + k22)
+                - entropy_sum(k11 + k21, k12 + k22))
+
+def score_collocations(counts, min_count=2, measure='llr', top_n=25):
+    """Top pairs as dicts with count, PMI and log-likelihood, best first"""
+    total_tokens = sum(counts.unigrams)
+    total_pairs = counts.total_pairs
+    size = len(counts.vocabulary)
+    scored = []
+
+    for key, count in counts.pairs.items():
+        if count < min_count:
+            continue
+        a, b = key // size, key % size
+        # PMI of the pair against the words' corpus frequencies
+        pmi = math.log2((count / total_pairs) /
+                        ((counts.unigrams[a] / total_tokens) * (counts.unigrams[b] / total_tokens)))
+        k12 = counts.marginals[a] - count
+        k21 = counts.marginals[b] - count
+        llr = log_likelihood(count, k12, k21, max(total_pairs - count - k12 - k21, 0))
+        scored.append((llr if measure == 'llr' else pmi, key, count, pmi, llr))
+
+    collocations = []
+    for score, key, count, pmi, llr in heapq.nlargest(top_n, scored):
+        first, second = counts.words(key)
+        collocations.append({'words': [first, second], 'count': count,
+                             'pmi': round(pmi, 4), 'llr': round(llr, 4)})
+    return collocations
+
+def write_collocation_graph(collocations, word_freq, output_file=GRAPH_FILE):
+    """Write a force-directed HTML graph of the collocations"""
+    nodes = sorted({word for item in collocations for word in item['words']})
+    graph = {
+        'nodes': [{'id': word, 'count': word_freq.get(word, 0)} for word in nodes],
+        'links': [{'source': item['words'][0], 'target': item['words'][1],
+                   'count': item['count'], 'llr': item['llr']} for item in collocations]
+    }
+
+    html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Missionary Song Lyrics - Word Collocations</title>
+    <script src="https://d3js.org/d3.v7.min.js"></script>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px;
+                      border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
+        h1 {{ text-align: center; color: #333; }}
+        .link {{ stroke: #999; stroke-opacity: 0.6; }}
+        .node text {{ font-size: 14px; pointer-events: none; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🔗 Words That Travel Together 🔗</h1>
+        <div id="graph"></div>
+    </div>
+    <script>
+        const graph = {json.dumps(graph, ensure_ascii=False)};
+        const width = 1000, height = 600;
+        const svg = d3.select("#graph").append("svg").attr("width", width).attr("height", height);
+        const color = d3.scaleOrdinal(d3.schemeCategory10);
+        const maxLlr = d3.max(graph.links, d => d.llr) || 1;
+        const maxCount = d3.max(graph.nodes, d => d.count) || 1;
+
+        const simulation = d3.forceSimulation(graph.nodes)
+            .force("link", d3.forceLink(graph.links).id(d => d.id).distance(90))
+            .force("charge", d3.forceManyBody().strength(-250))
+            .force("center", d3.forceCenter(width / 2, height / 2));
+
+        const link = svg.append("g").selectAll("line").data(graph.links).enter().append("line")
+            .attr("class", "link")
+            .attr("stroke-width", d => 1 + 6 * d.llr / maxLlr);
+        link.append("title").text(d => d.source.id + " + " + d.target.id + " (" + d.count + " times)");
+
+        const node = svg.append("g").selectAll("g").data(graph.nodes).enter().append("g").attr("class", "node");
+        node.append("circle")
+            .attr("r", d => 5 + 15 * Math.sqrt(d.count / maxCount))
+            .style("fill", (d, i) => color(i));
+        node.append("text").attr("dx", 12).attr("dy", 4).text(d => d.id);
+
+        simulation.on("tick", () => {{
+            link.attr("x1", d => d.source.x).attr("y1", d => d.source.y)
+                .attr("x2", d => d.target.x).attr("y2", d => d.target.y);
+            node.attr("transform", d => "translate(" + d.x + "," + d.y + ")");
+        }});
+    </script>
+</body>
+</html>
+"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    return output_file
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Find words that appear together in the lyrics')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--window', type=int, default=4, help='Max distance between paired words')
+    parser.add_argument('--min-count', type=int, default=2, help='Ignore pairs seen fewer times')
+    parser.add_argument('--measure', choices=['llr', 'pmi'], default='llr', help='Ranking score')
+    parser.add_argument('--top', type=int, default=25, help='Pairs to list')
+    parser.add_argument('--max-pairs', type=int, default=MAX_PAIRS, help='Distinct pairs kept in memory')
+    parser.add_argument('--all-words', action='store_true',
+                        help='Keep stop words so pairs like "fear not" can be found')
+    parser.add_argument('--json', help='Also write the collocations to this JSON file')
+    parser.add_argument('--graph', nargs='?', const=GRAPH_FILE,
+                        help=f'Write an HTML collocation graph (default {GRAPH_FILE})')
+    args = parser.parse_args()
+
+    print("🔗 Word Collocations in Missionary Songs 🔗")
+    print("=" * 50)
+
+    tokenizer = tokenize_all_words if args.all_words else clean_and_tokenize
+    corpus = build_token_corpus(read_lyrics_file(args.lyrics), tokenizer)
+    counts = count_cooccurrences(corpus, args.window, args.max_pairs)
+    collocations = score_collocations(counts, args.min_count, args.measure, args.top)
+
+    print(f"📝 {len(corpus)} words, {counts.total_pairs} pairs within {args.window} words, "
+          f"{len(counts.pairs)} distinct pairs kept")
+    if counts.prune_floor:
+        print(f"✂️  Pairs seen up to {counts.prune_floor} times were pruned to stay under "
+              f"{args.max_pairs} pairs; counts of rarer pairs are lower bounds")
+
+    print(f"\n🔝 Top {len(collocations)} pairs by {args.measure.upper()}:")
+    for i, item in enumerate(collocations, 1):
+        pair = ' + '.join(item['words'])
+        print(f"{i:2d}. {pair:<28} {item['count']:>4} times  PMI {item['pmi']:6.2f}  LLR {item['llr']:8.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(collocations, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Collocations saved to '{args.json}'")
+
+    if args.graph:
+        graph_file = write_collocation_graph(collocations, corpus.to_counter(), args.graph)
+        print(f"🌐 Collocation graph saved as '{graph_file}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Flashcard Deck Exporter (Anki and CSV)
+Turns teaching_flashcards.json into an Anki-importable package (.apkg)
+and/or a CSV file. Cards are enhanced with the Japanese learner data from
+japanese_flashcard_app.py and streamed to the outputs in batches.
+
+Usage:
+    python deck_export.py [teaching_flashcards.json] [--anki deck.apkg] [--csv deck.csv]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zipfile
+from itertools import islice
+
+from flashcard_stream import iter_flashcards
+from japanese_flashcard_app import iter_enhanced_flashcards
+
+EXPORT_FIELDS = ['english', 'japanese', 'romaji', 'example', 'difficulty', 'category']
+
+BATCH_SIZE = 5000
+
+# Fixed ids so re-imports update the same note type and deck in Anki
+MODEL_ID = 1607392319
+DECK_ID = 2059400110
+
+ANKI_SCHEMA = """
+CREATE TABLE col (
+    id integer primary key, crt integer not null, mod integer not null,
+    scm integer not null, ver integer not null, dty integer not null,
+    usn integer not null, ls integer not null, conf text not null,
+    models text not null, decks text not null, dconf text not null, tags text not null
+);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null,
+    mod integer not null, usn integer not null, tags text not null,
+    flds text not null, sfld integer not null, csum integer not null,
+    flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null,
+    ord integer not null, mod integer not null, usn integer not null,
+    type integer not null, queue integer not null, due integer not null,
+    ivl integer not null, factor integer not null, reps integer not null,
+    lapses integer not null, left integer not null, odue integer not null,
+    odid integer not null, flags integer not null, data text not null
+);
+CREATE TABLE revlog (
+    id integer primary key, cid integer not null, usn integer not null,
+    ease integer not null, ivl integer not null, lastIvl integer not null,
+    factor integer not null, time integer not null, type integer not null
+);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+CREATE INDEX ix_notes_usn ON notes (usn);
+CREATE INDEX ix_cards_usn ON cards (usn);
+CREATE INDEX ix_revlog_usn ON revlog (usn);
+CREATE INDEX ix_cards_nid ON cards (nid);
+CREATE INDEX ix_cards_sched ON cards (did, queue, due);
+CREATE INDEX ix_revlog_cid ON revlog (cid);
+CREATE INDEX ix_notes_csum ON notes (csum);
+"""
+
+CARD_CSS = """.card {
+    font-family: Arial, sans-serif;
+    font-size: 24px;
+    text-align: center;
+    color: #333;
+    background: white;
+}
+.japanese { font-size: 36px; color: #dc3545; font-weight: bold; }
+.romaji { color: #666; }
+.example { font-size: 18px; margin-top: 20px; }
+"""
+
+def iter_flashcard_rows(flashcards):
+    """Yield export rows (in EXPORT_FIELDS order) from enhanced flashcards"""
+    for card in flashcards:
+        yield [getattr(card, field) for field in EXPORT_FIELDS]
+
+def load_export_rows(filename='teaching_flashcards.json'):
+    """Stream a flashcard deck (.json or .jsonl) enhanced for Japanese learners"""
+    return iter_flashcard_rows(iter_enhanced_flashcards(iter_flashcards(filename)))
+
+def batched(rows, size=BATCH_SIZE):
+    """Split an iterable into lists of at most size items"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def write_csv(rows, filename):
+    """Stream rows to a CSV file with a header line"""
+    count = 0
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        for batch in batched(rows):
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+def anki_collection_config(deck_name, now):
+    """Build the col row JSON blobs (models, decks, deck options)"""
+
+    fields = [
+        {'name': field.capitalize(), 'ord': i, 'sticky': False, 'rtl': False,
+         'font': 'Arial', 'size': 20, 'media': []}
+        for i, field in enumerate(EXPORT_FIELDS)
+    ]
+    template = {
+        'name': 'English → Japanese',
+        'ord': 0,
+        'qfmt': '{{English}}',
+        'afmt': ('{{FrontSide}}<hr id="answer">'
+                 '<div class="japanese">{{Japanese}}</div>'
+                 '<div class="romaji">{{Romaji}}</div>'
+                 '<div class="example">{{Example}}</div>'),
+        'did': None,
+        'bqfmt': '',
+        'bafmt': ''
+    }
+    models = {
+        str(MODEL_ID): {
+            'id': MODEL_ID, 'name': 'Missionary Flashcard', 'type': 0, 'mod': now,
+            'usn': -1, 'sortf': 0, 'did': DECK_ID, 'tmpls': [template], 'flds': fields,
+            'css': CARD_CSS, 'latexPre': '', 'latexPost': '', 'tags': [], 'vers': [],
+            'req': [[0, 'any', [0]]]
+        }
+    }
+
+    def deck(deck_id, name):
+        return {
+            'id': deck_id, 'name': name, 'mod': now, 'usn': -1, 'desc': '', 'dyn': 0,
+            'conf': 1, 'collapsed': False, 'extendNew': 10, 'extendRev': 50,
+            'newToday': [0, 0], 'revToday': [0, 0], 'lrnToday': [0, 0], 'timeToday': [0, 0]
+        }
+
+    decks = {'1': deck(1, 'Default'), str(DECK_ID): deck(DECK_ID, deck_name)}
+    dconf = {
+        '1': {
+            'id': 1, 'name': 'Default', 'mod': 0, 'usn': 0, 'maxTaken': 60, 'autoplay': True,
+            'timer': 0, 'replayq': True, 'dyn': False,
+            'new': {'bury': True, 'delays': [1, 10], 'initialFactor': 2500,
+                    'ints': [1, 4, 7], 'order': 1, 'perDay': 20, 'separate': True},
+            'lapse': {'delays': [10], 'leechAction': 0, 'leechFails': 8,
+                      'minInt': 1, 'mult': 0},
+            'rev': {'bury': True, 'ease4': 1.3, 'fuzz': 0.05, 'ivlFct': 1,
+                    'maxIvl': 36500, 'minSpace': 1, 'perDay': 100}
+        }
+    }
+    conf = {'activeDecks': [1], 'curDeck': 1, 'newSpread': 0, 'collapseTime': 1200,
+            'timeLim': 0, 'estTimes': True, 'dueCounts': True, 'curModel': None,
+            'nextPos': 1, 'sortType': 'noteFld', 'sortBackwards': False, 'addToCur': True}
+
+    return json.dumps(conf), json.dumps(models), json.dumps(decks), json.dumps(dconf)
+
+def note_checksum(sort_field):
+    """Anki's note checksum: first 8 hex digits of the sort field's SHA-1"""
+    return int(hashlib.sha1(sort_field.encode('utf-8')).hexdigest()[:8], 16)
+
+def write_anki_package(rows, filename, deck_name='Missionary Song Vocabulary'):
+    """Write rows as an Anki .apkg (a zipped collection.anki2 SQLite database)"""
+
+    now = int(time.time())
+    base_id = now * 1000
+    count = 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        collection_path = os.path.join(tmp_dir, 'collection.anki2')
+        conn = sqlite3.connect(collection_path)
+        try:
+            # The collection is a throwaway file until it is zipped
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.executescript(ANKI_SCHEMA)
+            conn.execute('INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, ?)',
+                         (now, base_id, base_id, *anki_collection_config(deck_name, now), '{}'))
+
+            with conn:
+                for batch in batched(rows):
+                    notes = []
+                    cards = []
+                    for offset, row in enumerate(batch, count):
+                        note_id = base_id + offset
+                        values = [str(value) for value in row]
+                        guid = hashlib.sha1(f'missionary:{values[0]}'.encode('utf-8')).hexdigest()[:10]
+                        tags = f' {values[4]} {values[5]} '.replace('_', '-')
+                        notes.append((note_id, guid, MODEL_ID, now, -1, tags, '\x1f'.join(values),
+                                      values[0], note_checksum(values[0]), 0, ''))
+                        cards.append((note_id, note_id, DECK_ID, 0, now, -1,
+                                      0, 0, offset + 1, 0, 0, 0, 0, 0, 0, 0, 0, ''))
+                    conn.executemany('INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', notes)
+                    conn.executemany('INSERT INTO cards VALUES '
+                                     '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', cards)
+                    count += len(batch)
+        finally:
+            conn.close()
+
+        with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as package:
+            package.write(collection_path, 'collection.anki2')
+            package.writestr('media', '{}')
+
+    return count
+
+def main():
+    """Main export function"""
+    parser = argparse.ArgumentParser(description='Export flashcards to Anki and/or CSV')
+    parser.add_argument('flashcards', nargs='?', default='teaching_flashcards.json',
+                        help='Flashcard deck (.json or .jsonl)')
+    parser.add_argument('--anki', help='Write an Anki package (.apkg) to this path')
+    parser.add_argument('--csv', dest='csv_file', help='Write a CSV file to this path')
+    parser.add_argument('--deck-name', default='Missionary Song Vocabulary', help='Anki deck name')
+    args = parser.parse_args()
+
+    if not args.anki and not args.csv_file:
+        args.anki = 'missionary_flashcards.apkg'
+        args.csv_file = 'missionary_flashcards.csv'
+
+    print("📤 Flashcard Deck Exporter 📤")
+    print("=" * 50)
+
+    if args.csv_file:
+        count = write_csv(load_export_rows(args.flashcards), args.csv_file)
+        print(f"✅ {count} cards written to '{args.csv_file}'")
+    if args.anki:
+        count = write_anki_package(load_export_rows(args.flashcards), args.anki, args.deck_name)
+        print(f"✅ {count} cards written to '{args.anki}'")
+        print(f"💡 Import it in Anki with File → Import")
+
+if __name__ == "__main__":
+    main()
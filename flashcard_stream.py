@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Streaming Flashcard Deck Reader/Writer
+Reads and writes flashcard decks one card at a time so memory use does not
+depend on deck size. Both JSON Lines (.jsonl, one card per line) and the
+indented JSON array format of teaching_flashcards.json are supported; the
+array writer produces exactly what json.dump(cards, f, indent=2) would.
+
+Usage:
+    python flashcard_stream.py teaching_flashcards.json teaching_flashcards.jsonl
+"""
+
+import json
+import sys
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+def is_json_lines(filename):
+    """JSON Lines decks are recognised by their extension"""
+    return filename.lower().endswith(('.jsonl', '.ndjson'))
+
+def iter_json_lines(f):
+    """Yield one card per non-empty line"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators between items
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                raise ValueError('Unexpected end of flashcard array')
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError('Flashcard file is not a JSON array')
+            started = True
+            position += 1
+            continue
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            item, end = None, None
+
+        # An item that runs to the end of the buffer may continue in the next chunk
+        if end is None or (end == len(buffer) and not eof):
+            if eof:
+                raise ValueError('Malformed flashcard array')
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield item
+        position = end
+
+def iter_flashcards(filename):
+    """Stream cards from a .json array or .jsonl deck"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        if is_json_lines(filename):
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_array(f)
+
+def write_json_array(cards, f, indent=2):
+    """Write cards as an indented JSON array, one card at a time"""
+    count = 0
+    prefix = ' ' * indent
+    for card in cards:
+        f.write('[\n' if count == 0 else ',\n')
+        text = json.dumps(card, ensure_ascii=False, indent=indent)
+        f.write(prefix + text.replace('\n', '\n' + prefix))
+        count += 1
+    f.write('\n]' if count else '[]')
+    return count
+
+def write_flashcards(cards, filename):
+    """Stream cards to a .json array or .jsonl deck, returning the card count"""
+    count = 0
+    with open(filename, 'w', encoding='utf-8') as f:
+        if is_json_lines(filename):
+            for card in cards:
+                f.write(json.dumps(card, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        else:
+            count = write_json_array(cards, f)
+    return count
+
+def main():
+    """Convert a deck between the JSON array and JSON Lines formats"""
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        return 1
+
+    source, target = sys.argv[1], sys.argv[2]
+    count = write_flashcards(iter_flashcards(source), target)
+    print(f"✅ {count} flashcards converted from '{source}' to '{target}'")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
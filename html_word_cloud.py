@@ -4,16 +4,41 @@ HTML Word Cloud Generator for Missionary Song Lyrics
 This script generates an HTML file with JavaScript-based word cloud visualization
 """
 
+import argparse
+import heapq
 import re
 from collections import Counter
 import json
 
+from instrumentation import add_profiling_arguments, configure_profiling, instrumented, span
+from lemmatizer import lemmatize_words
+from repeated_sections import repeat_weighted_counts
+
+# Common English stop words to filter out
+STOP_WORDS = {
+    'the', 'and', 'to', 'of', 'a', 'an', 'in', 'on', 'at', 'by', 'for', 
+    'with', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 
+    'should', 'may', 'might', 'can', 'shall', 'must', 'ought', 'i', 'you', 
+    'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+    'my', 'your', 'his', 'her', 'its', 'our', 'their', 'this', 'that',
+    'these', 'those', 'so', 'up', 'out', 'if', 'about', 'who', 'what',
+    'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few',
+    'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
+    'own', 'same', 'than', 'too', 'very', 'just', 'now', 'oh', 'yeah',
+    'cause', 'lets', 'get', 'go', 'come', 'know', 'take', 'make',
+    'see', 'look', 'back', 'even', 'much', 'every', 'always', 'never',
+    'there', 'here', 'again', 'away', 'around', 'through', 'without'
+}
+
+@instrumented('read_lyrics_file', items=len)
 def read_lyrics_file(filename):
     """Read and clean the lyrics file"""
     with open(filename, 'r', encoding='utf-8') as file:
         content = file.read()
     return content
 
+@instrumented('clean_and_tokenize', items=len)
 def clean_and_tokenize(text):
     """Clean text and extract meaningful words"""
     # Remove song numbers and extra whitespace
@@ -25,40 +50,67 @@ def clean_and_tokenize(text):
     # Remove punctuation and split into words
     words = re.findall(r'\b[a-zA-Z]+\b', text)
     
-    # Common English stop words to filter out
-    stop_words = {
-        'the', 'and', 'to', 'of', 'a', 'an', 'in', 'on', 'at', 'by', 'for', 
-        'with', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 
-        'should', 'may', 'might', 'can', 'shall', 'must', 'ought', 'i', 'you', 
-        'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
-        'my', 'your', 'his', 'her', 'its', 'our', 'their', 'this', 'that',
-        'these', 'those', 'so', 'up', 'out', 'if', 'about', 'who', 'what',
-        'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few',
-        'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
-        'own', 'same', 'than', 'too', 'very', 'just', 'now', 'oh', 'yeah',
-        'cause', 'lets', 'get', 'go', 'come', 'know', 'take', 'make',
-        'see', 'look', 'back', 'even', 'much', 'every', 'always', 'never',
-        'there', 'here', 'again', 'away', 'around', 'through', 'without'
-    }
-    
     # Filter out stop words and very short words
-    meaningful_words = [word for word in words if word not in stop_words and len(word) > 2]
+    meaningful_words = [word for word in words if word not in STOP_WORDS and len(word) > 2]
     
     return meaningful_words
 
-def generate_html_word_cloud(words, output_file='missionary_word_cloud.html'):
+@instrumented('generate_html_word_cloud')
+def generate_html_word_cloud(words, output_file='missionary_word_cloud.html', scores=None):
     """Generate HTML file with JavaScript word cloud"""
     
-    word_freq = Counter(words)
-    top_words = word_freq.most_common(50)
+    html_content = render_html_word_cloud(Counter(words), scores)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    
+    print(f"✅ HTML Word Cloud saved as '{output_file}'")
+    print(f"🌐 Open this file in your web browser to see the interactive word cloud!")
+    return output_file
+
+@instrumented('generate_html_phrase_cloud')
+def generate_html_phrase_cloud(lyrics_file, output_file='missionary_word_cloud.html', sizes=(2, 3)):
+    """Generate the word cloud page from repeated phrases, streaming the lyrics file"""
+    from phrase_counts import count_phrases, iter_lyric_lines, phrase_text
+    
+    phrases, word_freq, floor = count_phrases(iter_lyric_lines(lyrics_file), sizes)
+    phrase_freq = Counter({phrase_text(gram): count for gram, count in phrases.items()})
+    html_content = render_html_word_cloud(phrase_freq, unit='Phrases', teaching_freq=word_freq)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    
+    print(f"✅ HTML Phrase Cloud saved as '{output_file}'")
+    if floor:
+        print(f"✂️  Phrases seen up to {floor} times were pruned to bound memory")
+    return output_file, phrase_freq
+
+def render_html_word_cloud(word_freq, scores=None, unit='Words', teaching_freq=None):
+    """Render the word cloud page from word counts (sized by scores if given)
+    
+    unit names what is counted in the stats ('Phrases' for a phrase cloud),
+    and teaching_freq gives the single-word counts for the priority panel
+    when word_freq holds something else.
+    """
+    
+    if scores is None:
+        top_words = word_freq.most_common(50)
+        sizes = [count * 5 for word, count in top_words]  # Scale up for better visualization
+    else:
+        # Pick and size words by score, scaled into the cloud's 10-60px font range
+        ranked = heapq.nlargest(50, scores.items(), key=lambda item: item[1])
+        top_words = [(word, word_freq[word]) for word, score in ranked]
+        best = ranked[0][1] if ranked and ranked[0][1] > 0 else 1
+        sizes = [round(10 + 50 * score / best) for word, score in ranked]
+    total_words = sum(word_freq.values())
+    teaching_freq = word_freq if teaching_freq is None else teaching_freq
     
     # Convert to format needed for JavaScript
     word_data = []
-    for word, count in top_words:
+    for (word, count), size in zip(top_words, sizes):
         word_data.append({
             'text': word,
-            'size': count * 5,  # Scale up for better visualization
+            'size': size,
             'count': count
         })
     
@@ -153,35 +205,35 @@ def generate_html_word_cloud(words, output_file='missionary_word_cloud.html'):
         
         <div class="stats">
             <div class="stat">
-                <div class="stat-number">{len(words)}</div>
-                <div class="stat-label">Total Words</div>
+                <div class="stat-number">{total_words}</div>
+                <div class="stat-label">Total {unit}</div>
             </div>
             <div class="stat">
-                <div class="stat-number">{len(set(words))}</div>
-                <div class="stat-label">Unique Words</div>
+                <div class="stat-number">{len(word_freq)}</div>
+                <div class="stat-label">Unique {unit}</div>
             </div>
             <div class="stat">
                 <div class="stat-number">{len(top_words)}</div>
-                <div class="stat-label">Top Words Shown</div>
+                <div class="stat-label">Top {unit} Shown</div>
             </div>
         </div>
         
         <div class="teaching-focus">
             <h3>🎯 Priority Words for Teaching Japanese Kids:</h3>
             <div class="word-list">
-                <div class="word-item">TRUST <span class="japanese-word">しんらい</span> - {word_freq.get('trust', 0)} times</div>
-                <div class="word-item">JESUS <span class="japanese-word">イエス</span> - {word_freq.get('jesus', 0)} times</div>
-                <div class="word-item">GOD <span class="japanese-word">かみ</span> - {word_freq.get('god', 0)} times</div>
-                <div class="word-item">POWER <span class="japanese-word">ちから</span> - {word_freq.get('power', 0)} times</div>
-                <div class="word-item">LOVE <span class="japanese-word">あい</span> - {word_freq.get('love', 0)} times</div>
-                <div class="word-item">HOPE <span class="japanese-word">きぼう</span> - {word_freq.get('hope', 0)} times</div>
-                <div class="word-item">FEAR <span class="japanese-word">こわい</span> - {word_freq.get('fear', 0)} times</div>
-                <div class="word-item">SMILE <span class="japanese-word">ほほえみ</span> - {word_freq.get('smile', 0)} times</div>
+                <div class="word-item">TRUST <span class="japanese-word">しんらい</span> - {teaching_freq.get('trust', 0)} times</div>
+                <div class="word-item">JESUS <span class="japanese-word">イエス</span> - {teaching_freq.get('jesus', 0)} times</div>
+                <div class="word-item">GOD <span class="japanese-word">かみ</span> - {teaching_freq.get('god', 0)} times</div>
+                <div class="word-item">POWER <span class="japanese-word">ちから</span> - {teaching_freq.get('power', 0)} times</div>
+                <div class="word-item">LOVE <span class="japanese-word">あい</span> - {teaching_freq.get('love', 0)} times</div>
+                <div class="word-item">HOPE <span class="japanese-word">きぼう</span> - {teaching_freq.get('hope', 0)} times</div>
+                <div class="word-item">FEAR <span class="japanese-word">こわい</span> - {teaching_freq.get('fear', 0)} times</div>
+                <div class="word-item">SMILE <span class="japanese-word">ほほえみ</span> - {teaching_freq.get('smile', 0)} times</div>
             </div>
         </div>
         
         <div class="word-list">
-            <h3>📊 All Key Words (Top 25):</h3>
+            <h3>📊 All Key {unit} (Top 25):</h3>
             {''.join([f'<div class="word-item">{word.upper()} ({count})</div>' for word, count in top_words[:25]])}
         </div>
     </div>
@@ -234,29 +286,102 @@ def generate_html_word_cloud(words, output_file='missionary_word_cloud.html'):
 </html>
 """
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"✅ HTML Word Cloud saved as '{output_file}'")
-    print(f"🌐 Open this file in your web browser to see the interactive word cloud!")
-    return output_file
+    return html_content
 
 def main():
     """Main function to generate HTML word cloud"""
+    parser = argparse.ArgumentParser(description='Generate an HTML word cloud from the lyrics')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--tfidf', action='store_true',
+                      help="Size words by their highest per-song TF-IDF instead of raw counts")
+    mode.add_argument('--phrases', action='store_true',
+                      help='Show repeated 2-3 word phrases instead of single words')
+    repeats = parser.add_mutually_exclusive_group()
+    repeats.add_argument('--dedup', action='store_true',
+                         help='Count each repeated chorus once instead of every time it is sung')
+    repeats.add_argument('--repeat-weight', type=float, metavar='W',
+                         help='Count repeated sections at weight W (0 is the same as --dedup)')
+    parser.add_argument('--lemmas', action='store_true',
+                        help='Count by lemma so trusting/trusted/trust are one word')
+    parser.add_argument('--unicode', action='store_true',
+                        help='Tokenize with NFKC normalization, contractions and non-Latin scripts')
+    parser.add_argument('--fix-spelling', action='store_true',
+                        help='Map typos and elongations (sooo, jesuss) to known words before counting')
+    parser.add_argument('--japanese', action='store_true',
+                        help='Also count the words of Japanese lyrics, split with the dictionary segmenter')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    configure_profiling(args)
+    if args.phrases and (args.dedup or args.repeat_weight is not None or args.lemmas
+                         or args.unicode or args.fix_spelling or args.japanese):
+        parser.error('--phrases counts the streamed file and cannot be combined with '
+                     '--dedup/--repeat-weight/--lemmas/--unicode/--fix-spelling/--japanese')
+    
     print("🎨 Generating HTML Word Cloud for Missionary Songs 🎨")
     print("=" * 60)
     
+    if args.phrases:
+        html_file, phrase_freq = generate_html_phrase_cloud('messy_lyrics.txt')
+        print(f"\n🔝 Top 10 Phrases:")
+        for i, (phrase, count) in enumerate(phrase_freq.most_common(10), 1):
+            print(f"  {i:2d}. {phrase.upper():<28} - {count} times")
+        print(f"\n🌐 Open '{html_file}' in your web browser to see the phrase cloud!")
+        return
+    
     # Read and process lyrics
     lyrics = read_lyrics_file('messy_lyrics.txt')
-    words = clean_and_tokenize(lyrics)
+    tokenizer = clean_and_tokenize
+    if args.unicode:
+        from unicode_tokenizer import unicode_tokenize
+        tokenizer = unicode_tokenize
+        print("🌏 Unicode tokenizer: contractions expanded, accents and Japanese kept")
+    if args.japanese:
+        from japanese_segmenter import is_japanese, japanese_tokenize
+        english_words = tokenizer
+        # Unsegmented Japanese runs from --unicode are replaced by segmented words
+        tokenizer = lambda text: ([word for word in english_words(text) if not is_japanese(word)]
+                                  + japanese_tokenize(text))
+        print("🎌 Counting Japanese words alongside English")
+    if args.fix_spelling:
+        from spelling_normalizer import build_normalizer
+        normalizer = build_normalizer(tokenizer(lyrics))
+        raw_words = tokenizer
+        tokenizer = lambda text: [word for word in normalizer.normalize_words(raw_words(text))
+                                  if word not in STOP_WORDS]
+        print(f"✏️  Correcting typos against {len(normalizer.dictionary)} known words")
+    if args.lemmas:
+        split_words = tokenizer
+        tokenizer = lambda text: lemmatize_words(split_words(text))
+        print("🌱 Counting words by lemma")
+    words = tokenizer(lyrics)
     
     print(f"📝 Processed {len(words)} words ({len(set(words))} unique)")
     
+    # Count choruses once (or at a reduced weight); the counts stand in for the word list.
+    # Repeats are found on the original lines, so the tokenizer built above still applies
+    if args.dedup or args.repeat_weight is not None:
+        repeat_weight = args.repeat_weight or 0.0
+        words = repeat_weighted_counts(lyrics, tokenizer, repeat_weight)
+        print(f"🔁 Repeated sections counted at weight {repeat_weight:g}: "
+              f"{sum(words.values())} words remain")
+    
+    # Distinctive words per song instead of the words every song shares
+    scores = None
+    if args.tfidf:
+        from term_matrix import build_song_term_matrix, word_scores
+        from token_index import build_token_corpus
+        with span('tfidf') as stage:
+            scores = word_scores(build_song_term_matrix(build_token_corpus(lyrics, tokenizer)))
+            stage.count(len(scores))
+        print(f"🎼 Sizing words by TF-IDF across songs")
+    
     # Generate HTML word cloud
-    html_file = generate_html_word_cloud(words)
+    html_file = generate_html_word_cloud(words, scores=scores)
     
     # Show top words
-    word_freq = Counter(words)
+    with span('count_words') as stage:
+        word_freq = Counter(words)
+        stage.count(len(word_freq))
     print(f"\n🔝 Top 10 Words:")
     for i, (word, count) in enumerate(word_freq.most_common(10), 1):
         print(f"  {i:2d}. {word.upper():<12} - {count} times")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Lightweight Stage Instrumentation
+Spans (context manager or decorator) that record wall time, CPU time, peak
+traced memory and item counts for each pipeline stage. Nothing is measured
+unless profiling is switched on, so the disabled cost is one flag check.
+
+Scripts add these options to their argparse parser with
+add_profiling_arguments() and switch profiling on with configure_profiling():
+    --profile                 write a JSON stage report to profile_report.json
+    --profile report.json     ... or to the given file
+    --cprofile FILE           also write cProfile stats (view with python -m pstats FILE)
+"""
+
+import atexit
+import cProfile
+import functools
+import json
+import sys
+import time
+import tracemalloc
+
+DEFAULT_REPORT = 'profile_report.json'
+
+_enabled = False
+_spans = []
+_stack = []
+_profiler = None
+
+class _NullSpan:
+    """Shared do-nothing span used while profiling is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, items):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """One timed stage; nested spans report their own numbers too"""
+
+    __slots__ = ('name', 'depth', 'items', 'wall', 'cpu', 'peak_bytes',
+                 '_wall_start', '_cpu_start', '_base_memory')
+
+    def __init__(self, name):
+        self.name = name
+        self.depth = len(_stack)
+        self.items = None
+        self.peak_bytes = 0
+
+    def count(self, items):
+        """Record how many items (words, cards, ...) the stage handled"""
+        self.items = items
+
+    def __enter__(self):
+        _stack.append(self)
+        self._base_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.process_time() - self._cpu_start
+        _, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(self.peak_bytes, peak - self._base_memory)
+        _stack.pop()
+
+        # reset_peak() in a child hides the child's peak from the parent
+        if _stack:
+            parent = _stack[-1]
+            parent.peak_bytes = max(parent.peak_bytes,
+                                    self.peak_bytes + self._base_memory - parent._base_memory)
+        _spans.append(self)
+        return False
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'peak_bytes': self.peak_bytes,
+            'items': self.items
+        }
+
+def span(name):
+    """Context manager timing a stage: with span('count') as s: ...; s.count(n)"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name)
+
+def instrumented(name=None, items=None):
+    """Decorator timing every call; items(result) gives the item count"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name) as stage:
+                result = func(*args, **kwargs)
+                if items is not None:
+                    stage.count(items(result))
+            return result
+        return wrapper
+    return decorator
+
+def enable(report_file=DEFAULT_REPORT, cprofile_file=None):
+    """Switch profiling on and write the report(s) when the process exits"""
+    global _enabled, _profiler
+    if _enabled:
+        return
+    _enabled = True
+    tracemalloc.start()
+    if cprofile_file:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(write_report, report_file, cprofile_file)
+
+def add_profiling_arguments(parser):
+    """Add --profile and --cprofile to a script's argparse parser"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, metavar='REPORT',
+                       help=f'Write a JSON stage report (default {DEFAULT_REPORT})')
+    group.add_argument('--cprofile', metavar='FILE',
+                       help='Also write cProfile stats (view with python -m pstats FILE)')
+    return parser
+
+def configure_profiling(args):
+    """Switch profiling on if the parsed arguments ask for it"""
+    if args.profile or args.cprofile:
+        enable(args.profile or DEFAULT_REPORT, args.cprofile)
+
+def report():
+    """All finished spans in start order"""
+    return {
+        'script': sys.argv[0] if sys.argv else None,
+        'spans': [stage.to_dict() for stage in sorted(_spans, key=lambda s: s._wall_start)]
+    }
+
+def write_report(report_file=DEFAULT_REPORT, cprofile_file=None):
+    """Write the JSON stage report (and cProfile stats) and print a summary"""
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(cprofile_file)
+
+    data = report()
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+    print("\n⏱️  Stage profile:", file=sys.stderr)
+    for stage in data['spans']:
+        items = f"  {stage['items']} items" if stage['items'] is not None else ''
+        print(f"  {'  ' * stage['depth']}{stage['name']:<28} wall {stage['wall_seconds']:.4f}s "
+              f"cpu {stage['cpu_seconds']:.4f}s peak {stage['peak_bytes'] / 1024 ** 2:.1f} MB{items}",
+              file=sys.stderr)
+    print(f"💾 Profile report saved to '{report_file}'", file=sys.stderr)
+    if cprofile_file:
+        print(f"💾 cProfile stats saved to '{cprofile_file}'", file=sys.stderr)
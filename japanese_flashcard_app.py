@@ -5,26 +5,32 @@ Creates a complete web application for Japanese learners to study English vocabu
 from missionary songs using interactive flashcards.
 """
 
+import argparse
+import io
 import json
+import os
+import pickle
 import re
-from collections import Counter
+import unicodedata
+from collections import Counter, namedtuple
+from types import MappingProxyType
 
-def read_lyrics_and_generate_flashcards():
-    """Read lyrics and generate flashcard data"""
-    
-    # Read the existing flashcard data
-    try:
-        with open('teaching_flashcards.json', 'r', encoding='utf-8') as f:
-            flashcards = json.load(f)
-    except FileNotFoundError:
-        # If flashcards don't exist, create them from lyrics
-        flashcards = create_flashcards_from_lyrics()
+from flashcard_stream import iter_flashcards, write_json_array
+from instrumentation import add_profiling_arguments, configure_profiling, instrumented, span
+from kana_converter import MACRONS, katakana_to_hiragana, reading_fields, split_reading
+
+FLASHCARD_FILE = 'teaching_flashcards.json'
+
+def iter_source_flashcards(filename=FLASHCARD_FILE):
+    """Stream the existing flashcard data, or create it from lyrics"""
     
-    # Add additional data for Japanese learners
-    enhanced_flashcards = enhance_for_japanese_learners(flashcards)
+    if os.path.exists(filename):
+        return iter_flashcards(filename)
     
-    return enhanced_flashcards
+    # If flashcards don't exist, create them from lyrics
+    return iter(create_flashcards_from_lyrics())
 
+@instrumented('create_flashcards_from_lyrics', items=len)
 def create_flashcards_from_lyrics():
     """Create flashcards from lyrics if they don't exist"""
     
@@ -68,206 +74,238 @@ def create_flashcards_from_lyrics():
     
     return flashcards
 
-def enhance_for_japanese_learners(flashcards):
-    """Add Japanese-specific learning data"""
+VOCABULARY_FILE = 'japanese_vocabulary.json'
+VOCABULARY_CACHE = 'japanese_vocabulary.pickle'
+
+# Field order of a compiled vocabulary entry
+VOCABULARY_FIELDS = (
+    'japanese', 'romaji', 'hiragana', 'katakana', 'pronunciation',
+    'meaning', 'example', 'difficulty', 'category'
+)
+
+VocabularyEntry = namedtuple('VocabularyEntry', VOCABULARY_FIELDS)
+
+_vocabulary = None
+
+def compile_japanese_vocabulary(filename=VOCABULARY_FILE, cache_file=VOCABULARY_CACHE):
+    """Compile the vocabulary data file into the binary cache used at startup"""
+    
+    with open(filename, 'r', encoding='utf-8') as f:
+        raw_vocabulary = json.load(f)
     
-    # Enhanced vocabulary with comprehensive Japanese data including hiragana/katakana pronunciations
-    japanese_vocabulary = {
-        'trust': {
-            'japanese': 'しんらい',
-            'romaji': 'shinrai',
-            'hiragana': 'しんらい',
-            'pronunciation': 'SHEEN-rah-ee',
-            'meaning': '信頼',
-            'example': 'I trust in God - 私は神を信頼します',
-            'difficulty': 'intermediate',
-            'category': 'faith'
-        },
-        'jesus': {
-            'japanese': 'イエス',
-            'romaji': 'iesu',
-            'katakana': 'イエス',
-            'pronunciation': 'EE-eh-soo',
-            'meaning': 'イエス',
-            'example': 'Jesus loves you - イエスはあなたを愛しています',
-            'difficulty': 'beginner',
-            'category': 'faith'
-        },
-        'god': {
-            'japanese': 'かみ',
-            'romaji': 'kami',
-            'hiragana': 'かみ',
-            'pronunciation': 'KAH-mee',
-            'meaning': '神',
-            'example': 'God is powerful - 神は力強いです',
-            'difficulty': 'beginner',
-            'category': 'faith'
-        },
-        'power': {
-            'japanese': 'ちから',
-            'romaji': 'chikara',
-            'hiragana': 'ちから',
-            'pronunciation': 'CHEE-kah-rah',
-            'meaning': '力',
-            'example': 'God has power - 神には力があります',
-            'difficulty': 'intermediate',
-            'category': 'attributes'
-        },
-        'love': {
-            'japanese': 'あい',
-            'romaji': 'ai',
-            'hiragana': 'あい',
-            'pronunciation': 'AH-ee',
-            'meaning': '愛',
-            'example': 'Love is important - 愛は大切です',
-            'difficulty': 'beginner',
-            'category': 'emotions'
-        },
-        'hope': {
-            'japanese': 'きぼう',
-            'romaji': 'kibou',
-            'hiragana': 'きぼう',
-            'pronunciation': 'KEE-boh',
-            'meaning': '希望',
-            'example': 'I have hope - 私には希望があります',
-            'difficulty': 'intermediate',
-            'category': 'emotions'
-        },
-        'fear': {
-            'japanese': 'こわい',
-            'romaji': 'kowai',
-            'hiragana': 'こわい',
-            'pronunciation': 'KOH-wah-ee',
-            'meaning': '怖い',
-            'example': 'Do not fear - 恐れてはいけません',
-            'difficulty': 'beginner',
-            'category': 'emotions'
-        },
-        'life': {
-            'japanese': 'いのち',
-            'romaji': 'inochi',
-            'hiragana': 'いのち',
-            'pronunciation': 'EE-noh-chee',
-            'meaning': '命',
-            'example': 'Life is precious - 命は貴重です',
-            'difficulty': 'intermediate',
-            'category': 'concepts'
-        },
-        'way': {
-            'japanese': 'みち',
-            'romaji': 'michi',
-            'hiragana': 'みち',
-            'pronunciation': 'MEE-chee',
-            'meaning': '道',
-            'example': 'Jesus is the way - イエスは道です',
-            'difficulty': 'beginner',
-            'category': 'concepts'
-        },
-        'smile': {
-            'japanese': 'ほほえみ',
-            'romaji': 'hohoemi',
-            'hiragana': 'ほほえみ',
-            'pronunciation': 'HOH-hoh-eh-mee',
-            'meaning': '微笑み',
-            'example': 'Please smile - 笑顔をください',
-            'difficulty': 'intermediate',
-            'category': 'actions'
-        },
-        'powerful': {
-            'japanese': 'つよい',
-            'romaji': 'tsuyoi',
-            'hiragana': 'つよい',
-            'pronunciation': 'TSOO-yoh-ee',
-            'meaning': '強い',
-            'example': 'God is powerful - 神は強いです',
-            'difficulty': 'intermediate',
-            'category': 'attributes'
-        },
-        'heart': {
-            'japanese': 'こころ',
-            'romaji': 'kokoro',
-            'hiragana': 'こころ',
-            'pronunciation': 'KOH-koh-roh',
-            'meaning': '心',
-            'example': 'Open your heart - 心を開いてください',
-            'difficulty': 'beginner',
-            'category': 'concepts'
-        },
-        'peace': {
-            'japanese': 'へいわ',
-            'romaji': 'heiwa',
-            'hiragana': 'へいわ',
-            'pronunciation': 'HEH-ee-wah',
-            'meaning': '平和',
-            'example': 'Peace be with you - 平和があなたとともに',
-            'difficulty': 'intermediate',
-            'category': 'concepts'
-        },
-        'joy': {
-            'japanese': 'よろこび',
-            'romaji': 'yorokobi',
-            'hiragana': 'よろこび',
-            'pronunciation': 'YOH-roh-koh-bee',
-            'meaning': '喜び',
-            'example': 'Joy comes from God - 喜びは神から来ます',
-            'difficulty': 'intermediate',
-            'category': 'emotions'
-        },
-        'light': {
-            'japanese': 'ひかり',
-            'romaji': 'hikari',
-            'hiragana': 'ひかり',
-            'pronunciation': 'HEE-kah-ree',
-            'meaning': '光',
-            'example': 'Jesus is the light - イエスは光です',
-            'difficulty': 'beginner',
-            'category': 'concepts'
-        }
+    compiled = {
+        word: tuple(entry.get(field, '') for field in VOCABULARY_FIELDS)
+        for word, entry in raw_vocabulary.items()
     }
     
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump((VOCABULARY_FIELDS, compiled), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # A read-only checkout still works, it just recompiles next time
+        pass
+    
+    return compiled
+
+@instrumented('load_japanese_vocabulary', items=len)
+def load_japanese_vocabulary(filename=VOCABULARY_FILE, cache_file=VOCABULARY_CACHE):
+    """Load the read-only vocabulary lookup, compiling it at most once per process"""
+    
+    global _vocabulary
+    if _vocabulary is not None:
+        return _vocabulary
+    
+    compiled = None
+    if (os.path.exists(cache_file) and
+            os.path.getmtime(cache_file) >= os.path.getmtime(filename)):
+        with open(cache_file, 'rb') as f:
+            fields, cached = pickle.load(f)
+        if fields == VOCABULARY_FIELDS:
+            compiled = cached
+    
+    if compiled is None:
+        compiled = compile_japanese_vocabulary(filename, cache_file)
+    
+    _vocabulary = MappingProxyType({
+        word: VocabularyEntry._make(values) for word, values in compiled.items()
+    })
+    return _vocabulary
+
+class Flashcard:
+    """A flashcard enhanced for Japanese learners
+    
+    The source record is kept by reference and only merged into a dict
+    by to_dict() when the deck is written out.
+    """
+    
+    __slots__ = ('source',) + VOCABULARY_FIELDS
+    
+    def __init__(self, source, japanese, romaji, hiragana, katakana,
+                 pronunciation, meaning, example, difficulty, category):
+        self.source = source
+        self.japanese = japanese
+        self.romaji = romaji
+        self.hiragana = hiragana
+        self.katakana = katakana
+        self.pronunciation = pronunciation
+        self.meaning = meaning
+        self.example = example
+        self.difficulty = difficulty
+        self.category = category
+    
+    @property
+    def english(self):
+        return self.source['english']
+    
+    def to_dict(self):
+        """Convert to the JSON card format used by the web app"""
+        card = dict(self.source)
+        for field in VOCABULARY_FIELDS:
+            card[field] = getattr(self, field)
+        return card
+
+def iter_enhanced_flashcards(flashcards):
+    """Enhance cards one at a time, for streaming decks"""
+    
+    japanese_vocabulary = load_japanese_vocabulary()
+    
     # Enhance flashcards with Japanese data
-    enhanced_flashcards = []
     for card in flashcards:
         english_word = card['english'].lower()
+        jp_data = japanese_vocabulary.get(english_word)
         
-        if english_word in japanese_vocabulary:
-            jp_data = japanese_vocabulary[english_word]
-            enhanced_card = {
-                **card,
-                'japanese': jp_data['japanese'],
-                'romaji': jp_data['romaji'],
-                'hiragana': jp_data.get('hiragana', ''),
-                'katakana': jp_data.get('katakana', ''),
-                'pronunciation': jp_data['pronunciation'],
-                'meaning': jp_data['meaning'],
-                'example': jp_data['example'],
-                'difficulty': jp_data['difficulty'],
-                'category': jp_data['category']
-            }
+        if jp_data is not None:
+            enhanced_card = Flashcard(card, *jp_data)
         else:
-            # Provide basic data for words not in our enhanced list
-            enhanced_card = {
-                **card,
-                'japanese': f'[{english_word}]',
-                'romaji': english_word,
-                'hiragana': '',
-                'katakana': '',
-                'pronunciation': f'[{english_word.upper()}]',
-                'meaning': f'[{english_word}]',
-                'example': f'Example with {english_word}',
-                'difficulty': 'beginner',
-                'category': 'general'
-            }
-        
-        enhanced_flashcards.append(enhanced_card)
+            # Provide basic data for words not in our enhanced list; readings
+            # are generated from the card's own kana when it has some
+            kana, _ = split_reading(card.get('japanese', ''))
+            readings = (reading_fields(kana) if kana else
+                        {'romaji': english_word, 'hiragana': '', 'katakana': ''})
+            enhanced_card = Flashcard(
+                card,
+                japanese=kana or f'[{english_word}]',
+                **readings,
+                pronunciation=f'[{english_word.upper()}]',
+                meaning=f'[{english_word}]',
+                example=f'Example with {english_word}',
+                difficulty='beginner',
+                category='general'
+            )
+        
+        yield enhanced_card
+
+def new_card_indexes():
+    """Empty card indexes, filled by add_to_card_indexes"""
+    return {'all': [], 'difficulty': {}, 'category': {}, 'combined': {}}
+
+def add_to_card_indexes(indexes, position, card):
+    """Record one card dict's position in the card indexes"""
+    difficulty = card.get('difficulty', 'beginner')
+    category = card.get('category', 'general')
+    indexes['all'].append(position)
+    indexes['difficulty'].setdefault(difficulty, []).append(position)
+    indexes['category'].setdefault(category, []).append(position)
+    indexes['combined'].setdefault(f'{difficulty}|{category}', []).append(position)
+
+# Card fields the page's search box matches by prefix
+SEARCH_FIELDS = ('english', 'japanese', 'romaji', 'hiragana', 'katakana')
+SEARCH_WORD = re.compile(r'\w+')
+
+def fold_search_text(text):
+    """Text as the page's search compares it: NFKC, lower case, katakana as hiragana"""
+    return katakana_to_hiragana(unicodedata.normalize('NFKC', text).lower())
+
+def search_terms(card):
+    """Search keys of a card dict: each searched field whole and word by word"""
+    terms = set()
+    for field in SEARCH_FIELDS:
+        words = SEARCH_WORD.findall(fold_search_text(card.get(field) or ''))
+        if not words:
+            continue
+        terms.add(' '.join(words))
+        terms.update(words)
+    # Macron romaji is also found when typed as plain letters: kyōkai / kyoukai
+    terms.update([term.translate(MACRONS) for term in terms])
+    return terms
+
+def add_to_search_index(search_index, position, card):
+    """Record one card dict's position under each of its search keys"""
+    for term in search_terms(card):
+        search_index.setdefault(term, []).append(position)
+
+def compact_search_index(search_index):
+    """{'keys': sorted keys, 'cards': positions per key}, for binary search in the page
     
-    return enhanced_flashcards
+    Keys are sorted by UTF-16 code units, the order JavaScript compares
+    strings in, so a prefix's matches are one contiguous run of keys.
+    """
+    keys = sorted(search_index, key=lambda term: term.encode('utf-16-be'))
+    return {'keys': keys, 'cards': [search_index[key] for key in keys]}
+
+def load_review_schedule(filename='review_schedule.json'):
+    """Load the per-student due sets written by spaced_repetition.py, if any"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+# Placeholders in the page template where the deck and its indexes are streamed in
+FLASHCARDS_MARKER = '/*__FLASHCARDS__*/'
+INDEXES_MARKER = '/*__CARD_INDEXES__*/'
+SEARCH_MARKER = '/*__SEARCH_INDEX__*/'
 
-def generate_flashcard_webapp(flashcards):
+def generate_flashcard_webapp(flashcards, review_schedule=None):
     """Generate the complete web application"""
     
-    # Convert flashcards to JavaScript format
-    flashcard_data = json.dumps(flashcards, ensure_ascii=False, indent=2)
+    output = io.StringIO()
+    write_flashcard_webapp(flashcards, output, review_schedule)
+    return output.getvalue()
+
+def write_flashcard_webapp(flashcards, f, review_schedule=None):
+    """Stream the web application to an open file, returning the card count
+    
+    Cards are serialized one at a time, so only the card and search indexes
+    are kept in memory however large the deck is.
+    """
+    
+    head, rest = render_webapp_template(review_schedule).split(FLASHCARDS_MARKER)
+    middle, rest = rest.split(INDEXES_MARKER)
+    between, tail = rest.split(SEARCH_MARKER)
+
+    # Filtering in the page is a lookup into these precomputed position lists
+    card_indexes = new_card_indexes()
+    # Searching is a binary search over these precomputed keys
+    search_index = {}
+
+    def card_dicts():
+        # Cards only become dicts here, at the output boundary
+        for position, card in enumerate(flashcards):
+            card = card.to_dict() if isinstance(card, Flashcard) else card
+            add_to_card_indexes(card_indexes, position, card)
+            add_to_search_index(search_index, position, card)
+            yield card
+
+    f.write(head)
+    count = write_json_array(card_dicts(), f)
+    f.write(middle)
+    json.dump(card_indexes, f, ensure_ascii=False, separators=(',', ':'))
+    f.write(between)
+    json.dump(compact_search_index(search_index), f, ensure_ascii=False, separators=(',', ':'))
+    f.write(tail)
+
+    return count
+
+def render_webapp_template(review_schedule=None):
+    """Render the page around placeholders for the deck and its indexes"""
+    
+    flashcard_data = FLASHCARDS_MARKER
+    index_data = INDEXES_MARKER
+    search_data = SEARCH_MARKER
+    
+    # Each student's due cards from the spaced-repetition scheduler
+    schedule_data = json.dumps(review_schedule or {}, ensure_ascii=False, separators=(',', ':'))
     
     html_content = f"""
 <!DOCTYPE html>
@@ -537,6 +575,22 @@ def generate_flashcard_webapp(flashcards):
             color: white;
         }}
         
+        .search {{
+            display: flex;
+            justify-content: center;
+            margin-bottom: 15px;
+        }}
+        
+        .search-box {{
+            width: 100%;
+            max-width: 400px;
+            padding: 10px 18px;
+            border: 2px solid #667eea;
+            border-radius: 25px;
+            font-size: 16px;
+            outline: none;
+        }}
+        
         .stats {{
             display: flex;
             justify-content: space-around;
@@ -676,11 +730,20 @@ def generate_flashcard_webapp(flashcards):
             <div class="progress-fill" id="progressFill"></div>
         </div>
         
+        <div class="search">
+            <input type="search" class="search-box" id="searchBox" autocomplete="off"
+                   placeholder="🔍 Search English, かな or romaji / 検索" oninput="searchCards(this.value)">
+        </div>
+        
         <div class="difficulty-filter">
             <button class="filter-btn active" onclick="filterByDifficulty('all')">All / すべて</button>
+            <button class="filter-btn" onclick="filterByDifficulty('due')">Due Today / 今日の復習</button>
             <button class="filter-btn" onclick="filterByDifficulty('beginner')">Beginner / 初級</button>
             <button class="filter-btn" onclick="filterByDifficulty('intermediate')">Intermediate / 中級</button>
             <button class="filter-btn" onclick="filterByDifficulty('advanced')">Advanced / 上級</button>
+            <select class="filter-btn" id="categoryFilter" onchange="filterByCategory(this.value)">
+                <option value="all">All Categories / 全カテゴリー</option>
+            </select>
         </div>
         
         <div class="controls">
@@ -734,9 +797,30 @@ def generate_flashcard_webapp(flashcards):
         // Flashcard data
         const flashcards = {flashcard_data};
         
+        // Precomputed card positions per difficulty/category
+        const cardIndexes = {index_data};
+        
+        // Sorted search keys and the card positions under each
+        const searchIndex = {search_data};
+        
+        // Due cards per student from the nightly scheduler (?student=name)
+        const reviewSchedule = {schedule_data};
+        const currentStudent = new URLSearchParams(window.location.search).get('student') ||
+            localStorage.getItem('flashcardStudent') || '';
+        if (currentStudent) {{
+            localStorage.setItem('flashcardStudent', currentStudent);
+        }}
+        const cardPositions = new Map(flashcards.map((card, position) => [card.english, position]));
+        const dueIndex = (reviewSchedule[currentStudent] || [])
+            .filter(english => cardPositions.has(english))
+            .map(english => cardPositions.get(english));
+        
         // App state
         let currentIndex = 0;
-        let filteredCards = flashcards;
+        let activeDifficulty = 'all';
+        let activeCategory = 'all';
+        let searchQuery = '';
+        let filteredCards = cardIndexes.all.slice();
         let isFlipped = false;
         let studiedCards = new Set();
         let masteredCards = new Set();
@@ -751,9 +835,12 @@ def generate_flashcard_webapp(flashcards):
         
         // Display current card
         function displayCard() {{
-            if (filteredCards.length === 0) return;
+            if (filteredCards.length === 0) {{
+                showEmptyCard();
+                return;
+            }}
             
-            const card = filteredCards[currentIndex];
+            const card = currentCard();
             const flashcardElement = document.getElementById('flashcard');
             
             // Update front of card
@@ -788,15 +875,38 @@ def generate_flashcard_webapp(flashcards):
             updateStats();
         }}
         
+        // Empty state when no card matches the search and filters
+        function showEmptyCard() {{
+            document.getElementById('englishWord').textContent = 'No matching cards';
+            document.getElementById('japaneseWord').textContent = '該当するカードがありません';
+            ['pronunciation', 'frequency', 'categoryTag', 'romaji', 'hiraganaKatakana',
+             'pronunciationGuide', 'meaning', 'example'].forEach(id => {{
+                document.getElementById(id).textContent = '';
+            }});
+            document.getElementById('flashcard').classList.remove('flipped');
+            isFlipped = false;
+            
+            document.getElementById('cardPosition').textContent = 0;
+            document.getElementById('totalCount').textContent = 0;
+            updateStats();
+            document.getElementById('currentCard').textContent = 0;
+        }}
+        
+        // Card at the current position of the filtered index
+        function currentCard() {{
+            return flashcards[filteredCards[currentIndex]];
+        }}
+        
         // Flip card
         function flipCard() {{
+            if (filteredCards.length === 0) return;
             const flashcardElement = document.getElementById('flashcard');
             flashcardElement.classList.toggle('flipped');
             isFlipped = !isFlipped;
             
             // Mark as studied when flipped
             if (isFlipped) {{
-                studiedCards.add(filteredCards[currentIndex].english);
+                studiedCards.add(currentCard().english);
                 saveProgress();
                 updateStats();
             }}
@@ -804,36 +914,124 @@ def generate_flashcard_webapp(flashcards):
         
         // Navigation functions
         function nextCard() {{
+            if (filteredCards.length === 0) return;
             currentIndex = (currentIndex + 1) % filteredCards.length;
             displayCard();
         }}
         
         function previousCard() {{
+            if (filteredCards.length === 0) return;
             currentIndex = (currentIndex - 1 + filteredCards.length) % filteredCards.length;
             displayCard();
         }}
         
-        // Filter by difficulty
-        function filterByDifficulty(difficulty) {{
-            // Update active filter button
-            document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
-            event.target.classList.add('active');
-            
-            // Filter cards
-            if (difficulty === 'all') {{
-                filteredCards = flashcards;
+        // Look up the precomputed index for the active filters
+        function applyFilters() {{
+            let positions;
+            if (activeDifficulty === 'due') {{
+                positions = activeCategory === 'all' ? dueIndex :
+                    dueIndex.filter(position => flashcards[position].category === activeCategory);
+            }} else if (activeDifficulty === 'all' && activeCategory === 'all') {{
+                positions = cardIndexes.all;
+            }} else if (activeCategory === 'all') {{
+                positions = cardIndexes.difficulty[activeDifficulty];
+            }} else if (activeDifficulty === 'all') {{
+                positions = cardIndexes.category[activeCategory];
             }} else {{
-                filteredCards = flashcards.filter(card => card.difficulty === difficulty);
+                positions = cardIndexes.combined[activeDifficulty + '|' + activeCategory];
             }}
             
+            positions = positions || [];
+            
+            // Intersect with the search matches, walking whichever side is smaller;
+            // copies, so shuffling never reorders the shared index
+            const matches = searchPositions(searchQuery);
+            if (!matches) {{
+                filteredCards = positions.slice();
+            }} else if (positions === cardIndexes.all) {{
+                filteredCards = Array.from(matches).sort((a, b) => a - b);
+            }} else if (matches.size < positions.length) {{
+                const allowed = positionSet(positions);
+                filteredCards = Array.from(matches).filter(position => allowed.has(position))
+                    .sort((a, b) => a - b);
+            }} else {{
+                filteredCards = positions.filter(position => matches.has(position));
+            }}
             currentIndex = 0;
             displayCard();
         }}
         
+        // Membership sets of the precomputed position lists, built on first use
+        const positionSets = new WeakMap();
+        function positionSet(positions) {{
+            let set = positionSets.get(positions);
+            if (!set) {{
+                set = new Set(positions);
+                positionSets.set(positions, set);
+            }}
+            return set;
+        }}
+        
+        // Query folded the way the search keys were: NFKC, lower case, katakana as hiragana
+        function foldSearchText(text) {{
+            const words = text.normalize('NFKC').toLowerCase()
+                .replace(/[\\u30a1-\\u30f6]/g, kana => String.fromCharCode(kana.charCodeAt(0) - 0x60))
+                .match(/[\\p{{L}}\\p{{N}}_]+/gu);
+            return words ? words.join(' ') : '';
+        }}
+        
+        // Positions of the cards with a search key starting with the query (null for no query)
+        function searchPositions(query) {{
+            const prefix = foldSearchText(query);
+            if (!prefix) return null;
+            
+            // Binary search for the first key >= prefix; its matches follow it
+            const keys = searchIndex.keys;
+            let low = 0;
+            let high = keys.length;
+            while (low < high) {{
+                const middle = (low + high) >> 1;
+                if (keys[middle] < prefix) {{
+                    low = middle + 1;
+                }} else {{
+                    high = middle;
+                }}
+            }}
+            
+            const matches = new Set();
+            for (let i = low; i < keys.length && keys[i].startsWith(prefix); i++) {{
+                searchIndex.cards[i].forEach(position => matches.add(position));
+            }}
+            return matches;
+        }}
+        
+        // Incremental search as the query is typed
+        function searchCards(query) {{
+            searchQuery = query;
+            applyFilters();
+        }}
+        
+        // Filter by difficulty
+        function filterByDifficulty(difficulty) {{
+            // Update active filter button
+            document.querySelectorAll('button.filter-btn').forEach(btn => btn.classList.remove('active'));
+            event.target.classList.add('active');
+            
+            activeDifficulty = difficulty;
+            applyFilters();
+        }}
+        
+        // Filter by category
+        function filterByCategory(category) {{
+            activeCategory = category;
+            applyFilters();
+        }}
+        
         // Mark card as known
         function markAsKnown() {{
-            masteredCards.add(filteredCards[currentIndex].english);
-            studiedCards.add(filteredCards[currentIndex].english);
+            if (filteredCards.length === 0) return;
+            masteredCards.add(currentCard().english);
+            studiedCards.add(currentCard().english);
             saveProgress();
             updateStats();
             nextCard();
@@ -842,7 +1040,8 @@ def generate_flashcard_webapp(flashcards):
         
         // Mark card for review
         function markForReview() {{
-            reviewCards.add(filteredCards[currentIndex].english);
+            if (filteredCards.length === 0) return;
+            reviewCards.add(currentCard().english);
             saveProgress();
             nextCard();
         }}
@@ -872,7 +1071,8 @@ def generate_flashcard_webapp(flashcards):
         // Play audio (Text-to-Speech)
         function playAudio(event) {{
             event.stopPropagation();
-            const card = filteredCards[currentIndex];
+            if (filteredCards.length === 0) return;
+            const card = currentCard();
             const text = isFlipped ? card.japanese : card.english;
             const lang = isFlipped ? 'ja-JP' : 'en-US';
             
@@ -925,6 +1125,7 @@ def generate_flashcard_webapp(flashcards):
                 studiedCards: Array.from(studiedCards),
                 masteredCards: Array.from(masteredCards),
                 reviewCards: Array.from(reviewCards),
+                student: currentStudent,
                 totalCards: flashcards.length,
                 date: new Date().toISOString()
             }};
@@ -963,6 +1164,9 @@ def generate_flashcard_webapp(flashcards):
         
         // Keyboard shortcuts
         document.addEventListener('keydown', function(e) {{
+            // Typing in the search box is not a shortcut
+            if (e.target.tagName === 'INPUT') return;
+            
             switch(e.key) {{
                 case 'ArrowRight':
                 case ' ':
@@ -983,8 +1187,17 @@ def generate_flashcard_webapp(flashcards):
             }}
         }});
         
+        // Fill the category filter from the precomputed index
+        const categoryFilter = document.getElementById('categoryFilter');
+        Object.keys(cardIndexes.category).sort().forEach(category => {{
+            const option = document.createElement('option');
+            option.value = category;
+            option.textContent = category;
+            categoryFilter.appendChild(option);
+        }});
+        
         // Initialize
-        filteredCards = flashcards;
+        filteredCards = cardIndexes.all.slice();
         updateStats();
         displayCard();
     </script>
@@ -996,30 +1209,34 @@ def generate_flashcard_webapp(flashcards):
 
 def main():
     """Main function to generate the flashcard web app"""
+    parser = argparse.ArgumentParser(description='Generate the interactive flashcard web app')
+    add_profiling_arguments(parser)
+    configure_profiling(parser.parse_args())
+    
     print("🎌 Generating Interactive Flashcard Web App for Japanese Learners 🎌")
     print("=" * 70)
     
-    # Generate enhanced flashcards
+    # Enhanced flashcards are streamed straight into the page
     print("📚 Reading and enhancing flashcard data...")
-    flashcards = read_lyrics_and_generate_flashcards()
+    flashcards = iter_enhanced_flashcards(iter_source_flashcards())
     
-    # Generate web app
+    # Generate web app and save to file
     print("🎨 Creating interactive web application...")
-    html_content = generate_flashcard_webapp(flashcards)
-    
-    # Save to file
     filename = 'japanese_english_flashcards.html'
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with open(filename, 'w', encoding='utf-8') as f, span('write_flashcard_webapp') as stage:
+        card_count = write_flashcard_webapp(flashcards, f, load_review_schedule())
+        stage.count(card_count)
     
     print(f"✅ Flashcard web app created: {filename}")
-    print(f"📊 Total flashcards: {len(flashcards)}")
+    print(f"📊 Total flashcards: {card_count}")
     print(f"🎯 Features included:")
     print(f"   • Interactive flip cards with animations")
     print(f"   • Japanese translations with romaji")
     print(f"   • Audio pronunciation (Text-to-Speech)")
     print(f"   • Progress tracking and achievements")
     print(f"   • Difficulty filtering")
+    print(f"   • Incremental search by English, kana or romaji")
+    print(f"   • Spaced-repetition due cards (open with ?student=name)")
     print(f"   • Keyboard shortcuts")
     print(f"   • Mobile responsive design")
     print(f"   • Local storage for progress")
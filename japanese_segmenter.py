@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Japanese Word Segmenter
+Splits the Japanese lines of bilingual songs into words, so Japanese word
+frequencies can be counted alongside English ones. Japanese text has no
+spaces, so words are found by longest match against a dictionary.
+
+The dictionary is japanese_dictionary.txt (one "word<TAB>english" per line),
+seeded from the teaching vocabulary and the flashcard vocabulary with
+--seed. Particles and other function words are built in. At startup the
+dictionary is compiled into a trie and cached in japanese_dictionary.trie.
+The trie is flattened to a dict keyed by prefix string, so walking it is one
+C-level dict lookup per character, with no per-node objects. Characters no
+word matches become unknown words: whole katakana or kanji runs (loanwords,
+names) up to where a known word starts, or single hiragana.
+
+Usage:
+    python japanese_segmenter.py [messy_lyrics.txt] [--top 20]
+    python japanese_segmenter.py --seed
+    python japanese_segmenter.py --text 神は愛です
+"""
+
+import argparse
+import os
+import pickle
+import re
+import unicodedata
+from collections import Counter
+
+DICTIONARY_FILE = 'japanese_dictionary.txt'
+TRIE_FILE = 'japanese_dictionary.trie'
+TRIE_VERSION = 1
+
+# Particles, copulas and pronouns: segmented, but never counted
+FUNCTION_WORDS = (
+    'は', 'が', 'を', 'に', 'へ', 'と', 'で', 'の', 'も', 'や', 'か', 'ね', 'よ', 'な',
+    'から', 'まで', 'より', 'には', 'では', 'とも', 'ので', 'けど',
+    'です', 'でした', 'ます', 'ました', 'ません', 'ください', 'ている', 'います',
+    'あります', 'する', 'します', 'した', 'して', 'いる', 'ある', 'この', 'その', 'あの',
+    'わたし', '私', 'ぼく', '僕', 'あなた', 'きみ', '君', 'みんな', 'さま', '様', 'さん',
+)
+
+# Runs of kana and kanji (with the iteration mark and the long vowel mark)
+JAPANESE_RUN = re.compile('[\u3005\u3006\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+_segmenter = None
+
+def char_script(char):
+    """'hiragana', 'katakana' or 'kanji'"""
+    if '\u3040' <= char <= '\u309f':
+        return 'hiragana'
+    if '\u30a0' <= char <= '\u30ff':
+        return 'katakana'
+    return 'kanji'
+
+def is_japanese(word):
+    """Whether a token is written in kana or kanji"""
+    return JAPANESE_RUN.match(word) is not None
+
+def seed_dictionary_entries():
+    """{word: english} from the teaching and flashcard vocabularies"""
+    from japanese_flashcard_app import load_japanese_vocabulary
+    from japanese_teaching_tool import get_teaching_vocabulary
+
+    entries = {}
+    for category in get_teaching_vocabulary().values():
+        for english, entry in category['words'].items():
+            # "かみ (kami)" → かみ
+            entries.setdefault(entry['japanese'].split(' (')[0], english)
+    for english, entry in load_japanese_vocabulary().items():
+        for form in (entry.japanese, entry.hiragana, entry.katakana, entry.meaning):
+            if form and is_japanese(form):
+                entries.setdefault(form, english)
+    return entries
+
+def write_dictionary(entries, filename=DICTIONARY_FILE):
+    """Write {word: english} as a dictionary file"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('# Japanese word<TAB>English meaning; one word per line\n')
+        for word, english in sorted(entries.items()):
+            f.write(f'{word}\t{english}\n')
+
+def read_dictionary(filename=DICTIONARY_FILE):
+    """{word: english} from a dictionary file"""
+    entries = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line and not line.startswith('#'):
+                word, _, english = line.partition('\t')
+                entries[unicodedata.normalize('NFKC', word.strip())] = english.strip()
+    return entries
+
+def compile_trie(entries):
+    """{prefix: is a whole word} for every prefix of every word (a flattened trie)"""
+    prefixes = {}
+    for word in list(entries) + list(FUNCTION_WORDS):
+        for end in range(1, len(word)):
+            prefixes.setdefault(word[:end], False)
+        prefixes[word] = True
+    return prefixes
+
+class JapaneseSegmenter:
+    """Longest-match segmenter over a flattened trie"""
+
+    def __init__(self, prefixes, glosses):
+        self.prefixes = prefixes
+        self.glosses = glosses
+
+    def match_end(self, run, i):
+        """End of the longest dictionary word starting at run[i], or 0 if none does"""
+        prefixes = self.prefixes
+        end = 0
+        k, n = i + 1, len(run)
+        while k <= n:
+            is_word = prefixes.get(run[i:k])
+            if is_word is None:
+                break
+            if is_word:
+                end = k
+            k += 1
+        return end
+
+    def segment_run(self, run):
+        """Words of one run of kana and kanji"""
+        prefixes = self.prefixes
+        words = []
+        i, n = 0, len(run)
+        while i < n:
+            end = self.match_end(run, i)
+            if not end and run[i] == '々' and words:
+                # The iteration mark repeats the previous kanji: 神々
+                words[-1] += '々'
+                i += 1
+                continue
+            if not end:
+                # Unknown word: the rest of a katakana or kanji run, up to where a
+                # whole known word starts
+                script = char_script(run[i])
+                end = i + 1
+                if script != 'hiragana':
+                    while (end < n and char_script(run[end]) == script
+                           and not (run[end] in prefixes and self.match_end(run, end))):
+                        end += 1
+            words.append(run[i:end])
+            i = end
+        return words
+
+    def segment(self, text):
+        """Every Japanese word of a text, in order (other scripts are skipped)"""
+        if text.isascii():
+            return []
+        words = []
+        for run in JAPANESE_RUN.findall(unicodedata.normalize('NFKC', text)):
+            words.extend(self.segment_run(run))
+        return words
+
+    def meaningful_words(self, text):
+        """Japanese words worth counting: no function words or lone hiragana"""
+        function_words = set(FUNCTION_WORDS)
+        return [word for word in self.segment(text)
+                if word not in function_words
+                and not (len(word) == 1 and char_script(word) == 'hiragana')]
+
+def load_segmenter(dictionary_file=DICTIONARY_FILE, trie_file=TRIE_FILE):
+    """Segmenter for the dictionary, from the compiled trie when it is up to date"""
+    global _segmenter
+    if _segmenter is not None:
+        return _segmenter
+
+    compiled = None
+    if (os.path.exists(trie_file) and
+            os.path.getmtime(trie_file) >= os.path.getmtime(dictionary_file)):
+        with open(trie_file, 'rb') as f:
+            version, function_words, prefixes, glosses = pickle.load(f)
+        if version == TRIE_VERSION and function_words == FUNCTION_WORDS:
+            compiled = prefixes, glosses
+
+    if compiled is None:
+        glosses = read_dictionary(dictionary_file)
+        compiled = compile_trie(glosses), glosses
+        try:
+            with open(trie_file, 'wb') as f:
+                pickle.dump((TRIE_VERSION, FUNCTION_WORDS) + compiled, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # A read-only checkout still works, it just recompiles next time
+            pass
+
+    _segmenter = JapaneseSegmenter(*compiled)
+    return _segmenter
+
+def japanese_tokenize(text):
+    """Meaningful Japanese words of a text, segmented with the default dictionary"""
+    return load_segmenter().meaningful_words(text)
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Segment and count the Japanese words in the lyrics')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--top', type=int, default=20, help='Words to list')
+    parser.add_argument('--text', help='Segment this text instead of a lyrics file')
+    parser.add_argument('--seed', action='store_true',
+                        help=f'Rewrite {DICTIONARY_FILE} from the teaching and flashcard vocabularies')
+    args = parser.parse_args()
+
+    if args.seed:
+        entries = seed_dictionary_entries()
+        if os.path.exists(DICTIONARY_FILE):
+            # Keep words added by hand
+            entries = {**read_dictionary(DICTIONARY_FILE), **entries}
+        write_dictionary(entries)
+        print(f"💾 {len(entries)} words saved to '{DICTIONARY_FILE}'")
+        return
+
+    segmenter = load_segmenter()
+    if args.text:
+        print(' / '.join(segmenter.segment(args.text)))
+        return
+
+    with open(args.lyrics, 'r', encoding='utf-8') as f:
+        word_freq = Counter(segmenter.meaningful_words(f.read()))
+    print(f"🎌 {sum(word_freq.values())} Japanese words ({len(word_freq)} unique)")
+    for i, (word, count) in enumerate(word_freq.most_common(args.top), 1):
+        english = segmenter.glosses.get(word, '')
+        print(f"{i:2d}. {word:<10} {english:<12} {count:>3} times")
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,37 @@ This script identifies the most important words from missionary songs
 that would be valuable for teaching Japanese children about faith.
 """
 
+import argparse
+import heapq
 import re
 from collections import Counter
-import json
 
+from flashcard_stream import write_flashcards
+from instrumentation import add_profiling_arguments, configure_profiling, instrumented, span
+from lemmatizer import entry_lemma_counts
+from vocabulary_store import (
+    TEACHING_DB, join_word_frequencies, open_vocabulary_store, vocabulary_words
+)
+
+@instrumented('read_lyrics_file', items=len)
 def read_lyrics_file(filename):
     """Read and clean the lyrics file"""
     with open(filename, 'r', encoding='utf-8') as file:
         content = file.read()
     return content
 
+SONG_HEADER = re.compile(r'^(\d+)\.[ \t]*', flags=re.MULTILINE)
+
+def split_songs(text):
+    """Split lyrics into {song number: song text} using the numbered headers"""
+    songs = {}
+    headers = list(SONG_HEADER.finditer(text))
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        songs[int(header.group(1))] = text[header.end():end]
+    return songs
+
+@instrumented('clean_and_tokenize', items=len)
 def clean_and_tokenize(text):
     """Clean text and extract meaningful words"""
     # Remove song numbers and extra whitespace
@@ -100,36 +121,129 @@ def get_teaching_vocabulary():
     
     return vocabulary
 
-def analyze_lyrics_for_teaching(lyrics_text):
-    """Analyze lyrics and identify key teaching words"""
+@instrumented('analyze_lyrics_for_teaching')
+def analyze_lyrics_for_teaching(lyrics_text, db_path=TEACHING_DB, lemmas=False, repeat_weight=None):
+    """Analyze lyrics and identify key teaching words
+    
+    With lemmas=True vocabulary entries are matched by lemma, so the 'trust'
+    entry also finds trusting and trusted; each occurrence still counts
+    toward one entry only (see lemmatizer.entry_lemma_counts).
+    With a repeat_weight, repeated choruses count at that weight (0 = once).
+    """
+    
+    with span('count_words') as stage:
+        if repeat_weight is None:
+            word_freq = Counter(clean_and_tokenize(lyrics_text))
+        else:
+            # repeated_sections imports this module, so it is imported on use
+            from repeated_sections import repeat_weighted_counts
+            word_freq = repeat_weighted_counts(lyrics_text, clean_and_tokenize, repeat_weight)
+        if lemmas:
+            conn = open_vocabulary_store(db_path, seed=get_teaching_vocabulary)
+            try:
+                entries = vocabulary_words(conn)
+            finally:
+                conn.close()
+            word_freq = Counter({**word_freq, **entry_lemma_counts(word_freq, entries)})
+        stage.count(len(word_freq))
     
-    words = clean_and_tokenize(lyrics_text)
-    word_freq = Counter(words)
+    return analyze_word_counts_for_teaching(word_freq, db_path), word_freq
+
+@instrumented('analyze_word_counts_for_teaching')
+def analyze_word_counts_for_teaching(word_freq, db_path=TEACHING_DB):
+    """Match precomputed word counts against the teaching vocabulary"""
     
-    vocabulary = get_teaching_vocabulary()
+    # The store is seeded from get_teaching_vocabulary() on first use
+    conn = open_vocabulary_store(db_path, seed=get_teaching_vocabulary)
+    try:
+        matches = join_word_frequencies(conn, word_freq)
+        categories = conn.execute('SELECT name, description FROM categories ORDER BY id').fetchall()
+    finally:
+        conn.close()
     
     # Find which teaching words appear in the lyrics
-    found_words = {}
+    found_words = {
+        category: {'description': description, 'words': {}}
+        for category, description in categories
+    }
     
-    for category, data in vocabulary.items():
-        found_words[category] = {
-            'description': data['description'],
-            'words': {}
+    for category, _, word, japanese, difficulty, importance, frequency in matches:
+        found_words[category]['words'][word] = {
+            'frequency': frequency,
+            'japanese': japanese,
+            'difficulty': difficulty,
+            'importance': importance,
+            'teaching_score': frequency * importance
         }
-        
+    
+    return found_words
+
+# Secondary ranking keys used when two words have the same teaching score
+TIE_BREAKERS = {
+    'order': lambda word_data: 0,
+    'frequency': lambda word_data: word_data['frequency'],
+    'importance': lambda word_data: word_data['importance'],
+    'easiest': lambda word_data: -word_data['difficulty']
+}
+
+LESSON_LEVELS = {
+    1: 'beginner_lesson',
+    2: 'intermediate_lesson'
+}
+
+@instrumented('rank_teaching_words', items=len)
+def rank_teaching_words(found_words):
+    """Flatten found words into one list of scored entries"""
+    
+    all_words = []
+    for category, data in found_words.items():
         for word, info in data['words'].items():
-            if word in word_freq:
-                found_words[category]['words'][word] = {
-                    'frequency': word_freq[word],
-                    'japanese': info['japanese'],
-                    'difficulty': info['difficulty'],
-                    'importance': info['importance'],
-                    'teaching_score': word_freq[word] * info['importance']
-                }
-    
-    return found_words, word_freq
+            all_words.append({
+                'word': word,
+                'category': category,
+                'frequency': info['frequency'],
+                'japanese': info['japanese'],
+                'difficulty': info['difficulty'],
+                'importance': info['importance'],
+                'teaching_score': info['teaching_score']
+            })
+    
+    return all_words
+
+def select_top_words(ranked_words, top_n=10, tie_breaker='order'):
+    """Select the top N words by teaching score with a bounded heap
+    
+    Words that tie on score and on the tie breaker keep their original order.
+    """
+    tie_key = TIE_BREAKERS[tie_breaker]
+    return heapq.nlargest(top_n, ranked_words,
+                          key=lambda word_data: (word_data['teaching_score'], tie_key(word_data)))
+
+def top_words_by_difficulty(ranked_words, top_n=10, tie_breaker='order'):
+    """Select the top N words for each lesson level in a single pass"""
+    
+    tie_key = TIE_BREAKERS[tie_breaker]
+    heaps = {'beginner_lesson': [], 'intermediate_lesson': [], 'advanced_lesson': []}
+    if top_n <= 0:
+        return heaps
+    
+    for position, word_data in enumerate(ranked_words):
+        level = LESSON_LEVELS.get(word_data['difficulty'], 'advanced_lesson')
+        # Negated position makes earlier words win ties, like a stable sort
+        entry = (word_data['teaching_score'], tie_key(word_data), -position, word_data)
+        heap = heaps[level]
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif entry[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, entry)
+    
+    return {
+        level: [entry[3] for entry in sorted(heap, key=lambda entry: entry[:3], reverse=True)]
+        for level, heap in heaps.items()
+    }
 
-def generate_lesson_plan(found_words):
+@instrumented('generate_lesson_plan')
+def generate_lesson_plan(found_words, top_n=10, tie_breaker='order', ranked_words=None):
     """Generate a structured lesson plan for teaching"""
     
     lesson_plan = {
@@ -153,41 +267,23 @@ def generate_lesson_plan(found_words):
         }
     }
     
-    # Collect all words with their scores
-    all_words = []
-    for category, data in found_words.items():
-        for word, info in data['words'].items():
-            all_words.append({
-                'word': word,
-                'category': category,
-                'frequency': info['frequency'],
-                'japanese': info['japanese'],
-                'difficulty': info['difficulty'],
-                'importance': info['importance'],
-                'teaching_score': info['teaching_score']
-            })
+    if ranked_words is None:
+        ranked_words = rank_teaching_words(found_words)
     
-    # Sort by teaching score (frequency * importance)
-    all_words.sort(key=lambda x: x['teaching_score'], reverse=True)
-    
-    # Distribute words by difficulty
-    for word_data in all_words:
-        if word_data['difficulty'] == 1:
-            lesson_plan['beginner_lesson']['words'].append(word_data)
-        elif word_data['difficulty'] == 2:
-            lesson_plan['intermediate_lesson']['words'].append(word_data)
-        else:
-            lesson_plan['advanced_lesson']['words'].append(word_data)
+    # Keep only the top N words per level, ranked by frequency * importance
+    for level, words in top_words_by_difficulty(ranked_words, top_n, tie_breaker).items():
+        lesson_plan[level]['words'] = words
     
     return lesson_plan
 
-def create_flashcard_data(lesson_plan):
+@instrumented('create_flashcard_data', items=len)
+def create_flashcard_data(lesson_plan, top_n=10):
     """Create flashcard data for teaching"""
     
     flashcards = []
     
     for lesson_type, lesson_data in lesson_plan.items():
-        for word_data in lesson_data['words'][:10]:  # Top 10 words per lesson
+        for word_data in lesson_data['words'][:top_n]:  # Top N words per lesson
             flashcards.append({
                 'english': word_data['word'],
                 'japanese': word_data['japanese'],
@@ -202,15 +298,35 @@ def create_flashcard_data(lesson_plan):
 
 def main():
     """Main analysis function"""
+    parser = argparse.ArgumentParser(description='Pick key Japanese teaching words from the lyrics')
+    parser.add_argument('--lemmas', action='store_true',
+                        help='Match vocabulary by lemma so trusting/trusted count toward trust')
+    repeats = parser.add_mutually_exclusive_group()
+    repeats.add_argument('--dedup', action='store_true',
+                         help='Count each repeated chorus once instead of every time it is sung')
+    repeats.add_argument('--repeat-weight', type=float, metavar='W',
+                         help='Count repeated sections at weight W (0 is the same as --dedup)')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    configure_profiling(args)
+    
     print("🎌 Japanese Kids Teaching Tool - Key Word Selector 🎌")
     print("=" * 60)
     
     # Read and analyze lyrics
     lyrics = read_lyrics_file('messy_lyrics.txt')
-    found_words, word_freq = analyze_lyrics_for_teaching(lyrics)
+    repeat_weight = None
+    if args.dedup or args.repeat_weight is not None:
+        repeat_weight = args.repeat_weight or 0.0
+        print(f"🔁 Repeated sections counted at weight {repeat_weight:g}")
+    found_words, word_freq = analyze_lyrics_for_teaching(lyrics, lemmas=args.lemmas,
+                                                         repeat_weight=repeat_weight)
+    
+    # Score every found word once and reuse it for all rankings
+    ranked_words = rank_teaching_words(found_words)
     
     # Generate lesson plan
-    lesson_plan = generate_lesson_plan(found_words)
+    lesson_plan = generate_lesson_plan(found_words, ranked_words=ranked_words)
     
     # Display results
     print("\n📚 LESSON PLAN RECOMMENDATIONS:")
@@ -230,29 +346,18 @@ def main():
     print("-" * 50)
     
     # Get top priority words across all categories
-    all_priority_words = []
-    for category, data in found_words.items():
-        for word, info in data['words'].items():
-            all_priority_words.append({
-                'word': word,
-                'japanese': info['japanese'],
-                'score': info['teaching_score'],
-                'frequency': info['frequency'],
-                'importance': info['importance']
-            })
-    
-    all_priority_words.sort(key=lambda x: x['score'], reverse=True)
+    all_priority_words = select_top_words(ranked_words, 15)
     
-    for i, word_data in enumerate(all_priority_words[:15], 1):
+    for i, word_data in enumerate(all_priority_words, 1):
         print(f"{i:2d}. {word_data['word'].upper():<12} → {word_data['japanese']:<20} "
-              f"(Score: {word_data['score']:2d} = {word_data['frequency']} × {word_data['importance']})")
+              f"(Score: {word_data['teaching_score']:2d} = {word_data['frequency']} × {word_data['importance']})")
     
     # Create flashcards
     flashcards = create_flashcard_data(lesson_plan)
     
     # Save flashcard data to JSON
-    with open('teaching_flashcards.json', 'w', encoding='utf-8') as f:
-        json.dump(flashcards, f, ensure_ascii=False, indent=2)
+    with span('write_flashcards') as stage:
+        stage.count(write_flashcards(flashcards, 'teaching_flashcards.json'))
     
     print(f"\n💾 Flashcard data saved to 'teaching_flashcards.json'")
     print(f"📝 Total flashcards created: {len(flashcards)}")
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Kana/Romaji Converter
+Converts kana to Hepburn romaji, romaji back to kana, and hiragana to
+katakana and back, so the romaji, hiragana and katakana fields of flashcards
+can be generated from the kana translators provide and checked in bulk.
+
+Hiragana and katakana differ by a fixed code-point offset, so switching
+scripts is one str.translate call. Kana and romaji are converted by
+longest match against tables built once at import and flattened into
+{prefix: value} tries, as in the Japanese segmenter. Digraphs (きゃ kya),
+the small っ (doubled consonant, or ' where nothing follows to double),
+ん (n, n' before a vowel) and the long vowel mark ー are handled.
+
+When checking readings, long vowels are compared in one folded form, so
+kōhī, koohii, kouhii and ko-hi- all match コーヒー. は, へ and を may also be
+read as the particles wa, e and o.
+
+Usage:
+    python kana_converter.py かみ イエス shinrai
+    python kana_converter.py --fill teaching_flashcards.json filled_flashcards.json
+"""
+
+import argparse
+import re
+import sys
+
+from flashcard_stream import iter_flashcards, write_flashcards
+
+# Hiragana ぁ-ゖ and katakana ァ-ヶ are 0x60 apart
+HIRAGANA_TO_KATAKANA = str.maketrans({code: code + 0x60 for code in range(0x3041, 0x3097)})
+KATAKANA_TO_HIRAGANA = str.maketrans({code + 0x60: code for code in range(0x3041, 0x3097)})
+
+BASE_KANA = {
+    'あ': 'a', 'い': 'i', 'う': 'u', 'え': 'e', 'お': 'o',
+    'か': 'ka', 'き': 'ki', 'く': 'ku', 'け': 'ke', 'こ': 'ko',
+    'が': 'ga', 'ぎ': 'gi', 'ぐ': 'gu', 'げ': 'ge', 'ご': 'go',
+    'さ': 'sa', 'し': 'shi', 'す': 'su', 'せ': 'se', 'そ': 'so',
+    'ざ': 'za', 'じ': 'ji', 'ず': 'zu', 'ぜ': 'ze', 'ぞ': 'zo',
+    'た': 'ta', 'ち': 'chi', 'つ': 'tsu', 'て': 'te', 'と': 'to',
+    'だ': 'da', 'ぢ': 'ji', 'づ': 'zu', 'で': 'de', 'ど': 'do',
+    'な': 'na', 'に': 'ni', 'ぬ': 'nu', 'ね': 'ne', 'の': 'no',
+    'は': 'ha', 'ひ': 'hi', 'ふ': 'fu', 'へ': 'he', 'ほ': 'ho',
+    'ば': 'ba', 'び': 'bi', 'ぶ': 'bu', 'べ': 'be', 'ぼ': 'bo',
+    'ぱ': 'pa', 'ぴ': 'pi', 'ぷ': 'pu', 'ぺ': 'pe', 'ぽ': 'po',
+    'ま': 'ma', 'み': 'mi', 'む': 'mu', 'め': 'me', 'も': 'mo',
+    'や': 'ya', 'ゆ': 'yu', 'よ': 'yo',
+    'ら': 'ra', 'り': 'ri', 'る': 'ru', 'れ': 're', 'ろ': 'ro',
+    'わ': 'wa', 'ゐ': 'i', 'ゑ': 'e', 'を': 'wo', 'ん': 'n', 'ゔ': 'vu',
+    'ぁ': 'a', 'ぃ': 'i', 'ぅ': 'u', 'ぇ': 'e', 'ぉ': 'o',
+    'ゃ': 'ya', 'ゅ': 'yu', 'ょ': 'yo', 'ゎ': 'wa',
+}
+
+# Sounds written with a small vowel, mostly in loanwords (ティ, ファ, ヴァ)
+EXTENDED_KANA = {
+    'しぇ': 'she', 'じぇ': 'je', 'ちぇ': 'che', 'てぃ': 'ti', 'でぃ': 'di', 'とぅ': 'tu',
+    'どぅ': 'du', 'つぁ': 'tsa', 'ふぁ': 'fa', 'ふぃ': 'fi', 'ふぇ': 'fe', 'ふぉ': 'fo',
+    'うぃ': 'wi', 'うぇ': 'we', 'ゔぁ': 'va', 'ゔぃ': 'vi', 'ゔぇ': 've', 'ゔぉ': 'vo',
+}
+
+# Other spellings accepted when reading romaji (ti/tu stay Hepburn ティ/トゥ)
+ROMAJI_VARIANTS = {
+    'si': 'し', 'hu': 'ふ', 'zi': 'じ',
+    'sya': 'しゃ', 'syu': 'しゅ', 'syo': 'しょ', 'tya': 'ちゃ', 'tyu': 'ちゅ', 'tyo': 'ちょ',
+    'zya': 'じゃ', 'zyu': 'じゅ', 'zyo': 'じょ', 'jya': 'じゃ', 'jyu': 'じゅ', 'jyo': 'じょ',
+    "n'": 'ん', '-': 'ー',
+}
+
+MACRONS = str.maketrans({'ā': 'aa', 'ī': 'ii', 'ū': 'uu', 'ē': 'ee', 'ō': 'ou',
+                         'â': 'aa', 'î': 'ii', 'û': 'uu', 'ê': 'ee', 'ô': 'ou'})
+
+# Long vowels written out: aa, ii, uu, ee, oo and ou
+DOUBLED_VOWEL = re.compile(r'([aiueo])\1|(o)u')
+
+# Kana read differently as particles (konnichiwa is こんにちは); a particle never starts a reading
+PARTICLES = {'は': 'わ', 'へ': 'え', 'を': 'お'}
+PARTICLE = re.compile('(?<=.)[はへを]')
+
+VOWELS = 'aiueo'
+SMALL_TSU = 'っ'
+LONG_VOWEL = 'ー'
+
+def digraphs():
+    """きゃ kya, しゃ sha, ちょ cho... for every i-row kana"""
+    table = {}
+    for kana in 'きぎしじちぢにひびぴみり':
+        stem = BASE_KANA[kana][:-1]
+        for small, vowel in zip('ゃゅょ', 'auo'):
+            table[kana + small] = stem + vowel if stem in ('sh', 'ch', 'j') else stem + 'y' + vowel
+    return table
+
+def romaji_table(kana_table):
+    """Romaji → hiragana; the first kana listed wins a shared spelling (ji → じ, not ぢ)"""
+    table = {}
+    for kana, romaji in kana_table.items():
+        table.setdefault(romaji, kana)
+    return {**table, **ROMAJI_VARIANTS}
+
+def compile_trie(table):
+    """Flattened trie: {prefix: value, or None for a prefix that is not a key}"""
+    trie = {}
+    for key, value in table.items():
+        for end in range(1, len(key)):
+            trie.setdefault(key[:end], None)
+        trie[key] = value
+    return trie
+
+def match_at(text, i, trie):
+    """(end, value) of the longest table key starting at i; (i + 1, None) if none does"""
+    end, value = i + 1, None
+    k = i + 1
+    while k <= len(text):
+        prefix = text[i:k]
+        if prefix not in trie:
+            break
+        if trie[prefix] is not None:
+            end, value = k, trie[prefix]
+        k += 1
+    return end, value
+
+def longest_match(text, trie):
+    """Yield (key, value) for each longest table key in text; value is None for unknown characters"""
+    i = 0
+    while i < len(text):
+        end, value = match_at(text, i, trie)
+        yield text[i:end], value
+        i = end
+
+KANA_TABLE = {**BASE_KANA, **digraphs(), **EXTENDED_KANA}
+KANA_TRIE = compile_trie(KANA_TABLE)
+
+ROMAJI_TABLE = romaji_table(KANA_TABLE)
+ROMAJI_TRIE = compile_trie(ROMAJI_TABLE)
+
+# Text in parentheses after the kana: "かみ (kami)"
+READING_NOTE = re.compile(r'\s*\(([^)]*)\)\s*$')
+
+def hiragana_to_katakana(text):
+    return text.translate(HIRAGANA_TO_KATAKANA)
+
+def katakana_to_hiragana(text):
+    return text.translate(KATAKANA_TO_HIRAGANA)
+
+def kana_to_romaji(text):
+    """Hepburn romaji of hiragana or katakana text; other characters pass through
+
+    A small っ with no consonant after it (アッ) is written as an apostrophe.
+    """
+    romaji = []
+    double_next = False
+    for key, value in longest_match(katakana_to_hiragana(text), KANA_TRIE):
+        if key == SMALL_TSU:
+            if double_next:
+                romaji.append("'")
+            double_next = True
+            continue
+        if value is None:
+            if key == LONG_VOWEL and romaji and romaji[-1][-1:] in VOWELS:
+                value = romaji[-1][-1]
+            else:
+                value = key
+        elif romaji and romaji[-1] == 'n' and value[0] in VOWELS + 'y':
+            romaji[-1] = "n'"
+        if double_next:
+            if value[:1].isalpha() and value[0] not in VOWELS:
+                value = ('t' if value.startswith('ch') else value[0]) + value
+            else:
+                romaji.append("'")
+        double_next = False
+        romaji.append(value)
+    if double_next:
+        romaji.append("'")
+    return ''.join(romaji)
+
+def romaji_to_hiragana(text):
+    """Hiragana of romaji text; characters that are not romaji pass through"""
+    text = text.lower().translate(MACRONS)
+    kana = []
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        # Doubled consonant (kk, tt, tch) → small っ
+        if (char.isascii() and char.isalpha() and char not in VOWELS and char != 'n' and i + 1 < n
+                and (text[i + 1] == char or text[i:i + 3] == 'tch')):
+            kana.append(SMALL_TSU)
+            i += 1
+            continue
+        # An apostrophe after a vowel is a small っ with nothing to double (a' → あっ)
+        if char == "'" and i and text[i - 1] in VOWELS:
+            kana.append(SMALL_TSU)
+            i += 1
+            continue
+        # n before a consonant (konnichiwa is ko-n-ni-chi-wa) or at the end → ん
+        if char == 'n' and (i + 1 == n or text[i + 1] not in VOWELS + "y'"):
+            kana.append('ん')
+            i += 1
+            continue
+        end, value = match_at(text, i, ROMAJI_TRIE)
+        kana.append(value if value is not None else text[i:end])
+        i = end
+    return ''.join(kana)
+
+def romaji_to_katakana(text):
+    return hiragana_to_katakana(romaji_to_hiragana(text))
+
+def is_kana_letter(char):
+    """Whether a character is a hiragana or katakana syllable (not ー, ・ or a voicing mark)"""
+    return 'ぁ' <= char <= 'ゖ' or 'ァ' <= char <= 'ヺ'
+
+def is_kana(text):
+    """Whether text is made only of kana (and spaces or marks like ー), with at least one syllable"""
+    stripped = text.replace(' ', '')
+    return (all('ぁ' <= char <= 'ヿ' for char in stripped)
+            and any(is_kana_letter(char) for char in stripped))
+
+def is_katakana(text):
+    return any('ァ' <= char <= 'ヺ' for char in text)
+
+def split_reading(japanese):
+    """(kana, romaji note) of a field like "かみ (kami)"; kana is '' when the text is not kana"""
+    note = READING_NOTE.search(japanese)
+    kana = japanese[:note.start()] if note else japanese
+    kana = kana.strip()
+    return (kana if is_kana(kana) else ''), (note.group(1).strip() if note else '')
+
+def fold_long_vowels(romaji):
+    """Romaji with every long vowel (ō, oo, ou, o-) written as the vowel plus ':'"""
+    return DOUBLED_VOWEL.sub(lambda match: (match.group(1) or match.group(2)) + ':', romaji)
+
+def reading_key(kana):
+    """Folded romaji of kana, for comparing readings"""
+    return fold_long_vowels(kana_to_romaji(kana.replace(' ', '')).replace("n'", 'n'))
+
+def same_reading(romaji, kana):
+    """Whether a romaji spelling reads the same as kana
+
+    Spelling variants (si/shi, n'), long vowel spellings (ō, oo, ou, ー) and
+    particle readings (konnichiwa for こんにちは) are allowed.
+    """
+    spelled = reading_key(romaji_to_hiragana(romaji.replace(' ', '')))
+    particles = PARTICLE.sub(lambda match: PARTICLES[match.group()], kana)
+    return spelled in (reading_key(kana), reading_key(particles))
+
+def reading_fields(kana):
+    """{romaji, hiragana, katakana} generated from kana, following the vocabulary's
+    convention of filling only the field of the script the word is written in"""
+    if is_katakana(kana):
+        return {'romaji': kana_to_romaji(kana), 'hiragana': '', 'katakana': kana}
+    return {'romaji': kana_to_romaji(kana), 'hiragana': kana, 'katakana': ''}
+
+def is_placeholder(value):
+    return not value or value.startswith('[')
+
+def fill_card(card):
+    """Card with empty or placeholder reading fields generated from its kana"""
+    kana, _ = split_reading(card.get('japanese', ''))
+    if not kana:
+        return card
+    filled = dict(card)
+    for field, value in reading_fields(kana).items():
+        if is_placeholder(filled.get(field, '')):
+            filled[field] = value
+    return filled
+
+def check_card(card):
+    """Problems with a card's reading fields, as readable strings"""
+    japanese = card.get('japanese', '')
+    kana, note = split_reading(japanese)
+    if not kana:
+        return [f"no kana reading in '{japanese}'"] if japanese else []
+
+    problems = []
+    if note and not same_reading(note, kana):
+        problems.append(f"'{japanese}': romaji note should read '{kana_to_romaji(kana)}'")
+    romaji = card.get('romaji', '')
+    if romaji and not is_placeholder(romaji) and not same_reading(romaji, kana):
+        problems.append(f"romaji '{romaji}' does not match '{kana}' ({kana_to_romaji(kana)})")
+    for field, convert in (('hiragana', katakana_to_hiragana), ('katakana', hiragana_to_katakana)):
+        value = card.get(field, '')
+        if value and not is_placeholder(value) and convert(value) != convert(kana):
+            problems.append(f"{field} '{value}' does not match '{kana}'")
+    return problems
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Convert between kana and romaji, or fill flashcard readings')
+    parser.add_argument('words', nargs='*', help='Kana or romaji to convert')
+    parser.add_argument('--fill', nargs=2, metavar=('DECK', 'OUTPUT'),
+                        help='Fill romaji/hiragana/katakana of every card in a deck')
+    parser.add_argument('--check', metavar='DECK', help='Report cards whose readings disagree with their kana')
+    args = parser.parse_args()
+
+    if args.fill:
+        source, target = args.fill
+        count = write_flashcards(map(fill_card, iter_flashcards(source)), target)
+        print(f"✅ {count} flashcards filled from '{source}' into '{target}'")
+    if args.check:
+        problems = 0
+        for number, card in enumerate(iter_flashcards(args.check), 1):
+            for problem in check_card(card):
+                print(f"⚠️  Card {number} ({card.get('english', '?')}): {problem}")
+                problems += 1
+        print(f"{'✅' if not problems else '❌'} {problems} reading problems in '{args.check}'")
+    for word in args.words:
+        if is_kana(word):
+            print(f"{word} → {kana_to_romaji(word)} / {katakana_to_hiragana(word)} / {hiragana_to_katakana(word)}")
+        else:
+            print(f"{word} → {romaji_to_hiragana(word)} / {romaji_to_katakana(word)}")
+    if not (args.fill or args.check or args.words):
+        parser.print_help()
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Per-Line Language Router
+Bilingual song sheets mix English, romaji and kana/kanji lines. Each line
+is classified by the scripts it uses (latin, kana, kanji or mixed) and
+routed to the English tokenizer or the Japanese segmenter, giving separate
+word frequency tables per language in one pass over the lyrics.
+
+Scripts are defined as code-point range tables, compiled once into regex
+character classes. Only lines with non-ASCII text are classified one by
+one. They are found by a C-level regex scan over the whole text, and the
+plain English between them is routed as a single slice. Each language's
+text is then tokenized in a single call, so routing adds little on top of
+the usual tokenization.
+
+With romaji=True, ASCII lines get a third table when every word is made of
+Japanese syllables and the line has a particle or copula (wa, ga, desu...).
+This costs one more scan of the text.
+
+Usage:
+    python language_router.py [messy_lyrics.txt] [--top 10] [--romaji]
+"""
+
+import argparse
+import re
+from collections import Counter
+
+from html_word_cloud import clean_and_tokenize, read_lyrics_file
+
+LATIN = 'latin'
+ROMAJI = 'romaji'
+KANA = 'kana'
+KANJI = 'kanji'
+MIXED = 'mixed'
+
+# Code-point ranges of each script
+SCRIPT_RANGES = {
+    LATIN: ((0x0041, 0x005a), (0x0061, 0x007a), (0x00c0, 0x024f), (0xff21, 0xff3a), (0xff41, 0xff5a)),
+    KANA: ((0x3040, 0x30ff), (0x31f0, 0x31ff), (0xff66, 0xff9f)),
+    KANJI: ((0x3005, 0x3007), (0x3400, 0x4dbf), (0x4e00, 0x9fff), (0xf900, 0xfaff)),
+}
+
+# Frequency tables each line class feeds
+LINE_LANGUAGES = {
+    LATIN: ('english',),
+    ROMAJI: ('romaji',),
+    KANA: ('japanese',),
+    KANJI: ('japanese',),
+    MIXED: ('english', 'japanese'),
+}
+
+LANGUAGES = ('english', 'romaji', 'japanese')
+
+def character_class(ranges):
+    """Compiled regex matching any character in the code-point ranges"""
+    return re.compile('[' + ''.join(f'{chr(low)}-{chr(high)}' for low, high in ranges) + ']')
+
+SCRIPT_PATTERNS = {script: character_class(ranges) for script, ranges in SCRIPT_RANGES.items()}
+
+# One Hepburn/Kunrei syllable: ka, kya, shi, chi, tsu, fu, n, or the first half of kk/tt/ss/pp/tch
+ROMAJI_SYLLABLE = (r'(?:[kgsztdnhbpmr]y?[aiueo]|sh[aiueo]|ch[aiueo]|tsu|j[aiueo]|fu|w[aoe]|y[auoe]'
+                   r'|[aiueo]|n(?![aiueoy])|k(?=k)|s(?=s)|t(?=t|ch)|p(?=p))')
+# A line of romaji-shaped words; matched line by line over the whole text
+ROMAJI_LINE = re.compile(rf'^(?=[^a-z\n]*[a-z])[^a-z\n]*(?:(?:{ROMAJI_SYLLABLE})+(?:[^a-z\n]+|$))+$',
+                         re.IGNORECASE | re.MULTILINE)
+ROMAJI_MARKERS = re.compile(r'\b(?:wa|ga|wo|desu|deshita|masu|mashita|masen|kudasai|yo|ne|ka|sama)\b',
+                            re.IGNORECASE)
+
+# The first non-ASCII character of a line, through the end of the line
+NON_ASCII = re.compile(r'[^\x00-\x7f].*')
+# The first letter of a line, through the end of the line
+LETTER_LINE = re.compile(r'[A-Za-z].*')
+
+ROMAJI_WORD = re.compile(r'[a-z]+')
+ROMAJI_STOP_WORDS = frozenset({
+    'wa', 'ga', 'wo', 'o', 'ni', 'e', 'no', 'de', 'to', 'mo', 'ya', 'ka', 'yo', 'ne', 'na',
+    'desu', 'deshita', 'masu', 'mashita', 'masen', 'kudasai', 'kara', 'made', 'sama', 'san',
+})
+
+def is_romaji(line):
+    """Whether an ASCII line reads as romaji rather than English"""
+    return ROMAJI_LINE.fullmatch(line) is not None and ROMAJI_MARKERS.search(line) is not None
+
+def classify_line(line, romaji=False):
+    """Script class of a line, or None when it has no letters"""
+    latin = SCRIPT_PATTERNS[LATIN].search(line) is not None
+    if line.isascii():
+        if not latin:
+            return None
+        return ROMAJI if romaji and is_romaji(line) else LATIN
+
+    kana = SCRIPT_PATTERNS[KANA].search(line) is not None
+    kanji = SCRIPT_PATTERNS[KANJI].search(line) is not None
+    if latin and (kana or kanji):
+        return MIXED
+    if kana:
+        return KANA
+    if kanji:
+        return KANJI
+    return LATIN if latin else None
+
+def special_line_starts(text, romaji=False):
+    """Sorted start offsets of the lines that are not plain ASCII English"""
+    starts = set()
+    if not text.isascii():
+        starts.update(text.rfind('\n', 0, match.start()) + 1 for match in NON_ASCII.finditer(text))
+    if romaji:
+        starts.update(match.start() for match in ROMAJI_LINE.finditer(text)
+                      if ROMAJI_MARKERS.search(match.group()))
+    return sorted(starts)
+
+def route_text(text, romaji=False):
+    """({language: [text pieces]}, Counter of line classes) in one pass over the text"""
+    routed = {language: [] for language in LANGUAGES}
+    classes = Counter()
+    position = 0
+    for start in special_line_starts(text, romaji) + [None]:
+        # Everything between special lines is English
+        plain = text[position:start]
+        if plain.strip():
+            routed['english'].append(plain)
+            classes[LATIN] += len(LETTER_LINE.findall(plain))
+        if start is None:
+            break
+
+        end = text.find('\n', start)
+        end = len(text) if end < 0 else end
+        line = text[start:end]
+        position = end + 1
+        line_class = classify_line(line, romaji)
+        if line_class is None:
+            continue
+        classes[line_class] += 1
+        for language in LINE_LANGUAGES[line_class]:
+            routed[language].append(line)
+    return routed, classes
+
+def romaji_tokenize(text):
+    """Meaningful romaji words: no particles, copulas or single letters"""
+    return [word for word in ROMAJI_WORD.findall(text.lower())
+            if word not in ROMAJI_STOP_WORDS and len(word) > 1]
+
+def default_tokenizers():
+    """{language: tokenizer} used when none are given"""
+    from japanese_segmenter import japanese_tokenize
+    return {'english': clean_and_tokenize, 'romaji': romaji_tokenize, 'japanese': japanese_tokenize}
+
+def language_frequencies(text, tokenizers=None, romaji=False):
+    """({language: word counts}, Counter of line classes) of a bilingual text"""
+    tokenizers = tokenizers or default_tokenizers()
+    routed, classes = route_text(text, romaji)
+    frequencies = {language: Counter(tokenizers[language]('\n'.join(pieces)) if pieces else ())
+                   for language, pieces in routed.items()}
+    return frequencies, classes
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Count words per language in bilingual lyrics')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--top', type=int, default=10, help='Words to list per language')
+    parser.add_argument('--romaji', action='store_true', help='Count romaji lines separately from English')
+    args = parser.parse_args()
+
+    frequencies, classes = language_frequencies(read_lyrics_file(args.lyrics), romaji=args.romaji)
+    print("🌐 Lines by script: " + ', '.join(f"{name} {count}" for name, count in classes.most_common()))
+    for language, word_freq in frequencies.items():
+        if not word_freq:
+            continue
+        print(f"\n📊 {language.title()}: {sum(word_freq.values())} words ({len(word_freq)} unique)")
+        for i, (word, count) in enumerate(word_freq.most_common(args.top), 1):
+            print(f"  {i:2d}. {word:<14} {count:>3} times")
+
+if __name__ == "__main__":
+    main()
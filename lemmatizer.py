@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Rule-Based English Lemmatizer
+Reduces lyric words to a shared base form so trusting/trusted/trust and
+powerful/power are counted together. Uses a small irregular-form table,
+a list of words left alone, and suffix rules (-ies, -ied, -ing, -ed, -es,
+-s, -ful, -ness) with consonant undoubling and silent-e restoration. No
+network and no models.
+
+Every distinct word is lemmatized once and cached. A lyric corpus has far
+fewer distinct words than tokens, so after warm-up each token costs one
+dictionary lookup.
+
+Usage:
+    python lemmatizer.py trusting powerful loving cried
+"""
+
+import re
+import sys
+from collections import Counter
+
+# Irregular forms (and a few regular-looking ones the rules would get wrong)
+IRREGULAR = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be', 'being': 'be',
+    'has': 'have', 'had': 'have', 'having': 'have',
+    'does': 'do', 'did': 'do', 'done': 'do', 'doing': 'do',
+    'went': 'go', 'gone': 'go', 'goes': 'go', 'came': 'come', 'gave': 'give', 'given': 'give',
+    'took': 'take', 'taken': 'take', 'made': 'make', 'saw': 'see', 'seen': 'see',
+    'knew': 'know', 'known': 'know', 'led': 'lead', 'fell': 'fall', 'fallen': 'fall',
+    'held': 'hold', 'found': 'find', 'brought': 'bring', 'thought': 'think', 'told': 'tell',
+    'said': 'say', 'ran': 'run', 'sang': 'sing', 'sung': 'sing', 'felt': 'feel', 'kept': 'keep',
+    'left': 'leave', 'stood': 'stand', 'won': 'win', 'wrote': 'write', 'written': 'write',
+    'rose': 'rise', 'risen': 'rise', 'bore': 'bear', 'born': 'bear', 'forgave': 'forgive',
+    'forgiven': 'forgive', 'died': 'die', 'dying': 'die', 'lying': 'lie', 'lied': 'lie',
+    'used': 'use', 'using': 'use',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'feet': 'foot', 'lives': 'life',
+    'higher': 'high', 'lower': 'low',
+}
+
+# Words that look inflected but are already base forms
+INVARIANT = frozenset({
+    'always', 'jesus', 'his', 'this', 'us', 'yes', 'its', 'thus', 'was', 'has', 'does',
+    'cross', 'bless', 'less', 'unless', 'news', 'christ', 'grateful', 'awful',
+    'nothing', 'something', 'everything', 'anything', 'morning', 'evening', 'during',
+    'king', 'ring', 'thing', 'wing', 'spring', 'bring', 'sing', 'sting', 'swing', 'string',
+    'need', 'seed', 'feed', 'speed', 'indeed', 'greed', 'bleed', 'hundred', 'sacred',
+    'kindred', 'naked', 'wicked', 'beloved', 'gracious', 'glorious', 'famous', 'various',
+    'witness', 'business', 'wilderness', 'better', 'best',
+})
+
+VOWELS = frozenset('aeiou')
+UNDOUBLED = frozenset('lsz')
+
+_cache = {}
+
+def vowel_groups(stem):
+    """Number of separate vowel runs (a rough syllable count)"""
+    return len(re.findall(r'[aeiouy]+', stem))
+
+def has_vowel(stem):
+    """Whether a stem still has a vowel (y counts after the first letter)"""
+    return any(letter in VOWELS for letter in stem) or 'y' in stem[1:]
+
+def restore_stem(stem):
+    """Undo consonant doubling or restore a silent e after -ing/-ed was removed"""
+    if len(stem) > 2 and stem[-1] == stem[-2] and stem[-1] not in VOWELS and stem[-1] not in UNDOUBLED:
+        return stem[:-1]
+    if stem.endswith(('v', 'z', 'dg', 'ais')) or (stem.endswith('c') and not stem.endswith('ck')):
+        return stem + 'e'
+    if len(stem) >= 3 and stem[-1] == 'r' and stem[-2] in 'iu' and stem[-3] not in VOWELS:
+        return stem + 'e'
+    # Single-syllable consonant-vowel-consonant stems: mak(ing), smil(ing), hop(ed)
+    if (len(stem) >= 3 and stem[-1] not in VOWELS and stem[-1] not in 'wxy'
+            and stem[-2] in VOWELS and stem[-3] not in VOWELS and vowel_groups(stem) == 1):
+        return stem + 'e'
+    return stem
+
+def _lemmatize(word):
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if len(word) <= 3 or word in INVARIANT:
+        return word
+
+    if word.endswith('ful') and len(word) >= 6:
+        stem = word[:-3]
+        return stem[:-1] + 'y' if stem.endswith('i') else stem
+    if word.endswith('ness') and len(word) >= 7:
+        stem = word[:-4]
+        return stem[:-1] + 'y' if stem.endswith('i') else stem
+    if word.endswith(('ies', 'ied')) and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('ing'):
+        stem = word[:-3]
+        if len(stem) >= 2 and has_vowel(stem):
+            return restore_stem(stem)
+        return word
+    if word.endswith('ed') and not word.endswith('eed'):
+        stem = word[:-2]
+        if len(stem) >= 3 and has_vowel(stem):
+            return restore_stem(stem)
+        return word
+    if word.endswith(('ches', 'shes', 'sses', 'xes', 'zes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is', 'ous')):
+        return word[:-1]
+    return word
+
+def lemmatize(word):
+    """Base form of a lower-case word, cached per distinct word"""
+    try:
+        return _cache[word]
+    except KeyError:
+        lemma = _cache[word] = _lemmatize(word)
+        return lemma
+
+def lemmatize_words(words):
+    """Lemmas of a word list, in order"""
+    cache = _cache
+    return [cache[word] if word in cache else lemmatize(word) for word in words]
+
+def lemma_counts(word_freq):
+    """Merge word counts by lemma"""
+    counts = Counter()
+    for word, count in word_freq.items():
+        counts[lemmatize(word)] += count
+    return counts
+
+def lemmatize_keywords(themes):
+    """{theme: keywords} with the keywords reduced to distinct lemmas, for matching lemma counts"""
+    return {theme: list(dict.fromkeys(lemmatize_words(keywords)))
+            for theme, keywords in themes.items()}
+
+def entry_lemma_counts(word_freq, entries):
+    """Counts for vocabulary entries with every word occurrence credited to one entry
+
+    An entry collects its whole lemma family (trust also gets trusting and
+    trusted), except the forms that are entries of their own: with both
+    power and powerful listed, powerful keeps its own count and power gets
+    the rest of the family. A family with no entry equal to its lemma is
+    collected by its first entry.
+    """
+    lemma_freq = lemma_counts(word_freq)
+    heads = {}
+    for entry in entries:
+        lemma = lemmatize(entry)
+        if lemma not in heads or entry == lemma:
+            heads[lemma] = entry
+
+    counts = Counter()
+    for entry in dict.fromkeys(entries):
+        lemma = lemmatize(entry)
+        if heads[lemma] != entry:
+            counts[entry] = word_freq.get(entry, 0)
+            lemma_freq[lemma] -= counts[entry]
+    for lemma, head in heads.items():
+        counts[head] = lemma_freq[lemma]
+    return +counts
+
+def main():
+    """Command line entry point"""
+    for word in sys.argv[1:] or ['trusting', 'trusted', 'powerful', 'loving', 'cried', 'running']:
+        print(f"{word} → {lemmatize(word.lower())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+N-gram Phrase Counter
+Counts the bigrams and trigrams that lyrics keep repeating ("trusting in
+you", "god will always") so they can be shown as a phrase cloud.
+
+Phrases never cross a line break. Stop words may appear inside a phrase but
+not at its edges. The lyrics file is streamed line by line, with rolling
+tuples as keys. When the table outgrows max_phrases, the rarest phrases are
+pruned, so multi-GB corpora run in bounded memory.
+
+Usage:
+    python phrase_counts.py [messy_lyrics.txt] [--sizes 2 3] [--top 25]
+"""
+
+import argparse
+import re
+from collections import Counter
+from itertools import compress
+from operator import and_
+
+from html_word_cloud import STOP_WORDS
+
+WORD_PATTERN = re.compile(r'\b[a-zA-Z]+\b')
+SONG_NUMBER = re.compile(r'^\d+\.\s*')
+
+PHRASE_SIZES = (2, 3)
+
+# Default bound on distinct phrases kept in memory
+MAX_PHRASES = 500_000
+
+def iter_lyric_lines(filename):
+    """Stream a lyrics file one line at a time"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        yield from f
+
+def line_words(line):
+    """Lower-cased words of one line, song number removed"""
+    return WORD_PATTERN.findall(SONG_NUMBER.sub('', line).lower())
+
+def is_edge_word(word):
+    """Whether a phrase may start or end with this word"""
+    return word not in STOP_WORDS and len(word) > 2
+
+def line_phrases(words, sizes=PHRASE_SIZES, edges=None):
+    """Yield the n-gram tuples of one line that start and end with meaningful words"""
+    if edges is None:
+        edges = [is_edge_word(word) for word in words]
+    for n in sizes:
+        grams = zip(*(words[k:] for k in range(n)))
+        yield from compress(grams, map(and_, edges, edges[n - 1:]))
+
+def prune_rare(counts, max_size):
+    """Drop the rarest entries until at most three quarters of max_size remain; returns the floor"""
+    remaining = len(counts)
+    floor = 0
+    for count, entries in sorted(Counter(counts.values()).items()):
+        if remaining <= max_size * 3 // 4:
+            break
+        floor = count
+        remaining -= entries
+    for key in [key for key, count in counts.items() if count <= floor]:
+        del counts[key]
+    return floor
+
+def count_phrases(lines, sizes=PHRASE_SIZES, max_phrases=MAX_PHRASES):
+    """Count phrases and meaningful words over streamed lines
+
+    Returns (phrase counts keyed by tuples, word counts, prune floor); a
+    non-zero floor means phrases seen that often or less may be undercounted.
+    """
+    phrases = Counter()
+    words = Counter()
+    floor = 0
+    for line in lines:
+        tokens = line_words(line)
+        if not tokens:
+            continue
+        edges = [is_edge_word(word) for word in tokens]
+        words.update(compress(tokens, edges))
+        phrases.update(line_phrases(tokens, sizes, edges))
+        if len(phrases) > max_phrases:
+            floor = max(floor, prune_rare(phrases, max_phrases))
+    return phrases, words, floor
+
+def phrase_text(gram):
+    """Display form of an n-gram tuple"""
+    return ' '.join(gram)
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Count repeated phrases in the lyrics')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(PHRASE_SIZES), help='Phrase lengths')
+    parser.add_argument('--top', type=int, default=25, help='Phrases to list')
+    parser.add_argument('--max-phrases', type=int, default=MAX_PHRASES, help='Distinct phrases kept in memory')
+    args = parser.parse_args()
+
+    phrases, words, floor = count_phrases(iter_lyric_lines(args.lyrics), args.sizes, args.max_phrases)
+    print(f"📝 {sum(words.values())} words, {len(phrases)} distinct phrases")
+    if floor:
+        print(f"✂️  Phrases seen up to {floor} times were pruned; rarer counts are lower bounds")
+    for i, (gram, count) in enumerate(phrases.most_common(args.top), 1):
+        print(f"{i:2d}. {phrase_text(gram):<30} {count:>3} times")
+
+if __name__ == "__main__":
+    main()
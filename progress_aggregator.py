@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Classroom Progress Aggregator
+Ingests the progress files exported by the flashcard web app, validates them
+and aggregates per-card known/review rates per class, then reports the
+hardest words for each class.
+
+Usage:
+    python progress_aggregator.py progress_exports/ [--db classroom_progress.db] [--top 10]
+
+Exports are grouped into classes by sub-directory (progress_exports/<class>/*.json)
+or by a "class" field in the export. Only new or changed files are re-read
+on each run, and students whose export file was deleted or moved are dropped.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from spaced_repetition import parse_export_date, validate_progress
+
+PROGRESS_DB = 'classroom_progress.db'
+DEFAULT_CLASS = 'default'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    error TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS students (
+    class TEXT NOT NULL,
+    student TEXT NOT NULL,
+    export_date REAL NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (class, student)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS student_cards (
+    class TEXT NOT NULL,
+    student TEXT NOT NULL,
+    card TEXT NOT NULL,
+    known INTEGER NOT NULL,
+    review INTEGER NOT NULL,
+    PRIMARY KEY (class, card, student)
+) WITHOUT ROWID;
+"""
+
+def read_export(path, class_name):
+    """Read and validate one export file (runs in a worker process)
+
+    Returns (path, error, class, student, export_date, card_rows).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            progress = json.load(f)
+    except (OSError, ValueError) as e:
+        return path, str(e), None, None, None, []
+
+    error = validate_progress(progress)
+    if error:
+        return path, error, None, None, None, []
+
+    class_name = progress.get('class') or class_name
+    student = progress.get('student') or os.path.splitext(os.path.basename(path))[0]
+    mastered = set(progress.get('masteredCards', []))
+    review = set(progress.get('reviewCards', []))
+    cards = set(progress.get('studiedCards', [])) | mastered | review
+
+    card_rows = [(card, int(card in mastered), int(card in review)) for card in cards]
+    return path, None, class_name, student, parse_export_date(progress['date']), card_rows
+
+def scan_export_files(directory):
+    """List (path, class, mtime, size) for every export file under the directory"""
+    exports = []
+    for root, _, filenames in os.walk(directory):
+        relative = os.path.relpath(root, directory)
+        class_name = DEFAULT_CLASS if relative == os.curdir else relative.replace(os.sep, '/')
+        for filename in filenames:
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(root, filename)
+            stat = os.stat(path)
+            exports.append((path, class_name, stat.st_mtime, stat.st_size))
+    return exports
+
+def find_changed_exports(conn, exports):
+    """The scanned (path, class, mtime, size) entries that are new or changed since the last run"""
+    known = {path: (mtime, size) for path, mtime, size in
+             conn.execute('SELECT path, mtime, size FROM export_files')}
+    return [export for export in exports if known.get(export[0]) != (export[2], export[3])]
+
+def prune_missing_exports(conn, paths):
+    """Forget export files no longer on disk and the students they counted
+
+    Returns the number of students removed. A removed student's older
+    exports were skipped as superseded, so every file is re-read once.
+    """
+    missing = [(path,) for (path,) in conn.execute('SELECT path FROM export_files')
+               if path not in paths]
+    if not missing:
+        return 0
+
+    students = [row for (path,) in missing for row in
+                conn.execute('SELECT class, student FROM students WHERE path = ?', (path,))]
+    with conn:
+        conn.executemany('DELETE FROM student_cards WHERE class = ? AND student = ?', students)
+        conn.executemany('DELETE FROM students WHERE class = ? AND student = ?', students)
+        conn.executemany('DELETE FROM export_files WHERE path = ?', missing)
+        if students:
+            conn.execute('DELETE FROM export_files')
+    return len(students)
+
+def ingest_exports(directory, db_path=PROGRESS_DB, workers=None):
+    """Read new/changed exports in parallel and fold them into the store
+
+    A student's newest export replaces their earlier card states.
+    Returns (files read, errors, students removed with their files).
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    errors = []
+
+    try:
+        exports = scan_export_files(directory)
+        removed = prune_missing_exports(conn, {path for path, *_ in exports})
+        changed = find_changed_exports(conn, exports)
+        if not changed:
+            return 0, errors, removed
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_export,
+                                        [path for path, *_ in changed],
+                                        [class_name for _, class_name, *_ in changed],
+                                        chunksize=32))
+
+        file_stats = {path: (mtime, size) for path, _, mtime, size in changed}
+        latest = dict(((class_name, student), export_date) for class_name, student, export_date in
+                      conn.execute('SELECT class, student, export_date FROM students'))
+
+        with conn:
+            for path, error, class_name, student, export_date, card_rows in results:
+                mtime, size = file_stats[path]
+                conn.execute('INSERT OR REPLACE INTO export_files VALUES (?, ?, ?, ?)',
+                             (path, mtime, size, error))
+                if error:
+                    errors.append((path, error))
+                    continue
+
+                key = (class_name, student)
+                if export_date < latest.get(key, float('-inf')):
+                    continue  # an older export than the one already counted
+                latest[key] = export_date
+
+                conn.execute('INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?)',
+                             (class_name, student, export_date, path))
+                conn.execute('DELETE FROM student_cards WHERE class = ? AND student = ?',
+                             (class_name, student))
+                conn.executemany('INSERT INTO student_cards VALUES (?, ?, ?, ?, ?)',
+                                 ((class_name, student, card, known, review)
+                                  for card, known, review in card_rows))
+    finally:
+        conn.close()
+
+    return len(changed), errors, removed
+
+def card_rates(db_path=PROGRESS_DB):
+    """Per class, per card: (students, known rate, review rate) from one grouped query"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    try:
+        rows = conn.execute(
+            """SELECT c.class, c.card, s.total, SUM(c.known), SUM(c.review)
+               FROM student_cards c
+               JOIN (SELECT class, COUNT(*) AS total FROM students GROUP BY class) s
+                 ON s.class = c.class
+               GROUP BY c.class, c.card"""
+        ).fetchall()
+    finally:
+        conn.close()
+
+    rates = {}
+    for class_name, card, total, known, review in rows:
+        rates.setdefault(class_name, {})[card] = {
+            'students': total,
+            'known_rate': known / total,
+            'review_rate': review / total
+        }
+    return rates
+
+def hardest_words(rates, top_n=10):
+    """Rank each class's cards by review rate minus known rate"""
+    return {
+        class_name: sorted(cards.items(),
+                           key=lambda item: (item[1]['review_rate'] - item[1]['known_rate'], item[0]),
+                           reverse=True)[:top_n]
+        for class_name, cards in sorted(rates.items())
+    }
+
+def main():
+    """Main aggregation function"""
+    parser = argparse.ArgumentParser(description='Aggregate exported flashcard progress per class')
+    parser.add_argument('exports', help='Directory of exported flashcard_progress JSON files')
+    parser.add_argument('--db', default=PROGRESS_DB, help='Aggregate store')
+    parser.add_argument('--top', type=int, default=10, help='Hardest words to show per class')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--json', dest='json_file', help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    print("📊 Classroom Progress Aggregator 📊")
+    print("=" * 50)
+
+    read_count, errors, removed = ingest_exports(args.exports, args.db, args.workers)
+    print(f"📥 Read {read_count} new or changed export files")
+    if removed:
+        print(f"🧹 Removed {removed} students whose export files are gone")
+    for path, error in errors:
+        print(f"❌ {path}: {error}")
+
+    report = hardest_words(card_rates(args.db), args.top)
+    for class_name, cards in report.items():
+        print(f"\n🏫 {class_name} - hardest words:")
+        for i, (card, rate) in enumerate(cards, 1):
+            print(f"  {i:2d}. {card.upper():<12} review {rate['review_rate']:.0%} | "
+                  f"known {rate['known_rate']:.0%} ({rate['students']} students)")
+
+    if args.json_file:
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump({class_name: [dict(rate, card=card) for card, rate in cards]
+                       for class_name, cards in report.items()}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved to '{args.json_file}'")
+
+if __name__ == "__main__":
+    main()
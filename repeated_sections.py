@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Repeated Section (Chorus) Detection
+Finds the text each song repeats (choruses, refrains) so word counts are
+not inflated by one line sung many times. Songs in messy_lyrics.txt often
+re-wrap a repeated chorus onto different lines, so matching is done on
+words, not lines. Every window of min_words consecutive words is hashed,
+and any window already seen earlier in the song marks its words as a
+repeat. That is one dictionary lookup per word, linear in the song's length.
+
+Words are matched in any script, with contractions kept whole and each
+kana or kanji as its own word, and the text handed back is sliced from the
+original lines, so any tokenizer (--unicode, --japanese, --fix-spelling)
+sees the lyrics as written. Text before the first "N." header, or a file
+with no headers at all, is treated as one more song.
+
+Usage:
+    python repeated_sections.py [messy_lyrics.txt] [--min-words 6] [--sheet deduplicated_lyrics.txt]
+"""
+
+import argparse
+import re
+from collections import Counter
+
+from japanese_teaching_tool import SONG_HEADER, read_lyrics_file
+
+# Kana and kanji are written without spaces, so each character counts as a word
+JAPANESE_CHARS = '\u3005\u3006\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+WORD_PATTERN = re.compile(rf"[{JAPANESE_CHARS}]|[^\W\d_{JAPANESE_CHARS}]+"
+                          rf"(?:['\u2019][^\W\d_{JAPANESE_CHARS}]+)*")
+
+# Shortest run of words treated as a repeat of earlier text
+MIN_REPEAT_WORDS = 6
+
+SHEET_FILE = 'deduplicated_lyrics.txt'
+
+def mark_repeats(words, min_words=MIN_REPEAT_WORDS):
+    """Flag (1) every word inside a min_words window seen earlier in the sequence"""
+    flags = bytearray(len(words))
+    ones = b'\x01' * min_words
+    seen = set()
+    for i, window in enumerate(zip(*(words[k:] for k in range(min_words)))):
+        if window in seen:
+            flags[i:i + min_words] = ones
+        else:
+            seen.add(window)
+    return flags
+
+def lyrics_songs(lyrics_text):
+    """[(song number, song text)] of the lyrics; text outside any numbered song gets None"""
+    headers = list(SONG_HEADER.finditer(lyrics_text))
+    preamble = lyrics_text[:headers[0].start()] if headers else lyrics_text
+    songs = [(None, preamble)] if preamble.strip() else []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(lyrics_text)
+        songs.append((int(header.group(1)), lyrics_text[header.end():end]))
+    return songs
+
+def analyze_song(song_text, min_words=MIN_REPEAT_WORDS):
+    """[(line, word matches, flags)] for every line of a song"""
+    lines = song_text.split('\n')
+    matches_by_line = [list(WORD_PATTERN.finditer(line)) for line in lines]
+    flags = mark_repeats([match.group().lower() for matches in matches_by_line
+                          for match in matches], min_words)
+
+    analyzed = []
+    position = 0
+    for line, matches in zip(lines, matches_by_line):
+        analyzed.append((line, matches, flags[position:position + len(matches)]))
+        position += len(matches)
+    return analyzed
+
+def split_line(line, matches, flags):
+    """(first-occurrence parts, repeated parts) of a line, sliced from the original text"""
+    parts = ([], [])
+    start = 0
+    for i in range(1, len(matches) + 1):
+        if i == len(matches) or flags[i] != flags[start]:
+            parts[flags[start]].append(line[matches[start].start():matches[i - 1].end()])
+            start = i
+    return parts
+
+def repeated_sections(song_text, min_words=MIN_REPEAT_WORDS):
+    """[(repeated text, times repeated)] of one song, longest first"""
+    sections = Counter()
+    run = []
+    for line, matches, flags in analyze_song(song_text, min_words):
+        for match, flag in zip(matches, flags):
+            if flag:
+                run.append(match.group().lower())
+            elif run:
+                sections[' '.join(run)] += 1
+                run = []
+    if run:
+        sections[' '.join(run)] += 1
+    return sorted(sections.items(), key=lambda item: len(item[0]), reverse=True)
+
+def split_repeated_text(lyrics_text, min_words=MIN_REPEAT_WORDS):
+    """(first-occurrence text, repeated text) of the whole lyrics, song by song"""
+    first, repeated = [], []
+    for number, song_text in lyrics_songs(lyrics_text):
+        if number is not None:
+            first.append(f'{number}.')
+        for line, matches, flags in analyze_song(song_text, min_words):
+            first_parts, repeated_parts = split_line(line, matches, flags)
+            first.append(' '.join(first_parts))
+            repeated.append(' '.join(repeated_parts))
+    return '\n'.join(first), '\n'.join(repeated)
+
+def repeat_weighted_counts(lyrics_text, tokenizer, repeat_weight=0.0, min_words=MIN_REPEAT_WORDS):
+    """Word counts with repeated sections counted at repeat_weight (0 = count each chorus once)
+
+    Weighted counts are rounded to whole times, so fractional weights still
+    give counts that read as "N times"; a word is never rounded away.
+    """
+    first, repeated = split_repeated_text(lyrics_text, min_words)
+    counts = Counter(tokenizer(first))
+    if repeat_weight:
+        for word, count in Counter(tokenizer(repeated)).items():
+            counts[word] = max(round(counts[word] + repeat_weight * count), 1)
+    return counts
+
+def deduplicated_sheet(lyrics_text, min_words=MIN_REPEAT_WORDS):
+    """Lyrics with fully repeated lines folded into one [Repeat: ...] marker"""
+    sheet = []
+    for number, song_text in lyrics_songs(lyrics_text):
+        if sheet:
+            sheet.append('')
+        if number is None:
+            # Text before the first header (or a file without headers) has no header line
+            analyzed = analyze_song(song_text.strip(), min_words)
+        else:
+            analyzed = analyze_song(song_text.rstrip(), min_words)
+            # The first line is the rest of the "N." header line and is never a repeat
+            sheet.append(f'{number}. {analyzed[0][0]}'.rstrip())
+            analyzed = analyzed[1:]
+        folded = []
+        for line, matches, flags in analyzed:
+            if matches and all(flags):
+                folded.append([match.group().lower() for match in matches])
+                continue
+            if folded:
+                sheet.append(repeat_marker(folded))
+                folded = []
+            sheet.append(line)
+        if folded:
+            sheet.append(repeat_marker(folded))
+    return '\n'.join(sheet)
+
+def repeat_marker(folded_lines):
+    """Marker line standing in for folded repeated lines"""
+    opening = ' '.join(folded_lines[0][:6])
+    lines = len(folded_lines)
+    return f'[Repeat: {opening}... ({lines} line{"s" if lines != 1 else ""})]'
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Find repeated sections (choruses) in each song')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--min-words', type=int, default=MIN_REPEAT_WORDS,
+                        help='Shortest run of words treated as a repeat')
+    parser.add_argument('--sheet', nargs='?', const=SHEET_FILE,
+                        help=f'Write a deduplicated lyrics sheet (default {SHEET_FILE})')
+    args = parser.parse_args()
+
+    print("🔁 Repeated Sections in Missionary Songs 🔁")
+    print("=" * 50)
+
+    lyrics = read_lyrics_file(args.lyrics)
+    first, repeated = split_repeated_text(lyrics, args.min_words)
+    first_words, repeated_words = len(WORD_PATTERN.findall(first)), len(WORD_PATTERN.findall(repeated))
+    total = first_words + repeated_words
+    print(f"📝 {total} words, {repeated_words} of them repeats "
+          f"({100 * repeated_words / max(total, 1):.0f}%)")
+
+    for number, song_text in lyrics_songs(lyrics):
+        sections = repeated_sections(song_text, args.min_words)
+        if not sections:
+            continue
+        print(f"\n🎵 Song {number}:" if number is not None else "\n🎵 Before the first song:")
+        for text, times in sections[:5]:
+            preview = text if len(text) <= 60 else text[:57] + '...'
+            print(f"  • sung {times + 1}x: {preview}")
+
+    if args.sheet:
+        with open(args.sheet, 'w', encoding='utf-8') as f:
+            f.write(deduplicated_sheet(lyrics, args.min_words) + '\n')
+        print(f"\n💾 Deduplicated lyrics sheet saved to '{args.sheet}'")
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,22 @@ Simple Word Frequency Analysis for Missionary Song Lyrics
 This script analyzes song lyrics without requiring matplotlib/numpy
 """
 
+import argparse
 import re
 from collections import Counter
 
+from instrumentation import add_profiling_arguments, configure_profiling, instrumented, span
+from lemmatizer import lemmatize_keywords, lemmatize_words
+from repeated_sections import repeat_weighted_counts
+
+@instrumented('read_lyrics_file', items=len)
 def read_lyrics_file(filename):
     """Read and clean the lyrics file"""
     with open(filename, 'r', encoding='utf-8') as file:
         content = file.read()
     return content
 
+@instrumented('clean_and_tokenize', items=len)
 def clean_and_tokenize(text):
     """Clean text and extract meaningful words"""
     # Remove song numbers and extra whitespace
@@ -46,19 +53,27 @@ def clean_and_tokenize(text):
     
     return meaningful_words
 
-def analyze_spiritual_themes(words):
-    """Analyze spiritual and religious themes in the lyrics"""
-    
-    # Define theme categories
-    themes = {
-        'Faith & Trust': ['trust', 'faith', 'believe', 'hope', 'confident'],
-        'Jesus & God': ['jesus', 'god', 'lord', 'father', 'christ', 'savior'],
-        'Power & Strength': ['power', 'powerful', 'strength', 'strong', 'overcome', 'invincible'],
-        'Love & Care': ['love', 'loving', 'care', 'heart', 'mercy', 'grace'],
-        'Praise & Worship': ['praise', 'worship', 'thank', 'grateful', 'honor', 'glory'],
-        'Life & Journey': ['life', 'journey', 'way', 'path', 'guide', 'lead'],
-        'Emotions & Actions': ['smile', 'joy', 'happy', 'shout', 'sing', 'dance']
-    }
+# Define theme categories
+SPIRITUAL_THEMES = {
+    'Faith & Trust': ['trust', 'faith', 'believe', 'hope', 'confident'],
+    'Jesus & God': ['jesus', 'god', 'lord', 'father', 'christ', 'savior'],
+    'Power & Strength': ['power', 'powerful', 'strength', 'strong', 'overcome', 'invincible'],
+    'Love & Care': ['love', 'loving', 'care', 'heart', 'mercy', 'grace'],
+    'Praise & Worship': ['praise', 'worship', 'thank', 'grateful', 'honor', 'glory'],
+    'Life & Journey': ['life', 'journey', 'way', 'path', 'guide', 'lead'],
+    'Emotions & Actions': ['smile', 'joy', 'happy', 'shout', 'sing', 'dance']
+}
+
+@instrumented('analyze_spiritual_themes', items=len)
+def analyze_spiritual_themes(words, lemmas=False):
+    """Analyze spiritual and religious themes in the lyrics
+    
+    Pass lemmas=True when words are lemmas, to match them by lemma too.
+    """
+    
+    themes = SPIRITUAL_THEMES
+    if lemmas:
+        themes = lemmatize_keywords(themes)
     
     word_freq = Counter(words)
     theme_analysis = {}
@@ -73,6 +88,7 @@ def analyze_spiritual_themes(words):
     
     return theme_analysis
 
+@instrumented('create_simple_word_cloud_text', items=len)
 def create_simple_word_cloud_text(words, width=60):
     """Create a simple text-based word cloud representation"""
     word_freq = Counter(words)
@@ -107,12 +123,33 @@ def create_simple_word_cloud_text(words, width=60):
 
 def main():
     """Main analysis function"""
+    parser = argparse.ArgumentParser(description='Analyze word frequencies and themes in the lyrics')
+    repeats = parser.add_mutually_exclusive_group()
+    repeats.add_argument('--dedup', action='store_true',
+                         help='Count each repeated chorus once instead of every time it is sung')
+    repeats.add_argument('--repeat-weight', type=float, metavar='W',
+                         help='Count repeated sections at weight W (0 is the same as --dedup)')
+    parser.add_argument('--lemmas', action='store_true',
+                        help='Count by lemma so trusting/trusted/trust are one word')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    configure_profiling(args)
+    
     print("🎵 Missionary Song Lyrics Analysis 🎵")
     print("=" * 50)
     
     # Read and process lyrics
     lyrics = read_lyrics_file('messy_lyrics.txt')
-    words = clean_and_tokenize(lyrics)
+    tokenizer = clean_and_tokenize
+    if args.lemmas:
+        tokenizer = lambda text: lemmatize_words(clean_and_tokenize(text))
+    if args.dedup or args.repeat_weight is not None:
+        # Everything below counts the word list, so the weighted counts are expanded back
+        repeat_weight = args.repeat_weight or 0.0
+        words = list(repeat_weighted_counts(lyrics, tokenizer, repeat_weight).elements())
+        print(f"🔁 Repeated sections counted at weight {repeat_weight:g}")
+    else:
+        words = tokenizer(lyrics)
     
     print(f"Total words processed: {len(words)}")
     print(f"Unique words: {len(set(words))}")
@@ -121,7 +158,9 @@ def main():
     # Word frequency analysis
     print("📊 Top 25 Most Frequent Words:")
     print("-" * 30)
-    word_freq = Counter(words)
+    with span('count_words') as stage:
+        word_freq = Counter(words)
+        stage.count(len(word_freq))
     for i, (word, count) in enumerate(word_freq.most_common(25), 1):
         print(f"{i:2d}. {word:<15} {count:>3} times")
     print()
@@ -129,7 +168,7 @@ def main():
     # Spiritual theme analysis
     print("🙏 Spiritual Theme Analysis:")
     print("-" * 30)
-    theme_analysis = analyze_spiritual_themes(words)
+    theme_analysis = analyze_spiritual_themes(words, lemmas=args.lemmas)
     for theme, data in theme_analysis.items():
         if data['total_count'] > 0:
             print(f"{theme}: {data['total_count']} total occurrences")
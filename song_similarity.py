@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Song Similarity Index
+Finds "songs like this one" (or songs that use a given word list) by cosine
+similarity over L2-normalized TF-IDF song vectors. Queries are scored
+through an inverted term index, so only the songs sharing a query term are
+touched; with NumPy a whole batch of queries is summed in one bincount.
+
+The index is saved to song_similarity.pickle together with the name of the
+tokenizer that built it. On the next run with the same tokenizer only songs
+whose text changed are re-tokenized; TF-IDF weights are recomputed for all
+songs because one changed song shifts every document frequency.
+
+Usage:
+    python song_similarity.py --song 3 [--top 5]
+    python song_similarity.py --words trust power fear
+    python song_similarity.py --all [--lyrics messy_lyrics.txt]
+"""
+
+import argparse
+import hashlib
+import heapq
+import math
+import os
+import pickle
+from array import array
+from collections import Counter, defaultdict
+
+from html_word_cloud import clean_and_tokenize, read_lyrics_file
+from japanese_teaching_tool import split_songs
+from term_matrix import SongTermMatrix, inverse_document_frequencies, tfidf_weights
+from token_index import COUNT_TYPECODE, HAS_NUMPY, TOKEN_TYPECODE, TokenVocabulary
+
+if HAS_NUMPY:
+    import numpy as np
+
+SIMILARITY_INDEX = 'song_similarity.pickle'
+INDEX_VERSION = 2
+
+# Query batches scored per matrix product
+BATCH_SIZE = 256
+
+def tokenizer_name(tokenizer):
+    """Name a saved index records, so a different tokenizer rebuilds it"""
+    module = getattr(tokenizer, '__module__', None) or ''
+    return f"{module}.{getattr(tokenizer, '__qualname__', repr(tokenizer))}"
+
+def song_digest(text):
+    """Fingerprint of a song's text, used to skip unchanged songs"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+class SongSimilarityIndex:
+    """Unit-length TF-IDF vectors of every song, kept in CSR layout"""
+
+    def __init__(self, vocabulary=None, songs=None, tokenizer=None):
+        self.vocabulary = vocabulary if vocabulary is not None else TokenVocabulary()
+        # {song number: (digest, term IDs, counts)}
+        self.songs = songs if songs is not None else {}
+        # tokenizer_name() of the tokenizer the songs were split with
+        self.tokenizer = tokenizer
+        self._reweigh()
+
+    def update(self, lyrics_text, tokenizer=clean_and_tokenize):
+        """Bring the index up to date with the lyrics; returns (added, changed, removed)"""
+        name = tokenizer_name(tokenizer)
+        if name != self.tokenizer:
+            # Saved term IDs came from another tokenizer, so every song is re-read
+            self.vocabulary = TokenVocabulary()
+            self.songs = {}
+            self.tokenizer = name
+
+        added = changed = 0
+        songs = {}
+        for number, text in split_songs(lyrics_text).items():
+            digest = song_digest(text)
+            previous = self.songs.get(number)
+            if previous is not None and previous[0] == digest:
+                songs[number] = previous
+                continue
+
+            counts = Counter(self.vocabulary.encode(tokenizer(text)))
+            terms = sorted(counts)
+            songs[number] = (digest, array(TOKEN_TYPECODE, terms),
+                             array(COUNT_TYPECODE, map(counts.__getitem__, terms)))
+            if previous is None:
+                added += 1
+            else:
+                changed += 1
+
+        removed = len(self.songs.keys() - songs.keys())
+        self.songs = songs
+        if added or changed or removed:
+            self._reweigh()
+        return added, changed, removed
+
+    def _reweigh(self):
+        """Recompute the normalized TF-IDF weights of every song"""
+        indptr = array(COUNT_TYPECODE, [0])
+        indices = array(TOKEN_TYPECODE)
+        counts = array(COUNT_TYPECODE)
+        for digest, terms, term_counts in self.songs.values():
+            indices.extend(terms)
+            counts.extend(term_counts)
+            indptr.append(len(indices))
+
+        self.matrix = SongTermMatrix(self.vocabulary, list(self.songs), indptr, indices, counts)
+        self.rows = {number: row for row, number in enumerate(self.songs)}
+        self.idf = inverse_document_frequencies(self.matrix)
+        weights = tfidf_weights(self.matrix, self.idf)
+
+        if HAS_NUMPY:
+            weights = np.frombuffer(weights, dtype=np.float64)
+            rows = self._entry_rows()
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights,
+                                        minlength=len(self.songs)))
+            self.weights = np.where(norms[rows] > 0, weights / np.maximum(norms[rows], 1e-300), 0.0)
+        else:
+            for i in range(len(self.songs)):
+                start, end = indptr[i], indptr[i + 1]
+                norm = math.sqrt(sum(w * w for w in weights[start:end]))
+                for k in range(start, end):
+                    weights[k] = weights[k] / norm if norm else 0.0
+            self.weights = weights
+        self._postings = None
+
+    def _entry_rows(self):
+        """Song row of every non-zero entry"""
+        indptr = np.frombuffer(self.matrix.indptr, dtype=np.uint64).astype(np.int64)
+        return np.repeat(np.arange(len(self.songs)), np.diff(indptr))
+
+    def song_vector(self, number):
+        """{term ID: weight} of one indexed song"""
+        row = self.rows[number]
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        return {self.matrix.indices[k]: float(self.weights[k]) for k in range(start, end)}
+
+    def words_vector(self, words):
+        """{term ID: weight} of a word list, weighted like a song; unknown words are ignored"""
+        counts = Counter(term for term in map(self.vocabulary.id, words)
+                         if term is not None and term < len(self.idf))
+        total = sum(counts.values())
+        vector = {term: count / total * self.idf[term] for term, count in counts.items()} if total else {}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    def similarities(self, queries):
+        """Cosine similarity of each query vector with every song (one list per query)"""
+        if not queries or not self.songs:
+            return [[0.0] * len(self.songs) for _ in queries]
+
+        if HAS_NUMPY:
+            return self._numpy_similarities(queries)
+
+        if self._postings is None:
+            self._postings = defaultdict(list)
+            for row in range(len(self.songs)):
+                for k in range(self.matrix.indptr[row], self.matrix.indptr[row + 1]):
+                    self._postings[self.matrix.indices[k]].append((row, self.weights[k]))
+
+        results = []
+        for query in queries:
+            scores = [0.0] * len(self.songs)
+            for term, weight in query.items():
+                for row, song_weight in self._postings.get(term, ()):
+                    scores[row] += weight * song_weight
+            results.append(scores)
+        return results
+
+    def _numpy_similarities(self, queries):
+        """similarities() as one bincount over the postings of every query term"""
+        if self._postings is None:
+            # Entries regrouped by term (CSC layout): term t owns order[starts[t]:starts[t + 1]]
+            indices = np.frombuffer(self.matrix.indices, dtype=np.uint32)
+            order = np.argsort(indices, kind='stable')
+            starts = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(indices, minlength=len(self.vocabulary)), out=starts[1:])
+            self._postings = (starts, self._entry_rows()[order], self.weights[order])
+        starts, rows, weights = self._postings
+
+        slots = np.fromiter((q for q, query in enumerate(queries) for _ in query), dtype=np.int64)
+        terms = np.fromiter((term for query in queries for term in query), dtype=np.int64)
+        query_weights = np.fromiter((w for query in queries for w in query.values()),
+                                    dtype=np.float64)
+
+        # Gather the posting range of every (query, term) pair without a Python loop
+        lengths = starts[terms + 1] - starts[terms]
+        offsets = np.repeat(starts[terms] - (np.cumsum(lengths) - lengths), lengths)
+        entries = np.arange(lengths.sum()) + offsets
+
+        songs = len(self.songs)
+        scores = np.bincount(np.repeat(slots, lengths) * songs + rows[entries],
+                             weights=np.repeat(query_weights, lengths) * weights[entries],
+                             minlength=len(queries) * songs)
+        return scores.reshape(len(queries), songs).tolist()
+
+    def nearest(self, query, k=5, exclude=None):
+        """[(song number, similarity)] of the k most similar songs"""
+        return self._top_k(self.similarities([query])[0], k, exclude)
+
+    def nearest_songs(self, number, k=5):
+        """Songs most like the given song (the song itself excluded)"""
+        if number not in self.songs:
+            raise ValueError(f"Song {number} is not in the index")
+        return self.nearest(self.song_vector(number), k, exclude=number)
+
+    def nearest_to_words(self, words, k=5):
+        """Songs that best match a word list"""
+        return self.nearest(self.words_vector(words), k)
+
+    def all_nearest(self, k=5, batch_size=BATCH_SIZE):
+        """{song number: nearest songs} for every song, scored in query batches"""
+        numbers = self.matrix.song_numbers
+        result = {}
+        for start in range(0, len(numbers), batch_size):
+            batch = numbers[start:start + batch_size]
+            scores = self.similarities([self.song_vector(number) for number in batch])
+            for number, row in zip(batch, scores):
+                result[number] = self._top_k(row, k, exclude=number)
+        return result
+
+    def _top_k(self, scores, k, exclude=None):
+        numbers = self.matrix.song_numbers
+        top = heapq.nlargest(k, (row for row in range(len(scores))
+                                 if numbers[row] != exclude and scores[row] > 0),
+                             key=scores.__getitem__)
+        return [(numbers[row], round(scores[row], 4)) for row in top]
+
+    def save(self, filename=SIMILARITY_INDEX):
+        """Persist the tokenized songs; weights are cheap to recompute"""
+        with open(filename, 'wb') as f:
+            pickle.dump((INDEX_VERSION, self.tokenizer, self.vocabulary, self.songs), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename=SIMILARITY_INDEX):
+        """Load a saved index, or start an empty one if missing or outdated"""
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                saved = pickle.load(f)
+            if saved[0] == INDEX_VERSION:
+                version, tokenizer, vocabulary, songs = saved
+                return cls(vocabulary, songs, tokenizer)
+        return cls()
+
+def open_similarity_index(lyrics_file='messy_lyrics.txt', index_file=SIMILARITY_INDEX,
+                          tokenizer=clean_and_tokenize):
+    """Load the saved index, refresh it from the lyrics and save it if anything changed"""
+    index = SongSimilarityIndex.load(index_file)
+    added, changed, removed = index.update(read_lyrics_file(lyrics_file), tokenizer)
+    if added or changed or removed or not os.path.exists(index_file):
+        index.save(index_file)
+    return index, (added, changed, removed)
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Find songs with similar vocabulary')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--song', type=int, help='Song number to find neighbours for')
+    query.add_argument('--words', nargs='+', help='Words to match songs against')
+    query.add_argument('--all', action='store_true', help='Nearest songs for every song')
+    parser.add_argument('--top', type=int, default=5, help='Songs to list')
+    parser.add_argument('--lyrics', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--index', default=SIMILARITY_INDEX, help='Saved index file')
+    args = parser.parse_args()
+
+    index, (added, changed, removed) = open_similarity_index(args.lyrics, args.index)
+    print(f"🗂️  {len(index.songs)} songs indexed "
+          f"({added} added, {changed} changed, {removed} removed)")
+
+    if args.all:
+        for number, neighbours in index.all_nearest(args.top).items():
+            listed = ', '.join(f"{other} ({score:.2f})" for other, score in neighbours)
+            print(f"  🎵 Song {number}: {listed or 'no overlap'}")
+        return
+
+    if args.song is not None:
+        if args.song not in index.songs:
+            print(f"❌ Song {args.song} is not in '{args.lyrics}'")
+            return
+        print(f"\n🎵 Songs like song {args.song}:")
+        neighbours = index.nearest_songs(args.song, args.top)
+    else:
+        print(f"\n🔎 Songs using {', '.join(args.words)}:")
+        neighbours = index.nearest_to_words([word.lower() for word in args.words], args.top)
+
+    for number, score in neighbours:
+        print(f"  • Song {number}: {score:.4f}")
+    if not neighbours:
+        print("  No songs share this vocabulary")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Spaced-Repetition Scheduler for the Flashcard Web App
+Reads the progress files exported by the flashcard app, updates SM-2
+intervals for every student and card, and writes each student's due set
+so the page can show "Due Today" cards first.
+
+Usage:
+    python spaced_repetition.py progress_exports/ [--db srs_state.db] [--output review_schedule.json]
+
+A student's id is the "student" field of the export, or the file name
+when the export predates that field.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+SRS_DB = 'srs_state.db'
+SCHEDULE_FILE = 'review_schedule.json'
+
+# SM-2 answer quality for each progress state
+QUALITY_MASTERED = 5
+QUALITY_STUDIED = 3
+QUALITY_REVIEW = 2
+
+MIN_EASE = 1.3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS card_state (
+    student TEXT NOT NULL,
+    card TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    interval REAL NOT NULL,
+    ease REAL NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (student, card)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS student_exports (
+    student TEXT PRIMARY KEY,
+    last_export REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+class CardState:
+    """SM-2 scheduling state for one student and card"""
+
+    __slots__ = ('repetitions', 'interval', 'ease', 'due')
+
+    def __init__(self, repetitions=0, interval=0.0, ease=2.5, due=0.0):
+        self.repetitions = repetitions
+        self.interval = interval
+        self.ease = ease
+        self.due = due
+
+def sm2_update(state, quality, reviewed_at):
+    """Apply one SM-2 review (quality 0-5) at a POSIX timestamp"""
+
+    if quality < 3:
+        state.repetitions = 0
+        state.interval = 1.0
+    else:
+        if state.repetitions == 0:
+            state.interval = 1.0
+        elif state.repetitions == 1:
+            state.interval = 6.0
+        else:
+            state.interval = round(state.interval * state.ease, 2)
+        state.repetitions += 1
+
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    state.due = reviewed_at + state.interval * 86400
+    return state
+
+def progress_grades(progress):
+    """Turn an exported progress record into (card, quality) pairs"""
+
+    review = set(progress.get('reviewCards', []))
+    mastered = set(progress.get('masteredCards', []))
+
+    for card in review:
+        yield card, QUALITY_REVIEW
+    for card in mastered - review:
+        yield card, QUALITY_MASTERED
+    for card in set(progress.get('studiedCards', [])) - review - mastered:
+        yield card, QUALITY_STUDIED
+
+def parse_export_date(value):
+    """Parse the ISO date written by exportProgress into a POSIX timestamp"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def validate_progress(progress):
+    """Return an error message for a malformed export, or None"""
+    if not isinstance(progress, dict):
+        return 'export is not a JSON object'
+    if not isinstance(progress.get('date'), str):
+        return 'missing "date"'
+    try:
+        parse_export_date(progress['date'])
+    except ValueError:
+        return f'invalid date {progress["date"]!r}'
+    for key in ('studiedCards', 'masteredCards', 'reviewCards'):
+        cards = progress.get(key, [])
+        if not isinstance(cards, list) or not all(isinstance(card, str) for card in cards):
+            return f'"{key}" must be a list of card names'
+    return None
+
+class ReviewScheduler:
+    """Per-student, per-card SM-2 state with a due-time priority queue
+
+    The queue holds (due, student, card) entries. Rescheduling a card pushes
+    a new entry and leaves the old one to be skipped when it surfaces.
+    """
+
+    def __init__(self):
+        self.states = {}
+        self.last_export = {}
+        self._queue = []
+
+    def review(self, student, card, quality, reviewed_at):
+        """Record a review and requeue the card at its new due time"""
+        key = (student, card)
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = CardState()
+        elif state.due > reviewed_at:
+            # Still marked from an earlier export but not due yet
+            return False
+        sm2_update(state, quality, reviewed_at)
+        heapq.heappush(self._queue, (state.due, student, card))
+        return True
+
+    def apply_progress(self, student, progress):
+        """Apply one exported progress file, skipping exports already seen"""
+        reviewed_at = parse_export_date(progress['date'])
+        if reviewed_at <= self.last_export.get(student, float('-inf')):
+            return 0
+        self.last_export[student] = reviewed_at
+        return sum(self.review(student, card, quality, reviewed_at)
+                   for card, quality in progress_grades(progress))
+
+    def due_sets(self, now, limit=None):
+        """Return {student: [cards]} for every card due at or before now
+
+        Cards come out in due order; limit caps the cards per student.
+        """
+        due = {}
+        popped = []
+        queue = self._queue
+
+        while queue and queue[0][0] <= now:
+            entry = heapq.heappop(queue)
+            due_time, student, card = entry
+            state = self.states.get((student, card))
+            if state is None or state.due != due_time:
+                continue  # stale entry from an earlier reschedule
+            popped.append(entry)
+            cards = due.setdefault(student, [])
+            if limit is None or len(cards) < limit:
+                cards.append(card)
+
+        # Due cards stay scheduled until they are reviewed again
+        for entry in popped:
+            heapq.heappush(queue, entry)
+        return due
+
+    def load(self, conn):
+        """Load all state from the database and rebuild the queue"""
+        for student, card, repetitions, interval, ease, due in conn.execute(
+                'SELECT student, card, repetitions, interval, ease, due FROM card_state'):
+            self.states[(student, card)] = CardState(repetitions, interval, ease, due)
+        self.last_export.update(conn.execute('SELECT student, last_export FROM student_exports'))
+        self._queue = [(state.due, student, card) for (student, card), state in self.states.items()]
+        heapq.heapify(self._queue)
+
+    def save(self, conn):
+        """Write all state back in one transaction"""
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO card_state VALUES (?, ?, ?, ?, ?, ?)',
+                ((student, card, state.repetitions, state.interval, state.ease, state.due)
+                 for (student, card), state in self.states.items())
+            )
+            conn.executemany('INSERT OR REPLACE INTO student_exports VALUES (?, ?)',
+                             self.last_export.items())
+
+def open_srs_store(db_path=SRS_DB):
+    """Open (and create if needed) the scheduler database"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def read_progress_exports(directory, errors=None):
+    """Yield (student, progress) for every valid export file in date order
+
+    Malformed files are skipped; (path, error) pairs are appended to errors.
+    """
+    exports = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.json'):
+            continue
+        path = os.path.join(directory, filename)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except (OSError, ValueError) as e:
+            error = str(e)
+        else:
+            error = validate_progress(progress)
+        if error:
+            if errors is not None:
+                errors.append((path, error))
+            continue
+        student = progress.get('student') or os.path.splitext(filename)[0]
+        exports.append((parse_export_date(progress['date']), student, progress))
+
+    exports.sort(key=lambda export: export[0])
+    for _, student, progress in exports:
+        yield student, progress
+
+def run_schedule(directory, db_path=SRS_DB, now=None, limit=None, errors=None):
+    """Apply new exports and return every student's due set
+
+    Malformed exports are skipped and listed in errors, if given.
+    """
+    conn = open_srs_store(db_path)
+    try:
+        scheduler = ReviewScheduler()
+        scheduler.load(conn)
+        reviews = 0
+        for student, progress in read_progress_exports(directory, errors):
+            reviews += scheduler.apply_progress(student, progress)
+        scheduler.save(conn)
+    finally:
+        conn.close()
+
+    if now is None:
+        now = datetime.now(timezone.utc).timestamp()
+    return scheduler.due_sets(now, limit), reviews
+
+def main():
+    """Nightly scheduling run"""
+    parser = argparse.ArgumentParser(description='Schedule flashcard reviews from exported progress')
+    parser.add_argument('exports', help='Directory of exported flashcard_progress JSON files')
+    parser.add_argument('--db', default=SRS_DB, help='Scheduler state database')
+    parser.add_argument('--output', default=SCHEDULE_FILE, help='Where to write the due sets')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum due cards per student')
+    parser.add_argument('--days-ahead', type=float, default=0,
+                        help='Include cards due within this many days')
+    args = parser.parse_args()
+
+    print("🧠 Spaced-Repetition Scheduler 🧠")
+    print("=" * 50)
+
+    now = datetime.now(timezone.utc) + timedelta(days=args.days_ahead)
+    errors = []
+    due, reviews = run_schedule(args.exports, args.db, now.timestamp(), args.limit, errors)
+    for path, error in errors:
+        print(f"⚠️  Skipped {path}: {error}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(due, f, ensure_ascii=False)
+
+    print(f"📝 Applied {reviews} reviews")
+    print(f"📅 {sum(len(cards) for cards in due.values())} cards due for {len(due)} students")
+    print(f"💾 Due sets saved to '{args.output}'")
+    print(f"🌐 Run japanese_flashcard_app.py to put them into the flashcard page")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Spelling Normalizer
+Maps typos and elongations in scraped lyrics ("sooo", "jesuss", "beleive")
+to close known words before counting, so they stop fragmenting word counts.
+
+Known words are the ones the corpus uses often, the teaching vocabulary,
+the theme keywords and a short list of common hymn words (BASE_WORDS).
+Other misspellings are only fixed when the correct word itself appears at
+least --min-count times in the lyrics. A rare token is corrected to the
+closest known word within a small edit distance (adjacent swaps count as
+one edit), preferring the more frequent word on ties.
+
+Corrections stay conservative, because a rare token is often a real word.
+Words in a word list (--wordlist, by default the system dictionary if there
+is one) or in COMMON_WORDS (real words one edit from a known word, like
+hearth and holly) are never corrected. Short words are never fuzzy-matched,
+the first letter must agree, inflections (holds/hold, prayed/prayer,
+lover/love) are left to the lemmatizer, and stop words are only reached by
+squeezing elongations (sooo → so). Other elongations are squeezed to double
+letters (gooood → good), never to single ones, so "goood" cannot become
+"god".
+
+Candidates come from a SymSpell-style deletion index: every known word is
+filed under the strings left after deleting up to max_distance letters from
+its first PREFIX_LENGTH letters. A token's own deletions then reach all its
+close words with a few dictionary lookups, with no comparison against every
+word in the vocabulary. Results are memoized per distinct token.
+
+Usage:
+    python spelling_normalizer.py [messy_lyrics.txt] [--min-count 3] [--max-distance 2]
+                                  [--wordlist /usr/share/dict/words]
+"""
+
+import argparse
+import re
+from collections import Counter, defaultdict
+
+from html_word_cloud import STOP_WORDS, clean_and_tokenize, read_lyrics_file
+from japanese_teaching_tool import get_teaching_vocabulary
+from simple_word_analysis import SPIRITUAL_THEMES
+
+# Tokens seen fewer times than this are candidates for correction
+MIN_COUNT = 3
+
+MAX_DISTANCE = 2
+
+# Only this many leading letters are indexed; longer words are checked in full
+PREFIX_LENGTH = 7
+
+# Three or more of the same letter in a row
+ELONGATION = re.compile(r'(.)\1{2,}')
+
+# Common hymn and song words, known even when the corpus is too small to vouch for them
+BASE_WORDS = (
+    'good', 'great', 'believe', 'receive', 'heaven', 'holy', 'spirit', 'amen', 'hallelujah',
+    'blessed', 'blessing', 'kingdom', 'salvation', 'saviour', 'shepherd', 'forgive', 'promise',
+    'peace', 'light', 'night', 'morning', 'sweet', 'mighty', 'wonderful', 'beautiful',
+    'forever', 'together', 'friend', 'people', 'world', 'children', 'remember', 'tomorrow',
+    'tonight', 'because', 'through', 'every', 'everyone', 'nothing', 'something', 'really',
+    'yeah', 'give', 'know', 'feel', 'live', 'walk', 'stand', 'sing', 'pray', 'prayer',
+    'need', 'name', 'king', 'cross', 'blood', 'soul', 'heart', 'right', 'free', 'home',
+)
+
+# Real words one edit from a known word, never corrected even without a word list
+COMMON_WORDS = (
+    'bloom', 'confidant', 'coverage', 'crass', 'cress', 'dunce', 'farther', 'feather', 'fellow',
+    'fiend', 'forgave', 'grade', 'grape', 'grate', 'grave', 'graze', 'greet', 'guile', 'guise',
+    'heard', 'hears', 'hearth', 'hearty', 'holly', 'leaks', 'leans', 'leaps', 'lease', 'lends',
+    'listed', 'loads', 'merry', 'mourning', 'payer', 'peach', 'place', 'player', 'poker',
+    'powder', 'premise', 'scare', 'scout', 'shade', 'shake', 'shame', 'shape', 'shard', 'shark',
+    'sharp', 'shoot', 'shore', 'short', 'sleet', 'smite', 'snare', 'snout', 'spare', 'spout',
+    'stare', 'stout', 'strand', 'string', 'strung', 'sweat', 'sweep', 'swept', 'think',
+    'thorough', 'trough', 'truss', 'trusty', 'tryst', 'wordy', 'would',
+)
+
+# Dictionary file used as the word list when --wordlist is not given
+WORDLIST = '/usr/share/dict/words'
+
+# Endings that make a different word form rather than a typo
+INFLECTIONS = frozenset({'s', 'es', 'd', 'ed', 'en', 'ing', 'er', 'est', 'ly'})
+
+def deletions(word, max_distance):
+    """Every string left after deleting up to max_distance letters of word"""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+def edit_distance(a, b, max_distance):
+    """Edit distance with adjacent transpositions, or max_distance + 1 if further apart"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+def allowed_distance(token, max_distance=MAX_DISTANCE):
+    """Edits allowed for a token of this length (short words are easy to confuse)"""
+    if len(token) <= 4:
+        return 0
+    if len(token) <= 7:
+        return min(1, max_distance)
+    return max_distance
+
+def stems(word):
+    """The word and every stem it could be an inflection of (loved → lov, love)"""
+    found = {word}
+    for ending in INFLECTIONS:
+        stem = word[:-len(ending)]
+        # A doubled last letter (jesuss) is a typo, not an inflection
+        if word.endswith(ending) and stem and stem[-1] != ending:
+            found.add(stem)
+            if ending[0] == 'e':
+                found.add(stem + 'e')
+    return found
+
+def is_inflection(a, b):
+    """Whether two words are forms of one stem (holds/hold, prayed/prayer, lover/love)"""
+    return not stems(a).isdisjoint(stems(b))
+
+class SpellingNormalizer:
+    """Corrects rare tokens to close known words through a deletion index"""
+
+    def __init__(self, word_freq, known_words=(), stop_words=(), min_count=MIN_COUNT,
+                 max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH, real_words=()):
+        self.max_distance = max_distance
+        # Matched only exactly, so rare words are never pulled toward them
+        self.stop_words = frozenset(stop_words)
+        # Never corrected, but not offered as corrections either
+        self.real_words = frozenset(real_words)
+        self.prefix_length = prefix_length
+        # Known word → frequency used to break ties between equally close words
+        self.dictionary = {word: count for word, count in word_freq.items() if count >= min_count}
+        for word in known_words:
+            self.dictionary.setdefault(word, max(word_freq.get(word, 0), min_count))
+
+        self._index = defaultdict(list)
+        for word in self.dictionary:
+            for deleted in deletions(word[:prefix_length], max_distance):
+                self._index[deleted].append(word)
+        self._cache = {}
+
+    def correct(self, token):
+        """Known word a token most likely stands for (the token itself if none is close)"""
+        try:
+            return self._cache[token]
+        except KeyError:
+            correction = self._cache[token] = self._lookup(token)
+            return correction
+
+    def _lookup(self, token):
+        if self._is_known(token):
+            return token
+
+        # Elongations first: gooood → good, and only stop words to one letter (sooo → so)
+        squeezed = ELONGATION.sub(r'\1\1', token)
+        if self._is_known(squeezed):
+            return squeezed
+        if ELONGATION.sub(r'\1', token) in self.stop_words:
+            return ELONGATION.sub(r'\1', token)
+
+        max_distance = allowed_distance(squeezed, self.max_distance)
+        if not max_distance:
+            return token
+        candidates = {word for deleted in deletions(squeezed[:self.prefix_length], max_distance)
+                      for word in self._index.get(deleted, ())}
+        best = None
+        for word in candidates:
+            if word[0] != squeezed[0] or is_inflection(squeezed, word):
+                continue
+            distance = edit_distance(squeezed, word, max_distance)
+            if distance <= max_distance:
+                key = (distance, -self.dictionary[word], word)
+                if best is None or key < best:
+                    best = key
+        return best[2] if best else token
+
+    def _is_known(self, word):
+        return word in self.dictionary or word in self.stop_words or word in self.real_words
+
+    def normalize_words(self, words):
+        """Words with every token replaced by its correction"""
+        cache = self._cache
+        return [cache[word] if word in cache else self.correct(word) for word in words]
+
+    def normalize_counts(self, word_freq):
+        """Counts merged under each token's correction"""
+        counts = Counter()
+        for word, count in word_freq.items():
+            counts[self.correct(word)] += count
+        return counts
+
+    def corrections(self):
+        """{token: correction} for every token changed so far"""
+        return {token: word for token, word in self._cache.items() if token != word}
+
+def teaching_words():
+    """English words of the teaching vocabulary"""
+    return [word for category in get_teaching_vocabulary().values() for word in category['words']]
+
+def base_words():
+    """Words known whether or not the corpus uses them: teaching, theme and BASE_WORDS"""
+    theme_words = [word for keywords in SPIRITUAL_THEMES.values() for word in keywords]
+    return list(dict.fromkeys(teaching_words() + theme_words + list(BASE_WORDS)))
+
+def read_wordlist(filename=WORDLIST):
+    """Lowercase words of a word list or any clean text (empty if the file is missing)"""
+    try:
+        with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
+            return frozenset(re.findall(r'[a-z]+', f.read().lower()))
+    except OSError:
+        return frozenset()
+
+def build_normalizer(words, min_count=MIN_COUNT, max_distance=MAX_DISTANCE, wordlist=WORDLIST):
+    """Normalizer trained on a token list, with base_words() as known words
+
+    Words in COMMON_WORDS or the word list are left as they are.
+    """
+    real_words = read_wordlist(wordlist) | frozenset(COMMON_WORDS)
+    return SpellingNormalizer(Counter(words), base_words(), sorted(STOP_WORDS),
+                              min_count, max_distance, real_words=real_words)
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description='Find and fix misspelled or elongated words in the lyrics')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT,
+                        help='Tokens seen fewer times are checked for typos')
+    parser.add_argument('--max-distance', type=int, default=MAX_DISTANCE,
+                        help='Most edits corrected')
+    parser.add_argument('--wordlist', default=WORDLIST,
+                        help=f'Words never corrected, from a word list or clean text '
+                             f'(default {WORDLIST})')
+    args = parser.parse_args()
+
+    words = clean_and_tokenize(read_lyrics_file(args.lyrics))
+    normalizer = build_normalizer(words, args.min_count, args.max_distance, args.wordlist)
+    word_freq = Counter(words)
+    merged = normalizer.normalize_counts(word_freq)
+    print(f"🔤 {len(word_freq)} distinct tokens, {len(normalizer.dictionary)} known words, "
+          f"{len(normalizer.real_words)} words never corrected")
+
+    corrections = normalizer.corrections()
+    if not corrections:
+        print("✅ No misspellings found")
+        return
+    print(f"✏️  {len(corrections)} tokens corrected "
+          f"({len(word_freq) - len(merged)} fewer distinct words):")
+    for token, word in sorted(corrections.items()):
+        print(f"  • {token:<16} → {word:<16} ({word_freq[token]} times)")
+
+if __name__ == "__main__":
+    main()
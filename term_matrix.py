@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Song × Term Matrix with TF-IDF
+Collapses an interned token corpus into a sparse song × term count matrix
+(CSR layout: per-song offsets into parallel term-ID and count arrays) and
+weighs it with TF-IDF, so each song's distinctive vocabulary surfaces
+instead of the words every song shares (jesus, god, trust).
+
+With NumPy the matrix build and the weighting run as whole-array operations
+over the non-zero entries; without it the same arrays are filled song by song.
+
+Usage:
+    python term_matrix.py [messy_lyrics.txt] [--top 10]
+"""
+
+import argparse
+import heapq
+import math
+from array import array
+from collections import Counter
+
+from html_word_cloud import read_lyrics_file
+from token_index import COUNT_TYPECODE, HAS_NUMPY, TOKEN_TYPECODE, build_token_corpus, count_ids
+
+if HAS_NUMPY:
+    import numpy as np
+
+class SongTermMatrix:
+    """Sparse song × term counts; row i spans indptr[i]:indptr[i + 1]"""
+
+    __slots__ = ('vocabulary', 'song_numbers', 'indptr', 'indices', 'counts')
+
+    def __init__(self, vocabulary, song_numbers, indptr, indices, counts):
+        self.vocabulary = vocabulary
+        self.song_numbers = song_numbers
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+
+    @property
+    def shape(self):
+        return len(self.song_numbers), len(self.vocabulary)
+
+    def row(self, index):
+        """(term IDs, counts) of one song, term IDs ascending"""
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:end], self.counts[start:end]
+
+def build_song_term_matrix(corpus):
+    """Song × term counts from a TokenCorpus"""
+    n_songs, n_terms = len(corpus.song_numbers), len(corpus.vocabulary)
+
+    if HAS_NUMPY:
+        # One key per (song, term) occurrence; unique keys sort row-major
+        tokens = np.frombuffer(corpus.tokens, dtype=np.uint32).astype(np.int64)
+        lengths = np.diff(np.frombuffer(corpus.song_offsets, dtype=np.uint64)).astype(np.int64)
+        rows = np.repeat(np.arange(n_songs, dtype=np.int64), lengths)
+        keys, counts = np.unique(rows * max(n_terms, 1) + tokens, return_counts=True)
+        indptr = np.searchsorted(keys // max(n_terms, 1), np.arange(n_songs + 1))
+        return SongTermMatrix(
+            corpus.vocabulary, list(corpus.song_numbers),
+            array(COUNT_TYPECODE, indptr.astype(np.uint64).tobytes()),
+            array(TOKEN_TYPECODE, (keys % max(n_terms, 1)).astype(np.uint32).tobytes()),
+            array(COUNT_TYPECODE, counts.astype(np.uint64).tobytes())
+        )
+
+    indptr = array(COUNT_TYPECODE, [0])
+    indices = array(TOKEN_TYPECODE)
+    counts = array(COUNT_TYPECODE)
+    offsets = corpus.song_offsets
+    for i in range(n_songs):
+        song = Counter(corpus.tokens[offsets[i]:offsets[i + 1]])
+        terms = sorted(song)
+        indices.extend(terms)
+        counts.extend(map(song.__getitem__, terms))
+        indptr.append(len(indices))
+    return SongTermMatrix(corpus.vocabulary, list(corpus.song_numbers), indptr, indices, counts)
+
+def inverse_document_frequencies(matrix):
+    """idf = log((1 + songs) / (1 + songs containing the term)), 0 for words in every song"""
+    n_songs, n_terms = matrix.shape
+    if HAS_NUMPY:
+        df = np.bincount(np.frombuffer(matrix.indices, dtype=np.uint32), minlength=n_terms)
+        return array('d', np.log((1 + n_songs) / (1 + df)).tobytes())
+
+    # Each term appears at most once per row, so its count across rows is its df
+    return array('d', [math.log((1 + n_songs) / (1 + df))
+                       for df in count_ids(matrix.indices, n_terms)])
+
+def tfidf_weights(matrix, idf=None):
+    """TF-IDF weight of every non-zero entry, parallel to matrix.indices"""
+    idf = inverse_document_frequencies(matrix) if idf is None else idf
+    n_songs = len(matrix.song_numbers)
+
+    if HAS_NUMPY:
+        indices = np.frombuffer(matrix.indices, dtype=np.uint32)
+        counts = np.frombuffer(matrix.counts, dtype=np.uint64).astype(np.float64)
+        rows = np.repeat(np.arange(n_songs),
+                         np.diff(np.frombuffer(matrix.indptr, dtype=np.uint64)).astype(np.int64))
+        totals = np.bincount(rows, weights=counts, minlength=n_songs)
+        weights = counts / totals[rows] * np.frombuffer(idf, dtype=np.float64)[indices]
+        return array('d', weights.tobytes())
+
+    weights = array('d')
+    for i in range(n_songs):
+        terms, counts = matrix.row(i)
+        total = sum(counts)
+        weights.extend(count / total * idf[term] for term, count in zip(terms, counts))
+    return weights
+
+def distinctive_words(matrix, weights=None, top_n=10):
+    """{song number: [(word, score)]} with each song's highest TF-IDF words"""
+    weights = tfidf_weights(matrix) if weights is None else weights
+    words = matrix.vocabulary.words
+    result = {}
+
+    for i, number in enumerate(matrix.song_numbers):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        if HAS_NUMPY:
+            row_weights = np.frombuffer(weights, dtype=np.float64)[start:end]
+            # Stable sort keeps equal scores in first-seen word order
+            top = np.argsort(-row_weights, kind='stable')[:top_n].tolist()
+        else:
+            top = heapq.nlargest(top_n, range(end - start), key=lambda k: weights[start + k])
+        result[number] = [(words[matrix.indices[start + k]], round(weights[start + k], 4))
+                          for k in top if weights[start + k] > 0]
+    return result
+
+def word_scores(matrix, weights=None):
+    """{word: highest TF-IDF it reaches in any song}, for sizing a word cloud"""
+    weights = tfidf_weights(matrix) if weights is None else weights
+    n_terms = len(matrix.vocabulary)
+
+    if HAS_NUMPY:
+        best = np.zeros(n_terms)
+        np.maximum.at(best, np.frombuffer(matrix.indices, dtype=np.uint32),
+                      np.frombuffer(weights, dtype=np.float64))
+        best = best.tolist()
+    else:
+        best = [0.0] * n_terms
+        for term, weight in zip(matrix.indices, weights):
+            if weight > best[term]:
+                best[term] = weight
+
+    words = matrix.vocabulary.words
+    return {words[term]: score for term, score in enumerate(best) if score > 0}
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="List each song's most distinctive words by TF-IDF")
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--top', type=int, default=10, help='Words per song')
+    args = parser.parse_args()
+
+    matrix = build_song_term_matrix(build_token_corpus(read_lyrics_file(args.lyrics)))
+    songs, terms = matrix.shape
+    print(f"🎼 {songs} songs × {terms} terms ({len(matrix.indices)} non-zero entries)")
+
+    for number, top_words in distinctive_words(matrix, top_n=args.top).items():
+        print(f"\n🎵 Song {number}:")
+        for word, score in top_words:
+            print(f"  • {word:<15} {score:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Interned Token IDs for Lyric Corpora
+Maps every distinct token to a dense integer ID as it is tokenized and
+stores the corpus as one flat array('I') of IDs (4 bytes per token instead
+of a pointer plus a shared string), with song boundaries as offsets and
+counts as flat arrays indexed by ID. Strings are only looked up again for
+output. NumPy is used for counting when it is installed.
+
+Usage:
+    python token_index.py [messy_lyrics.txt] [--top 25]
+"""
+
+import argparse
+import heapq
+import itertools
+from array import array
+from collections import Counter, defaultdict
+
+from html_word_cloud import clean_and_tokenize, read_lyrics_file
+from japanese_teaching_tool import split_songs
+
+# Try to import numpy for vectorized counting
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Typecodes: 32-bit token IDs, 64-bit counts and offsets
+TOKEN_TYPECODE = 'I'
+COUNT_TYPECODE = 'Q'
+
+class TokenVocabulary:
+    """Dense integer IDs for tokens, assigned in first-seen order"""
+
+    __slots__ = ('_ids', '_words')
+
+    def __init__(self, words=()):
+        self._ids = defaultdict(itertools.count().__next__)
+        self._words = []
+        self.encode(words)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, word):
+        return word in self._ids
+
+    def __getstate__(self):
+        return (self.words,)
+
+    def __setstate__(self, state):
+        self.__init__(state[0])
+
+    @property
+    def words(self):
+        """ID → token list, rebuilt only when new tokens were interned"""
+        if len(self._words) != len(self._ids):
+            self._words = list(self._ids)
+        return self._words
+
+    def id(self, word):
+        """The token's ID, or None if it has never been seen"""
+        return self._ids.get(word)
+
+    def encode(self, tokens):
+        """Intern tokens and return their IDs as an array('I')"""
+        return array(TOKEN_TYPECODE, map(self._ids.__getitem__, tokens))
+
+    def decode(self, ids):
+        """Token strings for a sequence of IDs"""
+        words = self.words
+        return [words[token_id] for token_id in ids]
+
+def count_ids(ids, size):
+    """Flat array of counts indexed by token ID"""
+    if HAS_NUMPY:
+        counts = np.bincount(np.frombuffer(ids, dtype=np.uint32), minlength=size)
+        return array(COUNT_TYPECODE, counts.astype(np.uint64).tobytes())
+
+    counts = array(COUNT_TYPECODE, bytes(8 * size))
+    for token_id, count in Counter(ids).items():
+        counts[token_id] = count
+    return counts
+
+class TokenCorpus:
+    """A tokenized corpus: one ID array plus per-song offsets"""
+
+    __slots__ = ('vocabulary', 'tokens', 'song_numbers', 'song_offsets', '_counts')
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else TokenVocabulary()
+        self.tokens = array(TOKEN_TYPECODE)
+        self.song_numbers = []
+        self.song_offsets = array(COUNT_TYPECODE, [0])
+        self._counts = None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add_song(self, number, words):
+        """Append one song's tokens"""
+        self.tokens.extend(self.vocabulary.encode(words))
+        self.song_numbers.append(number)
+        self.song_offsets.append(len(self.tokens))
+        self._counts = None
+
+    def song_tokens(self, number):
+        """The ID slice of one song"""
+        index = self.song_numbers.index(number)
+        return self.tokens[self.song_offsets[index]:self.song_offsets[index + 1]]
+
+    def counts(self):
+        """Corpus-wide counts by token ID (cached until the next add_song)"""
+        if self._counts is None or len(self._counts) != len(self.vocabulary):
+            self._counts = count_ids(self.tokens, len(self.vocabulary))
+        return self._counts
+
+    def song_counts(self, number):
+        """One song's counts by token ID"""
+        return count_ids(self.song_tokens(number), len(self.vocabulary))
+
+    def most_common(self, n=None, counts=None):
+        """[(word, count)], highest first and ties in first-seen order"""
+        counts = self.counts() if counts is None else counts
+        ids = (token_id for token_id in range(len(counts)) if counts[token_id])
+        if n is None:
+            top = sorted(ids, key=counts.__getitem__, reverse=True)
+        else:
+            top = heapq.nlargest(n, ids, key=counts.__getitem__)
+        words = self.vocabulary.words
+        return [(words[token_id], counts[token_id]) for token_id in top]
+
+    def to_counter(self, counts=None):
+        """Counter of strings for functions that still take word counts"""
+        counts = self.counts() if counts is None else counts
+        words = self.vocabulary.words
+        return Counter({words[token_id]: count for token_id, count in enumerate(counts) if count})
+
+def build_token_corpus(lyrics_text, tokenizer=clean_and_tokenize, vocabulary=None):
+    """Tokenize every numbered song once into a TokenCorpus"""
+    corpus = TokenCorpus(vocabulary)
+    for number, song_text in split_songs(lyrics_text).items():
+        corpus.add_song(number, tokenizer(song_text))
+    return corpus
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Intern lyric tokens and report array-backed counts')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--top', type=int, default=25, help='Words to list')
+    args = parser.parse_args()
+
+    corpus = build_token_corpus(read_lyrics_file(args.lyrics))
+    print(f"🔢 {len(corpus)} tokens, {len(corpus.vocabulary)} distinct, "
+          f"{len(corpus.song_numbers)} songs")
+    print(f"💾 Token array: {corpus.tokens.itemsize * len(corpus.tokens) / 1024:.1f} KB "
+          f"({'NumPy' if HAS_NUMPY else 'pure Python'} counting)")
+    for i, (word, count) in enumerate(corpus.most_common(args.top), 1):
+        print(f"{i:2d}. {word:<15} {count:>3} times")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unicode-Aware Lyric Tokenizer
+A tokenizer mode for lyrics pasted from many sources. The default
+\\b[a-zA-Z]+\\b pattern splits "You're" into you/re, breaks accented words
+apart, loses curly-apostrophe forms and discards Japanese text entirely.
+This tokenizer instead:
+
+- NFKC-normalizes the text (full-width letters, ligatures, half-width kana)
+- folds curly and modifier apostrophes to '
+- matches runs of Unicode letters, with inner apostrophes, as one word
+- expands contractions (you're → you are, won't → will not, god's → god)
+  before stop words are filtered
+- keeps kana and kanji runs whole; they are not split into words here
+
+The regexes and tables are compiled once at import. Plain ASCII text skips
+normalization, and each distinct contraction is expanded once and cached,
+so the per-token work stays close to the default regex tokenizer.
+
+Usage:
+    python unicode_tokenizer.py [messy_lyrics.txt] [--top 20]
+"""
+
+import argparse
+import re
+import unicodedata
+from collections import Counter
+
+from html_word_cloud import STOP_WORDS, clean_and_tokenize, read_lyrics_file
+
+SONG_NUMBER = re.compile(r'^\d+\.\s*', re.MULTILINE)
+
+# Letters of any script, with apostrophes allowed between letters
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+
+# Right/left single quotes, modifier letters, grave/acute accents and prime.
+# A few C-level str.replace passes beat one str.translate over a whole corpus.
+APOSTROPHES = tuple('’‘‛ʼʻ`´′')
+
+# Short words are English fragments; kana, kanji and hangul words start at U+3000
+CJK_START = '\u3000'
+
+# Contraction endings (after the last apostrophe); None drops the ending
+CONTRACTION_SUFFIXES = {
+    're': 'are', 'll': 'will', 've': 'have', 'm': 'am', 'd': 'would', 's': None,
+}
+
+# Contractions the suffix rules would get wrong, and poetic forms common in hymns
+CONTRACTIONS = {
+    "won't": ('will', 'not'), "can't": ('can', 'not'), "shan't": ('shall', 'not'),
+    "ain't": ('am', 'not'), "let's": ('let', 'us'), "y'all": ('you', 'all'),
+    "o'er": ('over',), "e'er": ('ever',), "ne'er": ('never',),
+}
+
+_expansions = {}
+
+def expand_contraction(word):
+    """Words a contraction stands for, cached per distinct word"""
+    try:
+        return _expansions[word]
+    except KeyError:
+        pass
+    if word in CONTRACTIONS:
+        expanded = CONTRACTIONS[word]
+    else:
+        base, _, ending = word.rpartition("'")
+        if ending == 't' and base.endswith('n'):
+            expanded = expand_contraction(base[:-1]) + ('not',)
+        elif ending in CONTRACTION_SUFFIXES:
+            suffix = CONTRACTION_SUFFIXES[ending]
+            expanded = expand_contraction(base) + ((suffix,) if suffix else ())
+        else:
+            # Names and dialect forms (o'brien) stay one word
+            expanded = (word,)
+    _expansions[word] = expanded
+    return expanded
+
+def normalize_text(text):
+    """NFKC-normalized text with every apostrophe variant folded to '"""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKC', text)
+    for apostrophe in APOSTROPHES:
+        if apostrophe in text:
+            text = text.replace(apostrophe, "'")
+    return text
+
+def unicode_words(text):
+    """Case-folded words of any script with contractions expanded (stop words kept)"""
+    text = normalize_text(SONG_NUMBER.sub('', text)).casefold()
+    words = WORD_PATTERN.findall(text)
+    if "'" not in text:
+        return words
+
+    expanded = []
+    for word in words:
+        if "'" in word:
+            expanded.extend(expand_contraction(word))
+        else:
+            expanded.append(word)
+    return expanded
+
+def unicode_tokenize(text, stop_words=STOP_WORDS):
+    """Drop-in for clean_and_tokenize: meaningful words of any script"""
+    return [word for word in unicode_words(text)
+            if word not in stop_words and (len(word) > 2 or word[0] >= CJK_START)]
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Compare the default and Unicode-aware tokenizers')
+    parser.add_argument('lyrics', nargs='?', default='messy_lyrics.txt', help='Lyrics file')
+    parser.add_argument('--top', type=int, default=20, help='Changed words to list')
+    args = parser.parse_args()
+
+    lyrics = read_lyrics_file(args.lyrics)
+    before = Counter(clean_and_tokenize(lyrics))
+    after = Counter(unicode_tokenize(lyrics))
+    print(f"🔤 Default tokenizer: {sum(before.values())} words ({len(before)} unique)")
+    print(f"🌏 Unicode tokenizer: {sum(after.values())} words ({len(after)} unique)")
+
+    changed = sorted(before.keys() | after.keys(),
+                     key=lambda word: abs(after[word] - before[word]), reverse=True)
+    changed = [word for word in changed if after[word] != before[word]][:args.top]
+    if changed:
+        print(f"\n🔍 Words counted differently:")
+        for word in changed:
+            print(f"  • {word:<16} {before[word]:>4} → {after[word]}")
+    else:
+        print("\n✅ Both tokenizers count every word the same")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+SQLite Vocabulary Store for the Japanese Teaching Tool
+Keeps the teaching vocabulary (English, Japanese, difficulty, importance, category)
+in a local indexed database so translators can load and update entries
+from CSV/JSON files without editing Python.
+
+Usage:
+    python vocabulary_store.py import vocabulary.csv
+    python vocabulary_store.py import vocabulary.json
+    python vocabulary_store.py export vocabulary.csv
+    python vocabulary_store.py lookup trust
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+TEACHING_DB = 'teaching_vocabulary.db'
+
+CSV_COLUMNS = ['english', 'japanese', 'difficulty', 'importance', 'category', 'description']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS vocabulary (
+    id INTEGER PRIMARY KEY,
+    english TEXT NOT NULL,
+    japanese TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    importance INTEGER NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    UNIQUE (english, category_id)
+);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_english ON vocabulary(english);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_category ON vocabulary(category_id);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_difficulty ON vocabulary(difficulty, importance);
+"""
+
+def open_vocabulary_store(db_path=TEACHING_DB, seed=None):
+    """Open (and create if needed) the vocabulary database
+
+    seed is an optional callable returning vocabulary in the nested
+    get_teaching_vocabulary() format, used only when the store is empty.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+
+    if seed is not None:
+        (count,) = conn.execute('SELECT COUNT(*) FROM vocabulary').fetchone()
+        if count == 0:
+            bulk_load_rows(conn, nested_vocabulary_rows(seed()))
+
+    return conn
+
+def nested_vocabulary_rows(vocabulary):
+    """Flatten the nested {category: {'description', 'words'}} format into rows"""
+    for category, data in vocabulary.items():
+        for word, info in data['words'].items():
+            yield {
+                'english': word,
+                'japanese': info['japanese'],
+                'difficulty': info['difficulty'],
+                'importance': info['importance'],
+                'category': category,
+                'description': data.get('description', '')
+            }
+
+def bulk_load_rows(conn, rows):
+    """Insert or update vocabulary rows in a single transaction"""
+
+    rows = list(rows)
+    categories = {}
+    for row in rows:
+        description = row.get('description') or ''
+        if row['category'] not in categories or description:
+            categories[row['category']] = description
+
+    with conn:
+        conn.executemany(
+            """INSERT INTO categories (name, description) VALUES (?, ?)
+               ON CONFLICT(name) DO UPDATE SET description = excluded.description
+               WHERE excluded.description != ''""",
+            categories.items()
+        )
+        category_ids = dict(conn.execute('SELECT name, id FROM categories'))
+        conn.executemany(
+            """INSERT INTO vocabulary (english, japanese, difficulty, importance, category_id)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(english, category_id) DO UPDATE SET
+                   japanese = excluded.japanese,
+                   difficulty = excluded.difficulty,
+                   importance = excluded.importance""",
+            ((row['english'].strip().lower(), row['japanese'], int(row['difficulty']),
+              int(row['importance']), category_ids[row['category']]) for row in rows)
+        )
+
+    return len(rows)
+
+def load_vocabulary_file(conn, filename):
+    """Bulk-load a CSV or JSON vocabulary file into the store"""
+
+    if filename.lower().endswith('.csv'):
+        with open(filename, 'r', encoding='utf-8', newline='') as f:
+            return bulk_load_rows(conn, csv.DictReader(f))
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # Either a list of row objects or the nested category format
+    if isinstance(data, dict):
+        data = nested_vocabulary_rows(data)
+    return bulk_load_rows(conn, data)
+
+def export_vocabulary_csv(conn, filename):
+    """Write the whole store to a CSV file for translators"""
+
+    cursor = conn.execute(
+        """SELECT v.english, v.japanese, v.difficulty, v.importance, c.name, c.description
+           FROM vocabulary v JOIN categories c ON c.id = v.category_id
+           ORDER BY c.id, v.id"""
+    )
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(cursor)
+
+def lookup_word(conn, english):
+    """Return every stored entry for an English word"""
+
+    cursor = conn.execute(
+        """SELECT v.english, v.japanese, v.difficulty, v.importance, c.name
+           FROM vocabulary v JOIN categories c ON c.id = v.category_id
+           WHERE v.english = ?""",
+        (english.lower(),)
+    )
+    return [dict(zip(CSV_COLUMNS, row)) for row in cursor]
+
+def vocabulary_words(conn):
+    """Every stored English word, in entry order"""
+    return [english for (english,) in conn.execute('SELECT DISTINCT english FROM vocabulary ORDER BY id')]
+
+def join_word_frequencies(conn, word_freq):
+    """Match word counts against the store with one set-based query
+
+    Returns rows of (category, description, english, japanese,
+    difficulty, importance, frequency) in category and entry order.
+    """
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS word_counts '
+                 '(word TEXT PRIMARY KEY, frequency INTEGER NOT NULL)')
+    try:
+        conn.execute('DELETE FROM word_counts')
+        conn.executemany('INSERT INTO word_counts (word, frequency) VALUES (?, ?)',
+                         word_freq.items())
+        return conn.execute(
+            """SELECT c.name, c.description, v.english, v.japanese,
+                      v.difficulty, v.importance, w.frequency
+               FROM word_counts w
+               JOIN vocabulary v ON v.english = w.word
+               JOIN categories c ON c.id = v.category_id
+               ORDER BY c.id, v.id"""
+        ).fetchall()
+    finally:
+        conn.execute('DROP TABLE IF EXISTS temp.word_counts')
+
+def main():
+    """Command line entry point for translators"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ('import', 'export', 'lookup'):
+        print(__doc__.strip())
+        return 1
+
+    from japanese_teaching_tool import get_teaching_vocabulary
+
+    command, argument = sys.argv[1], sys.argv[2]
+    db_path = os.environ.get('TEACHING_DB', TEACHING_DB)
+    conn = open_vocabulary_store(db_path, seed=get_teaching_vocabulary)
+
+    try:
+        if command == 'import':
+            count = load_vocabulary_file(conn, argument)
+            print(f"✅ Loaded {count} entries from '{argument}' into '{db_path}'")
+        elif command == 'export':
+            export_vocabulary_csv(conn, argument)
+            print(f"💾 Vocabulary exported to '{argument}'")
+        else:
+            entries = lookup_word(conn, argument)
+            if not entries:
+                print(f"❌ '{argument}' is not in the vocabulary")
+            for entry in entries:
+                print(f"{entry['english'].upper()} → {entry['japanese']} "
+                      f"(difficulty {entry['difficulty']}, importance {entry['importance']}, "
+                      f"{entry['category']})")
+    finally:
+        conn.close()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
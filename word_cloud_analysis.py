@@ -4,9 +4,14 @@ Word Cloud Analysis for Missionary Song Lyrics
 This script analyzes song lyrics to create word clouds and frequency analysis
 """
 
+import argparse
 import re
 from collections import Counter
 
+from instrumentation import add_profiling_arguments, configure_profiling, instrumented, span
+from lemmatizer import lemmatize_keywords, lemmatize_words
+from repeated_sections import repeat_weighted_counts
+
 # Try to import matplotlib, but fall back to text-based visualization if it fails
 try:
     import matplotlib.pyplot as plt
@@ -17,12 +22,14 @@ except ImportError:
     HAS_MATPLOTLIB = False
     print("⚠️  Matplotlib/WordCloud not available - using text-based visualization instead")
 
+@instrumented('read_lyrics_file', items=len)
 def read_lyrics_file(filename):
     """Read and clean the lyrics file"""
     with open(filename, 'r', encoding='utf-8') as file:
         content = file.read()
     return content
 
+@instrumented('clean_and_tokenize', items=len)
 def clean_and_tokenize(text):
     """Clean text and extract meaningful words"""
     # Remove song numbers and extra whitespace
@@ -56,21 +63,25 @@ def clean_and_tokenize(text):
     
     return meaningful_words
 
+@instrumented('generate_word_frequency', items=len)
 def generate_word_frequency(words, top_n=30):
     """Generate word frequency analysis"""
     word_freq = Counter(words)
     return word_freq.most_common(top_n)
 
-def create_word_cloud(words, title="Word Cloud"):
-    """Create and display word cloud or text-based alternative"""
+@instrumented('create_word_cloud')
+def create_word_cloud(words, title="Word Cloud", frequencies=None):
+    """Create and display word cloud or text-based alternative
+
+    Pass frequencies (a Counter) when words are not in lyric order, so the
+    cloud is drawn from the counts instead of pairing neighbouring words.
+    """
     if not HAS_MATPLOTLIB:
         print(f"\n☁️  {title} (Text-based representation):")
         print("=" * 60)
         create_text_word_cloud(words)
         return
     
-    text = ' '.join(words)
-    
     # Create word cloud
     wordcloud = WordCloud(
         width=1200, 
@@ -80,7 +91,11 @@ def create_word_cloud(words, title="Word Cloud"):
         max_words=100,
         relative_scaling=0.5,
         random_state=42
-    ).generate(text)
+    )
+    if frequencies is not None:
+        wordcloud.generate_from_frequencies(frequencies)
+    else:
+        wordcloud.generate(' '.join(words))
     
     # Create and save the figure
     plt.figure(figsize=(15, 8))
@@ -149,8 +164,12 @@ def create_text_bar_chart(word_freq, title="Word Frequency", top_n=15):
         print(f"{word:<12} {count:>3} │{bar}")
     print()
 
-def analyze_spiritual_themes(words):
-    """Analyze spiritual and religious themes in the lyrics"""
+@instrumented('analyze_spiritual_themes', items=len)
+def analyze_spiritual_themes(words, lemmas=False):
+    """Analyze spiritual and religious themes in the lyrics
+    
+    Pass lemmas=True when words are lemmas, to match them by lemma too.
+    """
     
     # Define theme categories
     themes = {
@@ -162,6 +181,8 @@ def analyze_spiritual_themes(words):
         'Life & Journey': ['life', 'journey', 'way', 'path', 'guide', 'lead'],
         'Emotions & Actions': ['smile', 'joy', 'happy', 'shout', 'sing', 'dance']
     }
+    if lemmas:
+        themes = lemmatize_keywords(themes)
     
     word_freq = Counter(words)
     theme_analysis = {}
@@ -178,12 +199,35 @@ def analyze_spiritual_themes(words):
 
 def main():
     """Main analysis function"""
+    parser = argparse.ArgumentParser(description='Analyze word frequencies and themes in the lyrics')
+    repeats = parser.add_mutually_exclusive_group()
+    repeats.add_argument('--dedup', action='store_true',
+                         help='Count each repeated chorus once instead of every time it is sung')
+    repeats.add_argument('--repeat-weight', type=float, metavar='W',
+                         help='Count repeated sections at weight W (0 is the same as --dedup)')
+    parser.add_argument('--lemmas', action='store_true',
+                        help='Count by lemma so trusting/trusted/trust are one word')
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    configure_profiling(args)
+    
     print("🎵 Missionary Song Lyrics Analysis 🎵")
     print("=" * 50)
     
     # Read and process lyrics
     lyrics = read_lyrics_file('messy_lyrics.txt')
-    words = clean_and_tokenize(lyrics)
+    tokenizer = clean_and_tokenize
+    if args.lemmas:
+        tokenizer = lambda text: lemmatize_words(clean_and_tokenize(text))
+    repeat_counts = None
+    if args.dedup or args.repeat_weight is not None:
+        # Everything below counts the word list, so the weighted counts are expanded back
+        repeat_weight = args.repeat_weight or 0.0
+        repeat_counts = repeat_weighted_counts(lyrics, tokenizer, repeat_weight)
+        words = list(repeat_counts.elements())
+        print(f"🔁 Repeated sections counted at weight {repeat_weight:g}")
+    else:
+        words = tokenizer(lyrics)
     
     print(f"Total words processed: {len(words)}")
     print(f"Unique words: {len(set(words))}")
@@ -200,7 +244,7 @@ def main():
     # Spiritual theme analysis
     print("🙏 Spiritual Theme Analysis:")
     print("-" * 30)
-    theme_analysis = analyze_spiritual_themes(words)
+    theme_analysis = analyze_spiritual_themes(words, lemmas=args.lemmas)
     for theme, data in theme_analysis.items():
         if data['total_count'] > 0:
             print(f"{theme}: {data['total_count']} occurrences")
@@ -209,9 +253,24 @@ def main():
             print()
     
     # Create word cloud
-    create_word_cloud(words, "Missionary Song Lyrics - Word Cloud")
+    create_word_cloud(words, "Missionary Song Lyrics - Word Cloud", frequencies=repeat_counts)
     
     # Create frequency bar chart
+    with span('render_charts'):
+        render_charts(word_freq, theme_analysis)
+    
+    # Summary of exported files
+    if HAS_MATPLOTLIB:
+        print("\n📁 EXPORTED FILES:")
+        print("=" * 30)
+        print("✅ missionary_word_cloud.jpg - Visual word cloud")
+        print("✅ word_frequency_chart.jpg - Word frequency bar chart")
+        print("✅ spiritual_themes_chart.jpg - Spiritual themes distribution")
+        print("✅ teaching_flashcards.json - Teaching flashcards data")
+        print("\n💡 These images are perfect for presentations and teaching materials!")
+
+def render_charts(word_freq, theme_analysis):
+    """Save the frequency and theme charts, or print a text bar chart"""
     if HAS_MATPLOTLIB:
         plt.figure(figsize=(12, 8))
         words_list, counts = zip(*word_freq[:15])
@@ -253,16 +312,6 @@ def main():
             plt.show()
     else:
         create_text_bar_chart(word_freq, "Top 15 Most Frequent Words", 15)
-    
-    # Summary of exported files
-    if HAS_MATPLOTLIB:
-        print("\n📁 EXPORTED FILES:")
-        print("=" * 30)
-        print("✅ missionary_word_cloud.jpg - Visual word cloud")
-        print("✅ word_frequency_chart.jpg - Word frequency bar chart")
-        print("✅ spiritual_themes_chart.jpg - Spiritual themes distribution")
-        print("✅ teaching_flashcards.json - Teaching flashcards data")
-        print("\n💡 These images are perfect for presentations and teaching materials!")
 
 if __name__ == "__main__":
     main()